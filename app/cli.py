@@ -0,0 +1,505 @@
+"""
+HEBNORM command line tools.
+
+Usage:
+    python -m app.cli normalize INPUT [INPUT ...] -o OUTPUT [options]
+    python -m app.cli build-lexicon [--corpus-dir DIR] [-o LEXICON] [options]
+    python -m app.cli build-dictionary [--corpus-dir DIR] [-o DICTIONARY] [--workers N] [--prefix-mode] [--restart]
+    python -m app.cli update-dictionary FILE [FILE ...] [-d DICTIONARY] [--workers N]
+    python -m app.cli build-index [-d DICTIONARY] [--index INDEX]
+    python -m app.cli benchmark-spellcheck [LABELLED_CSV] [-o REPORT] [--workers N] [--baseline REPORT]
+    python -m app.cli sweep-dictionary [LABELLED_CSV] [-o DIR] [--max-edit-distance N ...] [--prefix-length N ...]
+
+The normalize command streams large corpora (plain text, JSONL, gzip / bz2 / xz) through
+the normalization pipeline: final letters and the full ktiv rules run on a
+pool of worker processes, the nikud model runs in the main process on batches
+of lines, and output is written in input order. Progress is checkpointed so a
+killed job resumes where it stopped.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from contextlib import closing
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from app.utils.corpus_readers import iter_records
+from app.utils.normalizer import (
+    apply_full_ktiv_rules,
+    normalize_final_letters,
+    normalize_final_letters_batch,
+    remove_nikud,
+)
+
+
+# ---------- checkpoint helpers ----------
+
+def write_json_atomic(path: str, data: dict) -> None:
+    """Write JSON to a temp file and atomically move it over `path`."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def sync_file(f) -> None:
+    """Flush `f` and fsync it, so a checkpoint written after it never points past data lost in a crash."""
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def read_checkpoint(path: str) -> Optional[dict]:
+    """Return the checkpoint stored at `path`, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ---------- pipeline stages (run in worker processes) ----------
+
+def prepare_texts(texts: list[str]) -> list[str]:
+    """CPU stage before the model: final letters normalization."""
+    try:
+        return normalize_final_letters_batch(texts)
+    except Exception:
+        return [prepare_text(text) for text in texts]
+
+
+def prepare_text(text: str) -> str:
+    """Per-text fallback for prepare_texts."""
+    if not text or text.isspace():
+        return ""
+    try:
+        return normalize_final_letters(text)
+    except Exception:
+        return text
+
+
+def finish_texts(args: tuple[list[str], list[bool], bool]) -> list[str]:
+    """CPU stage after the model: full ktiv rules and nikud removal."""
+    texts, has_nikud_from_model, with_nikud = args
+    texts = [apply_full_ktiv_rules(t) if flag else t for t, flag in zip(texts, has_nikud_from_model)]
+    if not with_nikud:
+        texts = [remove_nikud(t) for t in texts]
+    return [t.strip() for t in texts]
+
+
+def split_evenly(items: list, parts: int) -> list[list]:
+    """Split a batch into at most `parts` contiguous chunks, one per worker."""
+    size = max(1, -(-len(items) // max(parts, 1)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+# ---------- main loop ----------
+
+def chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield lists of size `size` from iterable (last may be smaller)."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            break
+        yield chunk
+
+
+class ProgressReporter:
+    """Print lines/sec and ETA (by input bytes) to stderr every `interval` seconds."""
+
+    def __init__(self, total_bytes: int, interval: float = 10.0, stream=sys.stderr):
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.stream = stream
+        self.start_time = time.monotonic()
+        self.last_report = self.start_time
+        self.start_bytes = None
+        self.lines = 0
+
+    def update(self, lines: int, bytes_done: int, force: bool = False) -> None:
+        self.lines += lines
+        if self.start_bytes is None:
+            self.start_bytes = bytes_done
+        now = time.monotonic()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+
+        elapsed = max(now - self.start_time, 1e-9)
+        lines_per_sec = self.lines / elapsed
+        bytes_per_sec = (bytes_done - self.start_bytes) / elapsed
+        remaining = max(self.total_bytes - bytes_done, 0)
+        eta = remaining / bytes_per_sec if bytes_per_sec > 0 else float("inf")
+        percent = 100.0 * bytes_done / self.total_bytes if self.total_bytes else 100.0
+        eta_text = time.strftime("%H:%M:%S", time.gmtime(eta)) if eta != float("inf") else "--:--:--"
+        print(
+            f"📊 {self.lines:,} lines | {lines_per_sec:,.0f} lines/sec | {percent:.1f}% | ETA {eta_text}",
+            file=self.stream,
+        )
+
+
+def normalize_files(
+    inputs: list[str],
+    output: str,
+    *,
+    with_nikud: bool = False,
+    full_ktiv: bool = True,
+    text_field: str = "text",
+    batch_size: int = 64,
+    workers: int = 1,
+    checkpoint_path: Optional[str] = None,
+    restart: bool = False,
+    report_interval: float = 10.0,
+) -> int:
+    """
+    Normalize corpus files line by line into `output`, resuming from a checkpoint.
+
+    Args:
+        inputs: Input files (plain text or .jsonl, optionally .gz / .bz2 / .xz, see corpus_readers)
+        output: Output file; JSONL inputs produce JSONL with `text_field` replaced
+        with_nikud: Whether to keep nikud in the output
+        full_ktiv: Whether to run the nikud model and full ktiv rules
+        text_field: Field holding the text in JSONL records
+        batch_size: Number of lines per model batch
+        workers: Number of worker processes for the CPU stages
+        checkpoint_path: Checkpoint file (defaults to OUTPUT.ckpt.json)
+        restart: Ignore an existing checkpoint and start from scratch
+        report_interval: Seconds between progress reports
+
+    Returns:
+        Number of lines written in this run
+    """
+    checkpoint_path = checkpoint_path or f"{output}.ckpt.json"
+    inputs = [os.path.abspath(p) for p in inputs]
+
+    checkpoint = None if restart else read_checkpoint(checkpoint_path)
+    if checkpoint is not None and checkpoint.get("inputs") != inputs:
+        raise ValueError(
+            f"Checkpoint {checkpoint_path} belongs to different inputs; use --restart to start over"
+        )
+    if checkpoint is None:
+        checkpoint = {"inputs": inputs, "file_index": 0, "input_offset": 0, "output_offset": 0, "lines": 0}
+
+    if checkpoint["output_offset"] and not os.path.exists(output):
+        raise ValueError(f"Checkpoint {checkpoint_path} exists but output {output} is missing; use --restart")
+    if checkpoint["output_offset"]:
+        # Drop anything written after the last checkpoint
+        out = open(output, "r+b")
+        out.truncate(checkpoint["output_offset"])
+        out.seek(checkpoint["output_offset"])
+    else:
+        out = open(output, "wb")
+
+    sizes = [os.path.getsize(p) for p in inputs]
+    reporter = ProgressReporter(sum(sizes), interval=report_interval)
+    add_nikud_batch = None
+    if full_ktiv:
+        from app.utils.nikud import add_nikud_batch
+
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+
+    def run_stage(fn, chunks):
+        results = pool.map(fn, chunks) if pool else [fn(chunk) for chunk in chunks]
+        return [text for chunk in results for text in chunk]
+
+    lines_written = 0
+
+    try:
+        for file_index in range(checkpoint["file_index"], len(inputs)):
+            start_offset = checkpoint["input_offset"] if file_index == checkpoint["file_index"] else 0
+            done_bytes = sum(sizes[:file_index])
+
+            with closing(iter_records(inputs[file_index], text_field, start_offset)) as records:
+                for batch in chunked(records, batch_size):
+                    texts = run_stage(prepare_texts, split_evenly([text for _, _, text, _ in batch], workers))
+
+                    if add_nikud_batch is not None:
+                        indexes = [i for i, t in enumerate(texts) if t]
+                        with_model = add_nikud_batch([texts[i] for i in indexes], keep_vowels=False)
+                        for i, text in zip(indexes, with_model):
+                            texts[i] = text
+                        flags = [bool(t) for t in texts]
+                    else:
+                        flags = [False] * len(texts)
+
+                    chunks = zip(split_evenly(texts, workers), split_evenly(flags, workers))
+                    results = run_stage(finish_texts, [(t, f, with_nikud) for t, f in chunks])
+
+                    chunks = []
+                    for (_, _, _, record), result in zip(batch, results):
+                        if record is not None:
+                            record[text_field] = result
+                            result = json.dumps(record, ensure_ascii=False)
+                        chunks.append(result + "\n")
+                    out.write("".join(chunks).encode("utf-8"))
+                    sync_file(out)
+
+                    lines_written += len(batch)
+                    checkpoint.update(
+                        file_index=file_index,
+                        input_offset=batch[-1][0],
+                        output_offset=out.tell(),
+                        lines=checkpoint["lines"] + len(batch),
+                    )
+                    write_json_atomic(checkpoint_path, checkpoint)
+                    reporter.update(len(batch), done_bytes + batch[-1][1])
+
+            # Move the checkpoint to the start of the next file
+            sync_file(out)
+            checkpoint.update(file_index=file_index + 1, input_offset=0, output_offset=out.tell())
+            write_json_atomic(checkpoint_path, checkpoint)
+    finally:
+        out.close()
+        if pool:
+            pool.close()
+            pool.join()
+
+    reporter.update(0, sum(sizes), force=True)
+    return lines_written
+
+
+# ---------- argument parsing ----------
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="HEBNORM command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    norm = commands.add_parser("normalize", help="Normalize large corpus files")
+    norm.add_argument("inputs", nargs="+", help="Input files (.txt / .jsonl, optionally .gz / .bz2 / .xz)")
+    norm.add_argument("-o", "--output", required=True, help="Output file")
+    norm.add_argument("--text-field", default="text", help="Text field for JSONL input (default: text)")
+    norm.add_argument("--with-nikud", action="store_true", help="Keep nikud in the output")
+    norm.add_argument("--no-full-ktiv", action="store_true", help="Skip the nikud model and full ktiv rules")
+    norm.add_argument("--batch-size", type=int, default=64, help="Lines per model batch (default: 64)")
+    norm.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for CPU stages")
+    norm.add_argument("--checkpoint", help="Checkpoint file (default: OUTPUT.ckpt.json)")
+    norm.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    norm.add_argument("--report-interval", type=float, default=10.0, help="Seconds between progress reports")
+
+    lex = commands.add_parser("build-lexicon", help="Build the offline full ktiv lexicon from a corpus")
+    lex.add_argument("--corpus-dir", help="Corpus directory (default: settings.spellchecker_corpus_dir)")
+    lex.add_argument("-o", "--output", help="Lexicon file (default: settings.full_ktiv_lexicon_path)")
+    lex.add_argument("--min-count", type=int, default=2, help="Minimum occurrences per word (default: 2)")
+    lex.add_argument("--batch-size", type=int, default=64, help="Sentences per model batch (default: 64)")
+    lex.add_argument("--max-sentences", type=int, help="Stop after this many sentences")
+
+    dic = commands.add_parser("build-dictionary", help="Build the SymSpell spelling dictionary from a corpus")
+    dic.add_argument("--corpus-dir", help="Corpus directory (default: settings.spellchecker_corpus_dir)")
+    dic.add_argument("-o", "--output", help="Dictionary file (default: settings.spellchecker_dictionary_path)")
+    dic.add_argument("--min-freq", type=int, help="Minimum term frequency (default: settings.spellchecker_min_freq)")
+    dic.add_argument("--index", help="Binary index file (default: settings.spellchecker_index_path, or "
+                                     "settings.spellchecker_trie_path with the trie term store)")
+    dic.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes counting corpus shards")
+    dic.add_argument("--max-terms", type=int,
+                     help="Distinct tokens counted in memory before spilling to disk "
+                          "(default: settings.spellchecker_count_max_terms, 0 = unbounded)")
+    dic.add_argument("--text-field", help="JSONL text field (default: settings.spellchecker_corpus_text_field)")
+    dic.add_argument("--csv-column", help="CSV column name or index (default: settings.spellchecker_corpus_csv_column)")
+    dic.add_argument("--readahead", type=int,
+                     help="Batches read ahead on a background thread (default: settings.spellchecker_corpus_readahead)")
+    dic.add_argument("--prefix-mode", action="store_true",
+                     help="Fold prefixed forms into base words and write prefix statistics "
+                          "(settings.spellchecker_prefix_stats_path, or OUTPUT with a .prefixes.json "
+                          "suffix for another output)")
+    dic.add_argument("--checkpoint-dir", help="Build checkpoint directory (default: OUTPUT.checkpoint)")
+    dic.add_argument("--checkpoint-every", type=int,
+                     help="Chunks of 10M tokens (or shards with --workers > 1) between checkpoints "
+                          "(default: settings.spellchecker_build_checkpoint_every, 0 = off)")
+    dic.add_argument("--restart", action="store_true", help="Ignore an existing build checkpoint")
+
+    upd = commands.add_parser("update-dictionary", help="Add new corpus files to the spelling dictionary")
+    upd.add_argument("inputs", nargs="+", help="New corpus files (.txt / .csv / .jsonl, optionally .gz / .bz2 / .xz)")
+    upd.add_argument("-d", "--dictionary", help="Dictionary file (default: settings.spellchecker_dictionary_path)")
+    upd.add_argument("--min-freq", type=int, help="Minimum term frequency (default: settings.spellchecker_min_freq)")
+    upd.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes counting the files")
+
+    idx = commands.add_parser("build-index", help="Write the mapped spelling index before starting server workers")
+    idx.add_argument("-d", "--dictionary", help="Dictionary file (default: settings.spellchecker_dictionary_path)")
+    idx.add_argument("--index", help="Index file (default: settings.spellchecker_index_path, or "
+                                     "settings.spellchecker_trie_path with the trie term store)")
+
+    bench = commands.add_parser("benchmark-spellcheck", help="Measure spellchecker accuracy, latency and memory")
+    bench.add_argument("labelled", nargs="?", default="test_data.csv",
+                       help="CSV with 'form' and 'correct' columns (default: test_data.csv)")
+    bench.add_argument("-o", "--output", default="benchmark.json", help="JSON report (default: benchmark.json)")
+    bench.add_argument("-d", "--dictionary", help="Dictionary file (default: settings.spellchecker_dictionary_path)")
+    bench.add_argument("--index", help="Index file (default: settings.spellchecker_index_path, or "
+                                       "settings.spellchecker_trie_path with the trie term store)")
+    bench.add_argument("--workers", type=int, default=1, help="Worker processes correcting the set (default: 1)")
+    bench.add_argument("--repeat", type=int, default=1, help="Times the set is corrected (default: 1)")
+    bench.add_argument("--top-k", type=int, default=1000, help="Suggestions kept per word (default: 1000)")
+    bench.add_argument("--baseline", help="Earlier report; exit with status 1 on a regression against it")
+    bench.add_argument("--max-slowdown", type=float, default=0.2,
+                       help="Allowed relative p50 / p95 latency growth against the baseline (default: 0.2)")
+
+    sweep = commands.add_parser("sweep-dictionary", help="Measure dictionary builds over a grid of SymSpell settings")
+    sweep.add_argument("labelled", nargs="?", default="test_data.csv",
+                       help="CSV with 'form' and 'correct' columns (default: test_data.csv)")
+    sweep.add_argument("--corpus-dir", help="Corpus directory (default: settings.spellchecker_corpus_dir)")
+    sweep.add_argument("-o", "--output-dir", default="sweep", help="Dictionaries, indexes and results (default: sweep)")
+    sweep.add_argument("--max-edit-distance", type=int, nargs="+", default=[1, 2], help="Grid values (default: 1 2)")
+    sweep.add_argument("--prefix-length", type=int, nargs="+", default=[5, 7], help="Grid values (default: 5 7)")
+    sweep.add_argument("--min-freq", type=int, nargs="+", default=[2, 5], help="Grid values (default: 2 5)")
+    sweep.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes counting the corpus")
+    sweep.add_argument("--repeat", type=int, default=1, help="Times the labelled set is corrected per configuration")
+    sweep.add_argument("--objectives", help="Pareto objectives, '-' for smaller is better "
+                                            "(default: accuracy,-p95_ms,-index_mb)")
+    return parser
+
+
+def build_lexicon(args) -> None:
+    from app.config import settings
+    from app.utils.lexicon import build_full_ktiv_lexicon
+    from app.utils.spellcheck import CorpusLoader
+
+    loader = CorpusLoader(args.corpus_dir or settings.spellchecker_corpus_dir)
+    output = args.output or settings.full_ktiv_lexicon_path
+    lexicon, stats = build_full_ktiv_lexicon(
+        loader.load_texts(),
+        batch_size=args.batch_size,
+        min_count=args.min_count,
+        max_sentences=args.max_sentences,
+    )
+    lexicon.save(output)
+    print(f"✅ Lexicon with {len(lexicon):,} words → {output} {stats}", file=sys.stderr)
+
+
+def build_dictionary(args) -> None:
+    from app.config import settings
+    from app.utils.dictionary_updates import companion_paths, save_full_build
+    from app.utils.spellcheck import CorpusLoader, HebrewTokenizer, SymSpellBuilder, prefix_stats_path
+    from app.utils.symspell_index import source_stamp
+    from app.utils.term_trie import write_term_trie
+
+    loader = CorpusLoader(args.corpus_dir or settings.spellchecker_corpus_dir, text_field=args.text_field,
+                          csv_column=args.csv_column, readahead=args.readahead)
+    output = args.output or settings.spellchecker_dictionary_path
+    min_freq = settings.spellchecker_min_freq if args.min_freq is None else args.min_freq
+
+    builder = SymSpellBuilder(settings.spellchecker_max_edit_distance, settings.spellchecker_prefix_length)
+    max_terms = settings.spellchecker_count_max_terms if args.max_terms is None else args.max_terms
+    prefix_mode = args.prefix_mode or settings.spellchecker_prefix_mode
+    checkpoint_every = settings.spellchecker_build_checkpoint_every if args.checkpoint_every is None \
+        else args.checkpoint_every
+    checkpoint_dir = args.checkpoint_dir or f"{output}.checkpoint"
+    if args.restart:
+        shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    items = builder.count_corpus(loader, HebrewTokenizer(), min_freq=min_freq, workers=args.workers,
+                                 max_terms=max_terms,
+                                 checkpoint_dir=checkpoint_dir if checkpoint_every > 0 else None,
+                                 checkpoint_every=checkpoint_every,
+                                 residual_path=str(companion_paths(output)["build_residual"]))
+    items = builder.fold_items(items, prefix_mode)
+    trie = settings.spellchecker_term_store == "trie"
+    if not trie:
+        builder.build_symspell_from_counts(items)
+    # Written atomically, then the checkpoint is removed; the update manifest,
+    # residual and delta log start over from this build
+    save_full_build(builder, output, loader.corpus_files(), items if trie else None)
+    if builder.prefix_model is not None:
+        prefix_path = prefix_stats_path(output)
+        builder.prefix_model.save(prefix_path)
+        print(f"✅ Prefix statistics → {prefix_path}", file=sys.stderr)
+    if trie:
+        # The trie is written straight from the pruned counts; SymSpell and its delete index are never built
+        index = args.index or settings.spellchecker_trie_path
+        write_term_trie(dict(items), index, source_stamp(output))
+    else:
+        index = args.index or settings.spellchecker_index_path
+        builder.save_index(index, output)
+    print(f"✅ Dictionary with {len(items):,} words → {output} (index: {index})", file=sys.stderr)
+
+
+def update_dictionary_files(args) -> None:
+    from app.utils.dictionary_updates import update_dictionary
+
+    stats = update_dictionary(args.inputs, args.dictionary, min_freq=args.min_freq, workers=args.workers)
+    print(f"✅ Dictionary updated: {stats}", file=sys.stderr)
+
+
+def build_index(args) -> None:
+    from app.utils.spellcheck import load_spellchecker
+
+    # Loading writes the index when it is missing or was built from another dictionary file
+    spellchecker = load_spellchecker(args.dictionary, index_path=args.index)
+    print(f"✅ Spelling index ready ({type(spellchecker.symspell).__name__}, "
+          f"{len(spellchecker.symspell.words):,} words)", file=sys.stderr)
+
+
+def benchmark_spellcheck(args) -> int:
+    from app.utils.spell_benchmark import compare_reports, run_benchmark, write_report
+
+    load_options = {"dictionary_path": args.dictionary, "index_path": args.index}
+    report = run_benchmark(args.labelled, workers=args.workers, top_k=args.top_k, repeat=args.repeat,
+                           load_options={name: value for name, value in load_options.items() if value})
+    write_report(report, args.output)
+    latency = report["latency_ms"]
+    print(f"✅ {report['words']:,} words: accuracy {report['accuracy']['accuracy']:.2%}, "
+          f"p50 {latency['p50']:.3f} ms, p95 {latency['p95']:.3f} ms, "
+          f"{report['lookups_per_second']:,.0f} lookups/s, dictionary {report['memory']['dictionary_mb']:.1f} MB "
+          f"→ {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_reports(report, json.load(f), max_slowdown=args.max_slowdown)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+def sweep_dictionary(args) -> None:
+    from app.config import settings
+    from app.utils.build_sweep import format_table, parse_objectives, run_sweep
+
+    result = run_sweep(args.corpus_dir or settings.spellchecker_corpus_dir, args.labelled, args.output_dir,
+                       max_edit_distances=args.max_edit_distance, prefix_lengths=args.prefix_length,
+                       min_freqs=args.min_freq, workers=args.workers, repeat=args.repeat,
+                       objectives=parse_objectives(args.objectives))
+    print(format_table(result["configs"]))
+    front = sum(1 for row in result["configs"] if row["pareto"])
+    print(f"✅ {len(result['configs'])} configurations, {front} on the Pareto front (★) → "
+          f"{args.output_dir}/sweep.json", file=sys.stderr)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "normalize":
+        lines = normalize_files(
+            args.inputs,
+            args.output,
+            with_nikud=args.with_nikud,
+            full_ktiv=not args.no_full_ktiv,
+            text_field=args.text_field,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            checkpoint_path=args.checkpoint,
+            restart=args.restart,
+            report_interval=args.report_interval,
+        )
+        print(f"✅ Normalized {lines:,} lines → {args.output}", file=sys.stderr)
+    elif args.command == "build-lexicon":
+        build_lexicon(args)
+    elif args.command == "build-dictionary":
+        build_dictionary(args)
+    elif args.command == "update-dictionary":
+        update_dictionary_files(args)
+    elif args.command == "build-index":
+        build_index(args)
+    elif args.command == "benchmark-spellcheck":
+        return benchmark_spellcheck(args)
+    elif args.command == "sweep-dictionary":
+        sweep_dictionary(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,34 @@ class Settings(BaseSettings):
     spellchecker_max_edit_distance: int = 2
     spellchecker_prefix_length: int = 7
     spellchecker_corpus_dir: str = "app/data/spellcheck_corpus"
+    spellchecker_corpus_text_field: str = "text"  # JSONL field holding the text
+    spellchecker_corpus_csv_column: str = ""  # CSV column name or index ("" = all columns of every row)
+    spellchecker_corpus_buffer_size: int = 1 << 20  # Read buffer size for corpus files
+    spellchecker_corpus_readahead: int = 0  # Batches read ahead on a background thread (0 = read inline)
+    spellchecker_dictionary_path: str = "app/data/symspell/symspell.txt"
+    spellchecker_index_path: str = "app/data/symspell/symspell.idx"  # Memory-mapped binary index
+    spellchecker_term_store: str = "symspell"  # "symspell" (delete index, fastest) or "trie" (compact mapped trie)
+    spellchecker_trie_path: str = "app/data/symspell/symspell.trie"  # Term trie file of the trie term store
+    spellchecker_min_freq: int = 5  # Minimum corpus frequency for dictionary terms
+    spellchecker_build_workers: int = 1  # Processes counting the corpus when building the dictionary
+    spellchecker_count_max_terms: int = 0  # Distinct tokens counted in memory before spilling to disk (0 = unbounded)
+    spellchecker_build_checkpoint_every: int = 10  # Chunks (serial) or shards (parallel) between build checkpoints (0 = off)
+    spellchecker_refresh_interval: float = 30.0  # Seconds between checks for dictionary updates in each worker (0 = only /spellcheck/refresh)
+    spellchecker_cache_size: int = 50000  # Corrected words kept in the LRU cache (0 disables it)
+    spellchecker_known_min_count: int = 1  # Known words at least this frequent skip the SymSpell lookup (top_k = 1 only)
+    spellchecker_bloom_filter: bool = False  # Check the mapped index Bloom filter before the term table
+    spellchecker_prefix_mode: bool = False  # Fold prefixed forms (ו/ש/ב/כ/ל/מ/ה) into base words
+    spellchecker_prefix_stats_path: str = "app/data/symspell/prefixes.json"  # Prefix statistics of prefix-mode builds
+    spellchecker_tiered_lookup: bool = True  # Distance 1 / CLOSEST lookup first, distance 2 / ALL only when needed
+    spellchecker_tier_max_cost: float = 1.0  # Weighted distance that settles a word in the first tier
+    spellchecker_short_word_length: int = 3  # Words up to this length are capped at edit distance 1
+    spellchecker_confusion_candidates: bool = True  # Probe confusion / doubled / final-letter variants before SymSpell
+    spellchecker_batch_workers: int = 0  # Processes reranking /spellcheck/batch tokens (below 2 = in the server process)
+    spellchecker_batch_chunk_size: int = 512  # Unknown tokens sent to a batch worker at a time
+    full_ktiv_lexicon_path: str = "app/data/lexicon/full_ktiv.tsv"  # Offline full ktiv lexicon
+    vectorized_min_chars: int = 2000  # Batch size (characters) above which NumPy kernels are used
+    vectorized_min_candidates: int = 64  # Spellcheck candidates per batch above which reranking uses NumPy
+    incremental_max_documents: int = 1000  # Documents kept for incremental normalization
 
     class Config:
         env_file = ".env"
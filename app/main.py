@@ -1,14 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.routes import nikud, normalize, spellcheck
 from app.config import settings
+from app.utils.spellcheck import close_batch_pool, get_spellchecker, init_spellchecker
 import platform
 import psutil
 import time
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load shared resources once at startup"""
+    # The prebuilt spelling index is mapped here, never per request; building it
+    # from the corpus is left to `app.cli build-dictionary` / `build-index`
+    init_spellchecker()
+    yield
+    close_batch_pool()
+
 app = FastAPI(
     title="HEBNORM - Hebrew Text Normalizer",
     description="API for Hebrew text: nikud, normalization, spellcheck",
-    version="0.1"
+    version="0.1",
+    lifespan=lifespan
 )
 
 # API version prefix
@@ -69,7 +81,9 @@ def healthcheck():
             "model": settings.nikud_model,
             "system": system_info,
             "memory": memory_info,
-            "cpu": cpu_info
+            "cpu": cpu_info,
+            "spellcheck_cache": get_spellchecker().cache_info(),
+            "spellcheck_tiers": get_spellchecker().tier_info()
         }
     except Exception as e:
         return {
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from app.utils.nikud import add_nikud
 
@@ -34,8 +34,14 @@ def add_nikud_endpoint(req: TextRequest):
             "keep_vowels": true
         }
     """
+    try:
+        output = add_nikud(req.text, req.keep_vowels)
+    except (ImportError, OSError) as e:
+        # Model dependencies or weights are not available
+        raise HTTPException(status_code=500, detail=f"Nikud model is not available: {e}")
+
     return {
         "input": req.text, 
-        "output": add_nikud(req.text, req.keep_vowels),
+        "output": output,
         "keep_vowels": req.keep_vowels
     }
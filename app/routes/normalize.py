@@ -1,17 +1,42 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from app.utils.normalizer import normalize
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from app.config import settings
+from app.utils.incremental import DocumentCache
+from app.utils.normalizer import compile_stage_plan, normalize
 
 router = APIRouter()
 
+# Previous versions of documents sent in incremental mode
+document_cache = DocumentCache(max_documents=settings.incremental_max_documents)
+
 class NormalizeRequest(BaseModel):
     text: str
     with_nikud: bool = False
     spellcheck: bool = False
-    customization: dict | None = None
+    customization: dict | None = Field(
+        default=None,
+        description="Stage selection, e.g. {\"full_ktiv\": false} for final letters only. "
+                    "Keys: final_letters, full_ktiv, full_ktiv_rules, lexicon, spellcheck."
+    )
+    document_id: str | None = Field(
+        default=None,
+        description="Enables incremental mode: only sentences that changed since the "
+                    "previous version of this document are re-normalized."
+    )
 
 @router.post("/normalize")
 def normalize_endpoint(req: NormalizeRequest):
-    return {"input": req.text, "output": normalize(
-        req.text, req.with_nikud, req.spellcheck, req.customization
-    )}
+    try:
+        compile_stage_plan(req.with_nikud, req.spellcheck, req.customization)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if req.document_id is None:
+        return {"input": req.text, "output": normalize(
+            req.text, req.with_nikud, req.spellcheck, req.customization
+        )}
+
+    output, stats = document_cache.normalize(
+        req.document_id, req.text, req.with_nikud, req.spellcheck, req.customization
+    )
+    return {"input": req.text, "output": output, "document_id": req.document_id, **stats}
@@ -1,12 +1,40 @@
 from fastapi import APIRouter
-from pydantic import BaseModel
-from app.utils.spellcheck import spellcheck
+from pydantic import BaseModel, Field
+from app.utils.spellcheck import correct_batch, get_spellchecker
 
 router = APIRouter()
 
 class SpellRequest(BaseModel):
     text: str
+    include_stats: bool = False  # Also return how many words each lookup tier settled
 
 @router.post("/spellcheck")
 def spellcheck_endpoint(req: SpellRequest):
-    return {"input": req.text, "output": spellcheck(req.text)}
+    # The shared spellchecker is loaded at startup, so requests only pay for lookups
+    stats = {}
+    response = {"input": req.text, "output": get_spellchecker().correct_text(req.text, stats=stats)}
+    if req.include_stats:
+        response["stats"] = stats
+    return response
+
+
+class SpellBatchRequest(BaseModel):
+    texts: list[str]
+    top_k: int = Field(default=0, ge=0, le=100, description="Suggestions per distinct token (0 = corrections only)")
+    include_stats: bool = False
+
+@router.post("/spellcheck/batch")
+def spellcheck_batch_endpoint(req: SpellBatchRequest):
+    # Tokens are deduplicated across all texts and resolved once (on the batch pool if configured)
+    stats = {}
+    response = {"results": correct_batch(req.texts, req.top_k, stats)}
+    if req.include_stats:
+        response["stats"] = stats
+    return response
+
+
+@router.post("/spellcheck/refresh")
+def spellcheck_refresh_endpoint():
+    # Applies dictionary updates written by `python -m app.cli update-dictionary` without a reload.
+    # Only this worker refreshes now; the others poll (settings.spellchecker_refresh_interval)
+    return get_spellchecker().refresh()
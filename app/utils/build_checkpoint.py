@@ -0,0 +1,135 @@
+"""
+Checkpoints of long dictionary builds.
+
+Counting a large corpus takes hours, and all the counts live in memory until
+the dictionary is written. A BuildCheckpoint directory keeps the partial
+counts and the corpus read position on disk, so a restarted build skips what
+was already counted:
+
+- state.json: the corpus fingerprint, the read position and the counts files
+- counts-NNNNNN.tsv: the in-memory Counter as "term<TAB>count" lines in
+  first-seen order, or
+- runs/: the sorted runs of a SpillingCounter, which are immutable once
+  written, so a checkpoint only spills and records their names (relative to
+  the checkpoint directory, so a build resumes from any working directory)
+
+Every save writes and fsyncs a new counts file (or run) first and then
+replaces state.json atomically, so a crash at any point leaves the previous or
+the new checkpoint, never a mix. A checkpoint is only resumed when the corpus files (names, sizes,
+modification times), the reader options and the counting mode are unchanged;
+otherwise the build starts over.
+"""
+
+import json
+import os
+import pathlib
+import shutil
+from collections import Counter
+from typing import Optional
+
+from app.utils.counting import SpillingCounter
+
+STATE_FILE = "state.json"
+RUNS_DIR = "runs"
+
+
+def corpus_fingerprint(loader, **options) -> dict:
+    """Identity of a corpus and the way it is counted; a checkpoint only resumes an identical one."""
+    files = []
+    for file in loader.corpus_files():
+        stat = file.stat()
+        files.append([str(file), stat.st_size, stat.st_mtime_ns])
+    return {"files": files, "reader_options": loader.reader_options(), **options}
+
+
+class BuildCheckpoint:
+    """Partial counts and read position of a dictionary build, kept in `directory`."""
+
+    def __init__(self, directory: str, fingerprint: dict):
+        self.directory = pathlib.Path(directory)
+        self.fingerprint = fingerprint
+        self.runs_dir = str(self.directory / RUNS_DIR)
+        self.saves = 0
+        self._counts_file: Optional[str] = None
+
+    @property
+    def state_path(self) -> pathlib.Path:
+        return self.directory / STATE_FILE
+
+    def read_state(self) -> Optional[dict]:
+        """The saved state, or None if there is none or it belongs to a different corpus."""
+        if not self.state_path.is_file():
+            return None
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("fingerprint") != self.fingerprint:
+            print(f"⚠️  Build checkpoint {self.directory} does not match the corpus, starting over")
+            return None
+        return state
+
+    def resume(self, max_terms: int = 0):
+        """
+        Start counting from the saved checkpoint, or from scratch if there is none.
+
+        Args:
+            max_terms: Distinct tokens counted in memory before spilling
+                (0 = a plain Counter, see SpillingCounter)
+
+        Returns:
+            Tuple of (counts holding the saved counts, saved read position or
+            None when the build starts from the beginning)
+        """
+        state = self.read_state()
+        if state is None:
+            self.clear()
+        counts = SpillingCounter(max_terms, run_dir=self.runs_dir) if max_terms > 0 else Counter()
+        if state is None:
+            return counts, None
+
+        if isinstance(counts, SpillingCounter):
+            counts.restore([str(self.directory / run) for run in state["runs"]], state["seen"])
+        elif state["counts"]:
+            with open(self.directory / state["counts"], encoding="utf-8") as f:
+                for line in f:
+                    term, count = line.rstrip("\n").split("\t")
+                    counts[term] = int(count)
+        self.saves = state["saves"]
+        self._counts_file = state["counts"]
+        print(f"♻️  Resuming build from checkpoint {self.directory} at {state['position']}")
+        return counts, state["position"]
+
+    def save(self, counts, position: dict) -> None:
+        """Save `counts` (Counter or SpillingCounter) and the read position after them."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.saves += 1
+        state = {"fingerprint": self.fingerprint, "position": position, "saves": self.saves,
+                 "counts": None, "runs": [], "seen": 0}
+
+        if isinstance(counts, SpillingCounter):
+            counts.spill()
+            state["runs"] = [os.path.relpath(run, self.directory) for run in counts.runs]
+            state["seen"] = counts.seen
+        else:
+            state["counts"] = f"counts-{self.saves:06d}.tsv"
+            with open(self.directory / state["counts"], "w", encoding="utf-8") as f:
+                for term, count in counts.items():
+                    f.write(f"{term}\t{count}\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+        tmp_path = self.state_path.with_name(f"{STATE_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+
+        if self._counts_file and self._counts_file != state["counts"]:
+            (self.directory / self._counts_file).unlink(missing_ok=True)
+        self._counts_file = state["counts"]
+
+    def clear(self) -> None:
+        """Remove the checkpoint (after the dictionary was written, or to start over)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.saves = 0
+        self._counts_file = None
@@ -0,0 +1,237 @@
+"""
+Parameter sweep over the SymSpell build settings.
+
+max_edit_distance, prefix_length and min_freq trade dictionary size, memory
+and lookup latency against accuracy. The sweep counts the corpus once, writes
+one pruned dictionary per min_freq, and then measures every combination of
+the grid in two fresh processes, so the measurements of one configuration do
+not inherit the memory of another:
+
+- build: SymSpell is filled from the pruned dictionary and the mapped index
+  is written (build time, RSS growth and peak RSS, index size)
+- serve: the index is mapped like a server worker maps it and the labelled
+  set is benchmarked (see spell_benchmark): accuracy, latency percentiles,
+  lookups/sec and the RSS of the serving process
+
+Configurations run one after another so they do not compete for CPU.
+pareto_front() marks the configurations no other one beats on every
+objective (by default accuracy, p95 latency and index size); those are the
+candidates for the production settings.
+"""
+
+import gc
+import itertools
+import json
+import multiprocessing
+import pathlib
+import resource
+import time
+from typing import Optional
+
+from app.utils.spell_benchmark import benchmark_spellchecker, read_labelled_pairs, rss_bytes
+
+# (report field, True if larger is better)
+DEFAULT_OBJECTIVES = (("accuracy", True), ("p95_ms", False), ("index_mb", False))
+TABLE_COLUMNS = (
+    ("max_edit_distance", "dist", "{}"),
+    ("prefix_length", "prefix", "{}"),
+    ("min_freq", "min_freq", "{}"),
+    ("words", "words", "{:,}"),
+    ("build_seconds", "build s", "{:.2f}"),
+    ("index_mb", "index MB", "{:.1f}"),
+    ("build_rss_mb", "build RSS MB", "{:.1f}"),
+    ("serve_rss_mb", "serve RSS MB", "{:.1f}"),
+    ("p50_ms", "p50 ms", "{:.3f}"),
+    ("p95_ms", "p95 ms", "{:.3f}"),
+    ("lookups_per_second", "lookups/s", "{:,.0f}"),
+    ("accuracy", "accuracy", "{:.2%}"),
+)
+
+
+def sweep_configs(max_edit_distances, prefix_lengths, min_freqs) -> list[dict]:
+    """The grid, without the combinations SymSpell rejects (prefix_length must exceed max_edit_distance)."""
+    return [{"max_edit_distance": distance, "prefix_length": prefix, "min_freq": min_freq}
+            for min_freq, distance, prefix in itertools.product(min_freqs, max_edit_distances, prefix_lengths)
+            if prefix > distance]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is in KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_build(config: dict, dictionary_path: str, index_path: str) -> dict:
+    """Build SymSpell from a pruned dictionary and write its index (runs in a fresh process)."""
+    from app.utils.dictionary_updates import read_counts
+    from app.utils.spellcheck import SymSpellBuilder
+
+    items = list(read_counts(pathlib.Path(dictionary_path)).items())
+    gc.collect()
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    builder = SymSpellBuilder(config["max_edit_distance"], config["prefix_length"])
+    builder.build_symspell_from_counts(items)
+    symspell_seconds = time.perf_counter() - start
+    rss_built = rss_bytes()
+    builder.save_index(index_path, dictionary_path)
+    return {
+        "words": len(builder.sym_spell.words),
+        "build_seconds": time.perf_counter() - start,
+        "symspell_seconds": symspell_seconds,
+        "build_rss_mb": (rss_built - rss_before) / 2**20,
+        "build_peak_rss_mb": peak_rss_mb(),
+        "index_mb": pathlib.Path(index_path).stat().st_size / 2**20,
+    }
+
+
+def measure_serving(config: dict, dictionary_path: str, index_path: str, pairs: list[tuple[str, str]],
+                    top_k: int = 1000, repeat: int = 1) -> dict:
+    """
+    Map the index written by measure_build and benchmark the labelled pairs
+    (runs in a fresh process).
+
+    Raises:
+        FileNotFoundError: If the index is missing or was not built from the dictionary
+    """
+    from app.config import settings
+    from app.utils import vectorized  # noqa: F401 - imported by the first lookup, not part of the dictionary's memory
+    from app.utils.spellcheck import index_is_current, load_spellchecker
+
+    if not index_is_current(index_path, dictionary_path):
+        raise FileNotFoundError(f"No index of {dictionary_path} at {index_path}; measure_build writes it")
+    settings.spellchecker_max_edit_distance = config["max_edit_distance"]
+    settings.spellchecker_prefix_length = config["prefix_length"]
+    settings.spellchecker_term_store = "symspell"
+    rss_before = rss_bytes()
+    spellchecker = load_spellchecker(dictionary_path, index_path=index_path, build=False)
+    report = benchmark_spellchecker(spellchecker, pairs, top_k=top_k, repeat=repeat)
+    return {
+        "serve_rss_mb": (rss_bytes() - rss_before) / 2**20,
+        "accuracy": report["accuracy"]["accuracy"],
+        "false_corrections": report["accuracy"]["false_corrections"],
+        "p50_ms": report["latency_ms"]["p50"],
+        "p95_ms": report["latency_ms"]["p95"],
+        "p99_ms": report["latency_ms"]["p99"],
+        "lookups_per_second": report["lookups_per_second"],
+        "candidates_mean": report["candidates"]["mean"],
+    }
+
+
+def pareto_front(rows: list[dict], objectives=DEFAULT_OBJECTIVES) -> list[dict]:
+    """
+    Mark every row with "pareto": True if no other row is at least as good on
+    all objectives and better on one.
+
+    Args:
+        rows: Sweep results
+        objectives: (field, larger is better) pairs
+
+    Returns:
+        The rows on the front, in input order
+    """
+    def at_least_as_good(a: dict, b: dict) -> bool:
+        return all(a[field] >= b[field] if larger else a[field] <= b[field] for field, larger in objectives)
+
+    for row in rows:
+        row["pareto"] = not any(
+            other is not row and at_least_as_good(other, row) and not at_least_as_good(row, other)
+            for other in rows
+        )
+    return [row for row in rows if row["pareto"]]
+
+
+def format_table(rows: list[dict]) -> str:
+    """Markdown table of the sweep, best accuracy first; Pareto-optimal rows are starred."""
+    header = ["", *(title for _, title, _ in TABLE_COLUMNS)]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for row in sorted(rows, key=lambda r: (-r["accuracy"], r["p95_ms"], r["index_mb"])):
+        cells = ["★" if row.get("pareto") else "", *(fmt.format(row[field]) for field, _, fmt in TABLE_COLUMNS)]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def run_sweep(
+    corpus_dir: str,
+    labelled: str,
+    output_dir: str,
+    max_edit_distances=(1, 2),
+    prefix_lengths=(5, 7),
+    min_freqs=(2, 5),
+    workers: int = 1,
+    top_k: int = 1000,
+    repeat: int = 1,
+    objectives=DEFAULT_OBJECTIVES,
+    loader=None,
+) -> dict:
+    """
+    Count the corpus once and measure every configuration of the grid.
+
+    Args:
+        corpus_dir: Corpus directory (see CorpusLoader)
+        labelled: Labelled CSV with 'form' and 'correct' columns
+        output_dir: Directory for the pruned dictionaries, indexes, sweep.json and sweep.md
+        workers: Processes counting the corpus
+        top_k: Suggestions kept per word in the benchmark
+        repeat: Times the labelled set is corrected per configuration
+        objectives: Objectives of the Pareto front (see pareto_front)
+        loader: CorpusLoader to read the corpus with (default: CorpusLoader(corpus_dir))
+
+    Returns:
+        Dictionary with the counting time and one result row per configuration
+    """
+    from app.utils.dictionary_updates import write_counts
+    from app.utils.spellcheck import CorpusLoader, HebrewTokenizer, SymSpellBuilder
+
+    output = pathlib.Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    pairs = read_labelled_pairs(labelled)
+    configs = sweep_configs(max_edit_distances, prefix_lengths, min_freqs)
+    if not configs:
+        raise ValueError("The grid has no valid configuration (prefix_length must exceed max_edit_distance)")
+
+    loader = loader or CorpusLoader(corpus_dir)
+    start = time.perf_counter()
+    if workers > 1:
+        counts = SymSpellBuilder.build_counts_parallel(loader, workers)
+    else:
+        counts = SymSpellBuilder.build_counts_from_stream(loader.load_tokens(HebrewTokenizer()))
+    count_seconds = time.perf_counter() - start
+
+    dictionaries = {}
+    for min_freq in sorted(set(config["min_freq"] for config in configs)):
+        dictionaries[min_freq] = output / f"symspell-f{min_freq}.txt"
+        write_counts(dictionaries[min_freq], dict(SymSpellBuilder.prune_counts(counts, min_freq)))
+    del counts
+
+    rows = []
+    context = multiprocessing.get_context("spawn")
+    for i, config in enumerate(configs, 1):
+        dictionary_path = str(dictionaries[config["min_freq"]])
+        index_path = str(output / "symspell-d{max_edit_distance}-p{prefix_length}-f{min_freq}.idx".format(**config))
+        print(f"🔧 [{i}/{len(configs)}] {config}")
+        # A fresh process per measurement, so no configuration inherits another one's memory
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            build = pool.apply(measure_build, (config, dictionary_path, index_path))
+            serve = pool.apply(measure_serving, (config, dictionary_path, index_path, pairs, top_k, repeat))
+        rows.append({**config, **build, **serve})
+
+    pareto_front(rows, objectives)
+    result = {
+        "corpus_dir": corpus_dir,
+        "labelled_set": labelled,
+        "count_seconds": count_seconds,
+        "objectives": [list(objective) for objective in objectives],
+        "configs": rows,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(output / "sweep.json", "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    (output / "sweep.md").write_text(format_table(rows) + "\n", encoding="utf-8")
+    return result
+
+
+def parse_objectives(spec: Optional[str]):
+    """Objectives from "accuracy,-p95_ms,-index_mb" (a leading '-' means smaller is better)."""
+    if not spec:
+        return DEFAULT_OBJECTIVES
+    return tuple((name.lstrip("-"), not name.startswith("-")) for name in spec.split(",") if name)
@@ -0,0 +1,254 @@
+"""
+Streaming readers for spelling corpus files.
+
+Supported files are plain text (.txt, one text per line), CSV (.csv, one or
+all columns) and JSONL (.jsonl, one field of every record), each optionally
+compressed with gzip (.gz), bzip2 (.bz2) or xz (.xz). Compressed files are
+decompressed while streaming, never to disk.
+
+iter_texts() yields the texts; iter_records() also yields every record with
+the offset after it, for readers that checkpoint (the normalize command).
+
+Reads go through large buffers, and readahead() can move reading and
+decompression to a background thread (zlib, bz2 and lzma release the GIL
+while they work), so the tokenizer does not wait for the disk.
+
+Progress is reported through a callback taking CorpusProgress events instead
+of printing; print_progress is the console implementation.
+"""
+
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import pathlib
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional
+
+FORMATS = {".txt": "text", ".csv": "csv", ".jsonl": "jsonl"}
+COMPRESSIONS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class CorpusProgress:
+    """
+    A progress event.
+
+    `event` is "file" (a file is about to be read), "lines" (every
+    `progress_every` lines), "shards" (a shard was counted in parallel) or
+    "done" (all files were read).
+    """
+    event: str
+    file: Optional[str] = None
+    files_done: int = 0
+    files_total: int = 0
+    lines: int = 0
+    shards_done: int = 0
+    shards_total: int = 0
+
+
+ProgressCallback = Callable[[CorpusProgress], None]
+
+
+def print_progress(progress: CorpusProgress) -> None:
+    """Console progress: one line per file, every N lines and every 10 shards."""
+    if progress.event == "file":
+        print(f"📄 [{progress.files_done + 1}/{progress.files_total}] {progress.file}")
+    elif progress.event == "lines":
+        print(f"📊 Processed {progress.lines:,} lines...")
+    elif progress.event == "shards":
+        if progress.shards_done % 10 == 0 or progress.shards_done == progress.shards_total:
+            print(f"📊 Counted {progress.shards_done}/{progress.shards_total} shards")
+    elif progress.event == "done":
+        print(f"✅ Read {progress.lines:,} lines from {progress.files_total} files")
+
+
+def corpus_format(path) -> tuple[Optional[str], str]:
+    """(format, compression suffix) of a corpus file; format is None for unsupported files."""
+    suffixes = pathlib.Path(path).suffixes
+    compression = suffixes[-1] if suffixes and suffixes[-1] in COMPRESSIONS else ""
+    if compression:
+        suffixes = suffixes[:-1]
+    return (FORMATS.get(suffixes[-1]) if suffixes else None), compression
+
+
+def is_splittable(path) -> bool:
+    """Uncompressed plain text, which can be read in byte ranges (CorpusLoader.shards)."""
+    return corpus_format(path) == ("text", "")
+
+
+def open_binary(path, buffer_size: int = DEFAULT_BUFFER_SIZE, fileobj=None):
+    """
+    Open a corpus file for buffered binary reading, decompressing on the fly.
+
+    With `fileobj` (the file on disk, opened for binary reading) the data is
+    read from it, and its tell() gives how much of the file was read; the
+    caller closes it.
+    """
+    _, compression = corpus_format(path)
+    if compression:
+        return io.BufferedReader(COMPRESSIONS[compression](fileobj or path, "rb"), buffer_size)
+    return fileobj or open(path, "rb", buffering=buffer_size)
+
+
+def record_text(record, text_field: str) -> Optional[str]:
+    """The `text_field` string of a parsed JSONL record, or None if it has none."""
+    text = record.get(text_field) if isinstance(record, dict) else None
+    return text if isinstance(text, str) else None
+
+
+def iter_texts(
+    path,
+    text_field: str = "text",
+    csv_column: str = "",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Iterator[str]:
+    """
+    Generator – the stripped texts of one corpus file.
+
+    Args:
+        path: Corpus file
+        text_field: JSONL field holding the text (records without it yield nothing)
+        csv_column: CSV column name (the first row is the header), column index,
+            or "" for all columns of every row joined with spaces
+        buffer_size: Read buffer size in bytes
+
+    Raises:
+        ValueError: For an unsupported file type or a CSV column that does not exist
+    """
+    file_format, _ = corpus_format(path)
+    if file_format is None:
+        raise ValueError(f"Unsupported corpus file: {path}")
+
+    with open_binary(path, buffer_size) as raw:
+        # Universal newlines like the text-mode reads this replaces (\n, \r\n and \r end a line)
+        f = io.TextIOWrapper(raw, encoding="utf-8", newline="" if file_format == "csv" else None)
+        if file_format == "text":
+            for line in f:
+                yield line.strip()
+        elif file_format == "jsonl":
+            for line in f:
+                if not line.strip():
+                    continue
+                text = record_text(json.loads(line), text_field)
+                if text is not None:
+                    yield text.strip()
+        else:
+            yield from _iter_csv(csv.reader(f), csv_column, path)
+
+
+def _iter_csv(reader, csv_column: str, path) -> Iterator[str]:
+    csv.field_size_limit(1 << 30)
+    if not csv_column:
+        for row in reader:
+            yield " ".join(row).strip()
+        return
+
+    if csv_column.isdigit():
+        column = int(csv_column)
+    else:
+        header = next(reader, [])
+        if csv_column not in header:
+            raise ValueError(f"{path} has no CSV column {csv_column!r} (columns: {header})")
+        column = header.index(csv_column)
+    for row in reader:
+        if column < len(row):
+            yield row[column].strip()
+
+
+def iter_records(
+    path,
+    text_field: str = "text",
+    start_offset: int = 0,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Iterator[tuple[int, int, str, Optional[dict]]]:
+    """
+    Generator – (end_offset, disk_position, text, record) for every line of a
+    corpus file, for readers that write every record back and checkpoint
+    where they stopped.
+
+    `end_offset` is the decompressed byte offset just after the line: pass it
+    as `start_offset` to resume after it. `disk_position` is how much of the
+    file on disk was read (for progress over compressed files). JSONL files
+    yield the parsed record and its `text_field` ("" when it has none), skipping
+    blank lines; every other file is read as plain text lines, kept as they are
+    apart from the line break, with record None.
+    """
+    file_format, _ = corpus_format(path)
+    with open(path, "rb", buffering=buffer_size) as disk, open_binary(path, buffer_size, disk) as f:
+        offset = start_offset
+        if offset:
+            f.seek(offset)
+        for raw in f:
+            offset += len(raw)
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if file_format != "jsonl":
+                yield offset, disk.tell(), line, None
+            elif line.strip():
+                record = json.loads(line)
+                yield offset, disk.tell(), record_text(record, text_field) or "", record
+
+
+_DONE = object()
+
+
+class _ReaderError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def readahead(iterable: Iterable, depth: int = 8, batch_size: int = 1024) -> Iterator:
+    """
+    Iterate `iterable` on a background thread, up to `depth` batches of
+    `batch_size` items ahead of the consumer. Errors are re-raised in the
+    consumer; closing the generator stops the thread.
+    """
+    batches: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            batch = []
+            for item in iterable:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_DONE)
+        except BaseException as e:
+            put(_ReaderError(e))
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="corpus-readahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _DONE:
+                return
+            if isinstance(batch, _ReaderError):
+                raise batch.error
+            yield from batch
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,123 @@
+"""
+Bounded-memory exact token counting.
+
+SpillingCounter counts in an in-memory Counter until it holds `max_terms`
+distinct tokens, then writes it to disk as a run sorted by token and starts a
+new one. items() merges the runs (heapq.merge over the sorted files), sums the
+counts and applies min_freq while streaming, so only the surviving terms are
+ever held in memory again.
+
+Every token also carries the rank at which it was first seen; after the merge
+the survivors are ordered by it, so the result equals
+SymSpellBuilder.prune_counts(Counter(tokens), min_freq) item for item.
+
+With `run_dir` the runs go to a directory owned by the caller and survive
+close(), so a build checkpoint can reference them and restore() a counter
+from them after a restart (see build_checkpoint).
+"""
+
+import heapq
+import os
+import shutil
+import tempfile
+from collections import Counter
+from itertools import groupby
+from typing import Callable, Iterable, Iterator, Optional
+
+
+class SpillingCounter:
+    """Exact Counter with a bounded number of distinct tokens in memory."""
+
+    def __init__(self, max_terms: int = 1_000_000, tmp_dir: Optional[str] = None, run_dir: Optional[str] = None):
+        self.max_terms = max_terms
+        self.counts = Counter()
+        self.runs: list[str] = []
+        self._seen = 0  # first-seen rank of the first token in self.counts
+        self._owns_dir = run_dir is None
+        if run_dir is None:
+            self._tmp_dir = tempfile.mkdtemp(prefix="symspell-counts-", dir=tmp_dir)
+        else:
+            os.makedirs(run_dir, exist_ok=True)
+            self._tmp_dir = run_dir
+
+    @property
+    def seen(self) -> int:
+        """Distinct tokens of all spilled runs (the first-seen rank of the next new token)."""
+        return self._seen
+
+    def restore(self, runs: list[str], seen: int) -> None:
+        """Continue from spilled `runs` holding `seen` distinct tokens (a checkpoint of spill())."""
+        self.counts = Counter()
+        self.runs = list(runs)
+        self._seen = seen
+
+    def update(self, tokens: Iterable[str]) -> None:
+        """Count a chunk of tokens (or add a Counter), spilling if the table is full."""
+        self.counts.update(tokens)
+        if len(self.counts) >= self.max_terms:
+            self.spill()
+
+    def spill(self) -> None:
+        """Write the in-memory counts as a run sorted by token."""
+        if not self.counts:
+            return
+        path = os.path.join(self._tmp_dir, f"run-{len(self.runs):05d}.tsv")
+        # Counter keeps insertion order, so the position is the first-seen rank within the run
+        ranked = sorted((term, count, self._seen + rank) for rank, (term, count) in enumerate(self.counts.items()))
+        with open(path, "w", encoding="utf-8") as f:
+            for term, count, first in ranked:
+                f.write(f"{term}\t{count}\t{first}\n")
+            if not self._owns_dir:
+                # A checkpoint may reference the run as soon as this returns
+                f.flush()
+                os.fsync(f.fileno())
+        self.runs.append(path)
+        self._seen += len(self.counts)
+        self.counts = Counter()
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[tuple[str, int, int]]:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                term, count, first = line.rstrip("\n").split("\t")
+                yield term, int(count), int(first)
+
+    def items(self, min_freq: int = 1, pruned: Optional[Callable[[str, int], None]] = None) -> list[tuple[str, int]]:
+        """
+        (term, count) pairs with count >= min_freq, in first-seen order.
+        Terms below min_freq are passed to `pruned` (term, count) if given.
+        """
+        if not self.runs:
+            if pruned is not None:
+                for term, count in self.counts.items():
+                    if count < min_freq:
+                        pruned(term, count)
+            return [(term, count) for term, count in self.counts.items() if count >= min_freq]
+
+        self.spill()
+        survivors = []
+        merged = heapq.merge(*(self._read_run(path) for path in self.runs))
+        for term, group in groupby(merged, key=lambda item: item[0]):
+            total = 0
+            first = None
+            for _, count, rank in group:
+                total += count
+                first = rank if first is None else min(first, rank)
+            if total >= min_freq:
+                survivors.append((first, term, total))
+            elif pruned is not None:
+                pruned(term, total)
+        survivors.sort()
+        return [(term, count) for _, term, count in survivors]
+
+    def close(self) -> None:
+        """Remove the spilled runs (runs in a caller's run_dir are left to the caller)."""
+        if self._owns_dir:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+        self.runs = []
+
+    def __enter__(self) -> "SpillingCounter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,328 @@
+"""
+Incremental spelling dictionary updates from new corpus files.
+
+Next to the dictionary file (symspell.txt) the update path keeps:
+
+- symspell.manifest.json: sha256 of every ingested file, so a file (or a copy
+  of it under another name) is never counted twice, plus the delta sequence
+- symspell.residual.txt: counts of terms still below min_freq, so they can be
+  promoted once new files push them over the threshold
+- symspell.delta.jsonl: one line per update with the count increments of the
+  changed terms; a serving process applies the entries it has not seen yet
+  (SpellChecker.refresh) instead of reloading the whole dictionary
+- symspell.surface.txt (prefix mode only): the dictionary terms before
+  prefixed forms were folded into their bases (see prefixes). Updates merge
+  new counts into it and fold the whole table again, so the dictionary and
+  the prefix statistics are the ones a full rebuild would write
+
+An update holds symspell.lock exclusively while it writes; loading the
+dictionary together with its delta sequence holds it shared, so a server never
+sees a dictionary and a sequence number from different updates.
+
+A full build (save_full_build) resets all three: the manifest lists the
+corpus files it counted, the residual holds its terms below min_freq and the
+delta log starts empty. Its delta sequence moves past every earlier update
+and is recorded as the manifest's base_seq, so a server holding an older
+dictionary reloads it instead of applying deltas to it.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import pathlib
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+def companion_paths(dictionary_path: str) -> dict[str, pathlib.Path]:
+    """Manifest, residual counts, delta log and prefix statistics paths for a dictionary file."""
+    path = pathlib.Path(dictionary_path)
+    return {
+        "manifest": path.with_suffix(".manifest.json"),
+        "residual": path.with_suffix(".residual.txt"),
+        "deltas": path.with_suffix(".delta.jsonl"),
+        "lock": path.with_suffix(".lock"),
+        "build_residual": path.with_suffix(".residual.txt.build"),
+        "prefixes": path.with_suffix(".prefixes.json"),
+        "surface": path.with_suffix(".surface.txt"),
+    }
+
+
+@contextmanager
+def dictionary_lock(dictionary_path: str, shared: bool = False):
+    """Hold the dictionary's lock file (shared for readers, exclusive for writers)."""
+    with file_lock(companion_paths(dictionary_path)["lock"], shared):
+        yield
+
+
+@contextmanager
+def file_lock(path, shared: bool = False):
+    """Hold an flock on `path` (created if missing); a no-op where fcntl is not available."""
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def dictionary_snapshot(dictionary_path: str):
+    """
+    Yield the delta sequence the dictionary file is at, holding the shared lock
+    so the file is loaded before any concurrent update rewrites it.
+    """
+    if not pathlib.Path(dictionary_path).is_file():
+        yield 0
+        return
+    with dictionary_lock(dictionary_path, shared=True):
+        yield read_manifest(dictionary_path)["delta_seq"]
+
+
+def file_sha256(filepath: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_counts(filepath: pathlib.Path) -> dict[str, int]:
+    """Read a 'term count' file (the symspell.txt format) in file order."""
+    counts: dict[str, int] = {}
+    if filepath.is_file():
+        with open(filepath, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2:
+                    counts[parts[0]] = int(parts[1])
+    return counts
+
+
+def write_counts(filepath: pathlib.Path, counts: dict[str, int]) -> None:
+    """Write a 'term count' file, replacing it atomically."""
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = filepath.with_name(filepath.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for term, count in counts.items():
+            f.write(f"{term} {count}\n")
+    os.replace(tmp_path, filepath)
+
+
+def read_manifest(dictionary_path: str) -> dict:
+    path = companion_paths(dictionary_path)["manifest"]
+    if path.is_file():
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"files": {}, "delta_seq": 0}
+
+
+def write_manifest(dictionary_path: str, manifest: dict) -> None:
+    """Write the manifest, replacing it atomically."""
+    path = companion_paths(dictionary_path)["manifest"]
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def save_full_build(builder, dictionary_path: str, corpus_files, items=None) -> int:
+    """
+    Save a full build's dictionary and reset the update state next to it.
+
+    The build is expected to have written its terms below min_freq to the
+    "build_residual" companion path (see SymSpellBuilder.count_corpus); they
+    become the residual table. The manifest lists the hashes of the corpus
+    files, so update_dictionary never counts them again, and the delta log is
+    removed. A prefix-mode build (builder.surface_items set, see
+    SymSpellBuilder.fold_items) also keeps its unfolded terms and is marked
+    as such in the manifest.
+
+    Args:
+        builder: SymSpellBuilder holding the build (see SymSpellBuilder.save_dictionary)
+        dictionary_path: Dictionary file
+        corpus_files: Corpus files the build counted
+        items: (term, count) pairs to save instead of the builder's SymSpell terms
+
+    Returns:
+        The delta sequence of the new dictionary
+    """
+    paths = companion_paths(dictionary_path)
+    files = {file_sha256(str(filepath)): {"path": str(filepath)} for filepath in corpus_files}
+    with dictionary_lock(dictionary_path):
+        seq = read_manifest(dictionary_path)["delta_seq"] + 1
+        builder.save_dictionary(dictionary_path, items)
+        if paths["build_residual"].is_file():
+            os.replace(paths["build_residual"], paths["residual"])
+        else:
+            paths["residual"].unlink(missing_ok=True)
+        paths["deltas"].unlink(missing_ok=True)
+        if builder.surface_items is not None:
+            write_counts(paths["surface"], dict(builder.surface_items))
+        else:
+            paths["surface"].unlink(missing_ok=True)
+        write_manifest(dictionary_path, {"files": files, "delta_seq": seq, "base_seq": seq,
+                                         "prefix_mode": builder.surface_items is not None})
+    return seq
+
+
+def read_deltas(dictionary_path: str, after_seq: int = 0) -> list[tuple[int, dict[str, int]]]:
+    """Delta log entries with a sequence number above `after_seq`, in order."""
+    path = companion_paths(dictionary_path)["deltas"]
+    deltas = []
+    if path.is_file():
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if entry["seq"] > after_seq:
+                        deltas.append((entry["seq"], entry["counts"]))
+    return deltas
+
+
+def count_files(filepaths: list[str], workers: int = 1):
+    """Token counts of whole files, counted on `workers` processes and merged in file order."""
+    from collections import Counter
+    from app.utils.spellcheck import count_shard
+
+    shards = [(path, 0, os.path.getsize(path)) for path in filepaths]
+    counts = Counter()
+    if workers > 1 and len(shards) > 1:
+        with multiprocessing.Pool(min(workers, len(shards))) as pool:
+            for shard_counts in pool.imap(count_shard, shards):
+                counts.update(shard_counts)
+    else:
+        for shard in shards:
+            counts.update(count_shard(shard))
+    return counts
+
+
+def merge_counts(counts, table: dict[str, int], residual: dict[str, int], min_freq: int) -> tuple[dict[str, int], int]:
+    """
+    Add new token counts to a 'term count' table in place: terms of the table
+    are incremented, others are added once they reach min_freq together with
+    their residual count and stay in `residual` until then.
+
+    Returns:
+        Tuple of (count increments of the table terms, number of new terms)
+    """
+    delta: dict[str, int] = {}
+    new_terms = 0
+    for term, count in counts.items():
+        if term in table:
+            table[term] += count
+            delta[term] = count
+            continue
+        total = residual.pop(term, 0) + count
+        if total >= min_freq:
+            table[term] = total
+            delta[term] = total
+            new_terms += 1
+        else:
+            residual[term] = total
+    return delta, new_terms
+
+
+def update_dictionary(
+    filepaths: list[str],
+    dictionary_path: Optional[str] = None,
+    min_freq: Optional[int] = None,
+    workers: int = 1,
+) -> dict:
+    """
+    Count new corpus files and merge them into the persisted dictionary.
+
+    Files whose content hash is already in the manifest are skipped. Terms that
+    reach min_freq are added to (or updated in) symspell.txt, the rest go to
+    the residual table, and the increments of the dictionary terms are appended
+    to the delta log for running servers.
+
+    For a prefix-mode dictionary the counts are merged into the unfolded
+    terms, which are folded again (prefixes.decompose_counts) and the prefix
+    statistics rewritten. When the folding drops a term from the dictionary
+    (a form now folded into its base), the update is recorded as the
+    manifest's base_seq, so servers reload instead of applying the delta.
+
+    Args:
+        filepaths: New corpus files (any format CorpusLoader reads, see corpus_readers)
+        dictionary_path: Dictionary file (default: settings.spellchecker_dictionary_path)
+        min_freq: Minimum term frequency (default: settings.spellchecker_min_freq)
+        workers: Processes counting the files
+
+    Returns:
+        Update statistics: ingested/skipped files, changed and new terms, delta seq
+    """
+    from app.config import settings
+
+    dictionary_path = dictionary_path or settings.spellchecker_dictionary_path
+    min_freq = settings.spellchecker_min_freq if min_freq is None else min_freq
+    with dictionary_lock(dictionary_path):
+        return _update_dictionary(filepaths, dictionary_path, min_freq, workers)
+
+
+def _update_dictionary(filepaths: list[str], dictionary_path: str, min_freq: int, workers: int) -> dict:
+    paths = companion_paths(dictionary_path)
+    manifest = read_manifest(dictionary_path)
+
+    new_files, skipped = {}, []
+    for filepath in filepaths:
+        digest = file_sha256(filepath)
+        if digest in manifest["files"] or digest in new_files:
+            skipped.append(filepath)
+        else:
+            new_files[digest] = filepath
+
+    stats = {"ingested_files": len(new_files), "skipped_files": skipped, "changed_terms": 0, "new_terms": 0,
+             "delta_seq": manifest["delta_seq"]}
+    if not new_files:
+        return stats
+
+    counts = count_files(list(new_files.values()), workers)
+    dictionary = read_counts(pathlib.Path(dictionary_path))
+    residual = read_counts(paths["residual"])
+    seq = manifest["delta_seq"] + 1
+
+    if manifest.get("prefix_mode"):
+        from app.utils.prefixes import decompose_counts
+        from app.utils.spellcheck import prefix_stats_path
+
+        surface = read_counts(paths["surface"])
+        merge_counts(counts, surface, residual, min_freq)
+        items, prefix_model = decompose_counts(list(surface.items()))
+        folded = dict(items)
+        delta = {term: count - dictionary.get(term, 0) for term, count in folded.items()
+                 if count != dictionary.get(term, 0)}
+        stats["new_terms"] = sum(1 for term in folded if term not in dictionary)
+        if any(term not in folded for term in dictionary):
+            manifest["base_seq"] = seq
+        dictionary = folded
+        write_counts(paths["surface"], surface)
+        prefix_model.save(prefix_stats_path(dictionary_path))
+    else:
+        delta, stats["new_terms"] = merge_counts(counts, dictionary, residual, min_freq)
+
+    # The delta is only logged once the dictionary holds it, so a failed write
+    # never leaves servers applying counts the file does not have
+    write_counts(pathlib.Path(dictionary_path), dictionary)
+    write_counts(paths["residual"], residual)
+    with open(paths["deltas"], "a", encoding="utf-8") as f:
+        f.write(json.dumps({"seq": seq, "counts": delta}, ensure_ascii=False) + "\n")
+
+    for digest, filepath in new_files.items():
+        manifest["files"][digest] = {"path": str(filepath)}
+    manifest["delta_seq"] = seq
+    write_manifest(dictionary_path, manifest)
+
+    stats["changed_terms"] = len(delta)
+    stats["delta_seq"] = seq
+    return stats
@@ -0,0 +1,90 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from .normalizer import normalize, split_to_sentences
+
+
+class DocumentCache:
+    """
+    Incremental re-normalization of edited documents.
+
+    For every document id the cache keeps the sentences of the previous version
+    together with their normalized output. When a new version arrives it is
+    split into sentences, unchanged sentences reuse the cached output and only
+    new or edited sentences are normalized, so latency follows the size of the
+    edit rather than the size of the document.
+
+    Documents are evicted in least-recently-used order beyond `max_documents`.
+    """
+
+    def __init__(self, max_documents: int = 1000, normalize_fn: Callable[..., str] = normalize):
+        self.max_documents = max_documents
+        self.normalize_fn = normalize_fn
+        self._documents: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def options_key(with_nikud: bool, spellcheck: bool, customization: Optional[dict]) -> str:
+        """Cached sentences are only valid for the options they were normalized with."""
+        return json.dumps([with_nikud, spellcheck, customization], sort_keys=True, ensure_ascii=False)
+
+    def normalize(
+        self,
+        document_id: str,
+        text: str,
+        with_nikud: bool = False,
+        spellcheck: bool = False,
+        customization: Optional[dict] = None,
+    ) -> tuple[str, dict]:
+        """
+        Normalize a new version of a document, reusing unchanged sentences.
+
+        Args:
+            document_id: Client-side id of the document
+            text: Full text of the new version
+            with_nikud, spellcheck, customization: Same as normalize()
+
+        Returns:
+            Tuple of (normalized text, stats) where stats counts reused and
+            normalized sentences
+        """
+        key = self.options_key(with_nikud, spellcheck, customization)
+
+        with self._lock:
+            previous = self._documents.get(document_id)
+            if previous is not None:
+                self._documents.move_to_end(document_id)
+        cached = previous["sentences"] if previous and previous["options"] == key else {}
+
+        sentences = split_to_sentences(text)
+        current = {}
+        reused = 0
+        for sentence in sentences:
+            if sentence in current:
+                reused += 1
+            elif sentence in cached:
+                current[sentence] = cached[sentence]
+                reused += 1
+            else:
+                current[sentence] = self.normalize_fn(sentence, with_nikud, spellcheck, customization)
+
+        with self._lock:
+            self._documents[document_id] = {"options": key, "sentences": current}
+            self._documents.move_to_end(document_id)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+        output = " ".join(current[s] for s in sentences if current[s])
+        stats = {
+            "sentences": len(sentences),
+            "reused_sentences": reused,
+            "normalized_sentences": len(sentences) - reused,
+        }
+        return output, stats
+
+    def forget(self, document_id: str) -> None:
+        """Drop the cached version of a document."""
+        with self._lock:
+            self._documents.pop(document_id, None)
@@ -0,0 +1,205 @@
+import os
+from collections import Counter, defaultdict
+from typing import Iterable, Optional
+
+from .normalizer import apply_full_ktiv_rules, normalize_final_letters, remove_nikud, split_to_sentences
+
+
+class FullKtivLexicon:
+    """
+    Context-free full ktiv spellings for words that have exactly one.
+
+    Stored as a TSV of `surface<TAB>full_ktiv`; an empty second column means
+    the word is already spelled in full ktiv, which keeps the file compact.
+    Keys are words after final letters normalization, values have no nikud.
+    """
+
+    def __init__(self, mapping: Optional[dict[str, str]] = None):
+        self.mapping = mapping or {}
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.mapping
+
+    def lookup_words(self, words: list[str]) -> Optional[list[str]]:
+        """Return the full ktiv of every word, or None if any word is not covered."""
+        mapping = self.mapping
+        result = []
+        for word in words:
+            full = mapping.get(word)
+            if full is None:
+                return None
+            result.append(full)
+        return result
+
+    @classmethod
+    def load(cls, filepath: str) -> "FullKtivLexicon":
+        mapping = {}
+        with open(filepath, encoding="utf-8") as f:
+            for line in f:
+                surface, _, full = line.rstrip("\n").partition("\t")
+                if surface:
+                    mapping[surface] = full or surface
+        return cls(mapping)
+
+    def save(self, filepath: str) -> None:
+        """Write the lexicon sorted by surface form, replacing the file atomically."""
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for surface in sorted(self.mapping):
+                full = self.mapping[surface]
+                f.write(f"{surface}\t{'' if full == surface else full}\n")
+        os.replace(tmp_path, filepath)
+
+
+class LexiconBuilder:
+    """
+    Collect the full ktiv outputs of the existing pipeline per surface word and
+    keep the words that always produced the same spelling.
+    """
+
+    def __init__(self):
+        self.outputs: dict[str, Counter] = defaultdict(Counter)
+        self.sentences = 0
+        self.skipped_sentences = 0
+
+    def add(self, prepared_sentence: str, full_ktiv_sentence: str) -> None:
+        """
+        Record one sentence: its final-letter normalized input and the full ktiv
+        output without nikud. Sentences whose words do not align are skipped.
+        """
+        source_words = prepared_sentence.split()
+        output_words = full_ktiv_sentence.split()
+        if len(source_words) != len(output_words):
+            self.skipped_sentences += 1
+            return
+        self.sentences += 1
+        for surface, full in zip(source_words, output_words):
+            self.outputs[surface][full] += 1
+
+    def build(self, min_count: int = 2) -> FullKtivLexicon:
+        """Keep words seen at least `min_count` times with a single output."""
+        mapping = {}
+        for surface, outputs in self.outputs.items():
+            if len(outputs) == 1:
+                full, count = next(iter(outputs.items()))
+                if count >= min_count:
+                    mapping[surface] = full
+        return FullKtivLexicon(mapping)
+
+    def stats(self) -> dict:
+        ambiguous = sum(1 for outputs in self.outputs.values() if len(outputs) > 1)
+        return {
+            "sentences": self.sentences,
+            "skipped_sentences": self.skipped_sentences,
+            "surface_words": len(self.outputs),
+            "ambiguous_words": ambiguous,
+        }
+
+
+def full_ktiv_batch(prepared_sentences: list[str]) -> list[str]:
+    """Run the model and the full ktiv rules on a batch, returning text without nikud."""
+    from .nikud import add_nikud_batch
+
+    with_nikud = add_nikud_batch(prepared_sentences, keep_vowels=False)
+    return [remove_nikud(apply_full_ktiv_rules(text)) for text in with_nikud]
+
+
+def build_full_ktiv_lexicon(
+    texts: Iterable[str],
+    batch_size: int = 64,
+    min_count: int = 2,
+    max_sentences: Optional[int] = None,
+) -> tuple[FullKtivLexicon, dict]:
+    """
+    Run the full ktiv pipeline over corpus texts and build the lexicon.
+
+    Args:
+        texts: Corpus lines, e.g. CorpusLoader.load_texts()
+        batch_size: Sentences per model batch
+        min_count: Minimum occurrences for a word to enter the lexicon
+        max_sentences: Stop after this many sentences (None for the whole corpus)
+
+    Returns:
+        Tuple of (lexicon, build statistics)
+    """
+    builder = LexiconBuilder()
+    batch: list[str] = []
+    seen = 0
+
+    def flush():
+        for prepared, full in zip(batch, full_ktiv_batch(batch)):
+            builder.add(prepared, full)
+        batch.clear()
+
+    for text in texts:
+        for sentence in split_to_sentences(text):
+            prepared = normalize_final_letters(sentence)
+            if not prepared:
+                continue
+            batch.append(prepared)
+            seen += 1
+            if len(batch) >= batch_size:
+                flush()
+            if max_sentences is not None and seen >= max_sentences:
+                break
+        if max_sentences is not None and seen >= max_sentences:
+            break
+    if batch:
+        flush()
+
+    lexicon = builder.build(min_count=min_count)
+    stats = builder.stats()
+    stats["lexicon_words"] = len(lexicon)
+    return lexicon, stats
+
+
+def normalize_full_ktiv_sentences(prepared_sentences: list[str], lexicon: FullKtivLexicon) -> str:
+    """
+    Full ktiv for final-letter normalized sentences, without nikud.
+
+    Sentences whose words are all in the lexicon are mapped directly; only the
+    remaining sentences are sent to the model, in a single batch.
+    """
+    results: list[Optional[str]] = []
+    pending = []
+    for i, sentence in enumerate(prepared_sentences):
+        words = lexicon.lookup_words(sentence.split())
+        if words is None:
+            pending.append(i)
+            results.append(None)
+        else:
+            results.append(" ".join(words))
+
+    if pending:
+        for i, text in zip(pending, full_ktiv_batch([prepared_sentences[i] for i in pending])):
+            results[i] = text
+
+    return " ".join(text for text in results if text)
+
+
+# Loaded on first use and kept with the (path, mtime) it was read from, so a
+# lexicon built (or rebuilt) while the server runs is picked up
+_lexicon: Optional[FullKtivLexicon] = None
+_lexicon_key: Optional[tuple[str, int]] = None
+
+
+def get_full_ktiv_lexicon() -> Optional[FullKtivLexicon]:
+    """Return the lexicon from settings.full_ktiv_lexicon_path, or None while the file does not exist."""
+    global _lexicon, _lexicon_key
+    from app.config import settings
+
+    path = settings.full_ktiv_lexicon_path
+    try:
+        key = (path, os.stat(path).st_mtime_ns) if path else None
+    except OSError:
+        key = None
+    if key is None:
+        # Not cached: the file may still be built
+        _lexicon, _lexicon_key = None, None
+    elif key != _lexicon_key:
+        _lexicon, _lexicon_key = FullKtivLexicon.load(path), key
+    return _lexicon
@@ -1,28 +1,59 @@
-print(1)
-import torch
-print(2)
-from transformers import AutoModel, AutoTokenizer
-print(4)
 from app.config import settings
-print(5)
-device = "cuda" if torch.cuda.is_available() else "cpu"
-print(3)
-tokenizer = AutoTokenizer.from_pretrained(settings.nikud_model)
-model = AutoModel.from_pretrained(settings.nikud_model, trust_remote_code=True)
-model.to(device).eval()
+
+# Lazy loading in global scope - the model is loaded on first use so that
+# processes which never need it (CLI workers, model-free stages) stay light.
+device = None
+tokenizer = None
+model = None
+
+
+def get_model():
+    """
+    Load the DictaBERT nikud model on first use and return (tokenizer, model).
+    """
+    global device, tokenizer, model
+    if model is None:
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        tokenizer = AutoTokenizer.from_pretrained(settings.nikud_model)
+        model = AutoModel.from_pretrained(settings.nikud_model, trust_remote_code=True)
+        model.to(device).eval()
+    return tokenizer, model
+
 
 def add_nikud(text: str, keep_vowels: bool = False) -> str:
     """
     Add nikud (diacritics) to Hebrew text using DictaBERT model.
-    
+
     Args:
         text: Hebrew text to add nikud to
         keep_vowels: Whether to keep matres lectionis (אימות קריאה) in the output
-        
+
     Returns:
         Hebrew text with nikud added
     """
+    return add_nikud_batch([text], keep_vowels)[0]
+
+
+def add_nikud_batch(texts: list[str], keep_vowels: bool = False) -> list[str]:
+    """
+    Add nikud to several texts with a single model call.
+
+    Args:
+        texts: Hebrew texts to add nikud to
+        keep_vowels: Whether to keep matres lectionis (אימות קריאה) in the output
+
+    Returns:
+        List of texts with nikud added, in input order
+    """
+    if not texts:
+        return []
+
+    tokenizer, model = get_model()
+
     # Use mark_matres_lectionis parameter to control vowel preservation
     mark_matres_lectionis = '*' if keep_vowels else None
-    
-    return model.predict([text], tokenizer, mark_matres_lectionis=mark_matres_lectionis)[0]
+
+    return model.predict(list(texts), tokenizer, mark_matres_lectionis=mark_matres_lectionis)
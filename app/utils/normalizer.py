@@ -1,4 +1,7 @@
+import json
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 from .nikud import add_nikud
 
 
@@ -71,6 +74,19 @@ def split_to_words(text: str) -> list[dict]:
     
     return words
 
+def split_to_sentences(text: str) -> list[str]:
+    """
+    Split text into sentences on sentence punctuation and line breaks.
+    
+    Args:
+        text: Hebrew text to split
+        
+    Returns:
+        List of non-empty sentences, punctuation kept with its sentence
+    """
+    parts = re.split(r'(?<=[.?!])\s+|\n+', text)
+    return [part.strip() for part in parts if part and not part.isspace()]
+
 def split_to_words_and_letters(text: str) -> list[list[dict]]:
     """
     Split text into words and then split each word into letter dictionaries.
@@ -137,7 +153,25 @@ def normalize_final_letters(text: str) -> str:
     #TODO: use separators from split_to_words
     
 
-def normalize_full_ktiv(text: str) -> str:
+# Names of the full ktiv rules applied by apply_full_ktiv_rules (steps 4-7)
+FULL_KTIV_RULES = frozenset({"kubutz", "holam", "hirik", "yod_vav"})
+
+def normalize_final_letters_batch(texts: list[str]) -> list[str]:
+    """
+    normalize_final_letters for many texts, vectorized for large batches.
+    
+    Args:
+        texts: Hebrew texts to normalize
+        
+    Returns:
+        List of normalized texts, in input order
+    """
+    from . import vectorized
+    if vectorized.should_vectorize(texts):
+        return vectorized.normalize_final_letters_batch(texts)
+    return [normalize_final_letters(text) for text in texts]
+
+def normalize_full_ktiv(text: str, rules: frozenset[str] | None = None) -> str:
     """
     Normalize full ktiv (final form) to regular form.
     
@@ -146,6 +180,7 @@ def normalize_full_ktiv(text: str) -> str:
     
     Args:
         text: Hebrew text to normalize
+        rules: Names of the full ktiv rules to apply, None for all
         
     Returns:
         Normalized Hebrew text with proper vowel letter placement
@@ -156,6 +191,25 @@ def normalize_full_ktiv(text: str) -> str:
     # Step 0: Add nikud using add_nikud with keep_vowels=False
     text_with_nikud = add_nikud(text, keep_vowels=False)
     
+    return apply_full_ktiv_rules(text_with_nikud, rules)
+
+def apply_full_ktiv_rules(text_with_nikud: str, rules: frozenset[str] | None = None) -> str:
+    """
+    Apply the full ktiv vowel letter rules to text that already has nikud.
+    
+    This is the model-free part of normalize_full_ktiv, so batch callers can
+    run the nikud model once for many texts and apply the rules separately.
+    
+    Args:
+        text_with_nikud: Hebrew text with nikud (output of add_nikud)
+        rules: Names of the rules to apply (see FULL_KTIV_RULES), None for all
+        
+    Returns:
+        Hebrew text with vowel letters added
+    """
+    if rules is None:
+        rules = FULL_KTIV_RULES
+
     # Step 1: Convert to words and letters
     words_with_letters = split_to_words_and_letters(text_with_nikud)
     result_words = []
@@ -174,7 +228,7 @@ def normalize_full_ktiv(text: str) -> str:
             next_char = word_letters[i + 1]['letter'] if i + 1 < len(word_letters) else None
             
             # Step 4: Handle kubutz (קובוץ) - add vav if next letter is not vav
-            if current_nikud == '\u05BB':  # קובוץ
+            if 'kubutz' in rules and current_nikud == '\u05BB':  # קובוץ
                 if i + 1 < len(word_letters):
                     next_char = word_letters[i + 1]['letter']
                     if next_char != 'ו':
@@ -190,7 +244,7 @@ def normalize_full_ktiv(text: str) -> str:
                         i += 1  # Skip the inserted vav in next iteration
             
             # Step 5: Handle holam (חולם) - add vav unless specific conditions
-            elif current_nikud == '\u05B9' and current_char != 'ו':  # חולם
+            elif 'holam' in rules and current_nikud == '\u05B9' and current_char != 'ו':  # חולם
                 if i + 1 < len(word_letters):
                     next_char = word_letters[i + 1]['letter']
                     next_nikud = word_letters[i + 1].get('nikud')
@@ -216,7 +270,7 @@ def normalize_full_ktiv(text: str) -> str:
                         i += 1  # Skip the inserted vav in next iteration
             
             # Step 6: Handle hirik (חיריק) - add yod if next nikud is not shva and not final
-            elif current_nikud == '\u05B4' and next_char != 'י':  # חיריק
+            elif 'hirik' in rules and current_nikud == '\u05B4' and next_char != 'י':  # חיריק
                 if i + 1 < len(word_letters):
                     next_nikud = word_letters[i + 1].get('nikud')
                     is_next_final = (i + 1 == len(word_letters) - 1)
@@ -236,7 +290,7 @@ def normalize_full_ktiv(text: str) -> str:
             
 
             # Step 7: Handle yod-vav doubling conditions
-            if current_nikud is not None and current_char == 'י' or current_char == 'ו' and current_nikud not in [None,'\u05B9', '\u05BB']:  # holam or kubutz
+            if 'yod_vav' in rules and (current_nikud is not None and current_char == 'י' or current_char == 'ו' and current_nikud not in [None,'\u05B9', '\u05BB']):  # holam or kubutz
                 # Check yod-vav doubling conditions
                 is_first = (i == 0)
                 is_last = (i == len(word_letters) - 1)
@@ -289,15 +343,105 @@ def remove_nikud(text: str) -> str:
     # Remove nikud marks using Unicode range
     return re.sub(r'[\u0591-\u05C7]', '', text)
 
-def normalize(text: str, with_nikud: bool=False, spellcheck: bool=False, customization=None) -> str:
+@dataclass(frozen=True)
+class StagePlan:
     """
-    Normalize Hebrew text with optional nikud preservation.
+    Immutable, compiled description of the stages normalize() runs.
+    
+    Built once per distinct (with_nikud, spellcheck, customization) by
+    compile_stage_plan and shared between requests.
+    """
+    final_letters: bool = True
+    full_ktiv: bool = True
+    full_ktiv_rules: frozenset[str] = FULL_KTIV_RULES
+    use_lexicon: bool = True
+    remove_nikud: bool = True
+    spellcheck: bool = False
+
+    @property
+    def stages(self) -> tuple[str, ...]:
+        """Names of the enabled stages, in execution order."""
+        enabled = [
+            ("final_letters", self.final_letters),
+            ("full_ktiv", self.full_ktiv),
+            ("remove_nikud", self.remove_nikud),
+            ("spellcheck", self.spellcheck),
+        ]
+        return tuple(name for name, on in enabled if on)
+
+    @property
+    def needs_model(self) -> bool:
+        """Whether running this plan may load the nikud model."""
+        return self.full_ktiv
+
+# Customization keys accepted by compile_stage_plan and their expected types
+CUSTOMIZATION_OPTIONS = {
+    "final_letters": bool,     # run final letters normalization
+    "full_ktiv": bool,         # run the nikud model and full ktiv rules
+    "full_ktiv_rules": list,   # subset of FULL_KTIV_RULES to apply
+    "lexicon": bool,           # allow the offline full ktiv lexicon
+    "spellcheck": bool,        # overrides the spellcheck argument
+}
+
+def compile_stage_plan(with_nikud: bool = False, spellcheck: bool = False, customization: dict | None = None) -> StagePlan:
+    """
+    Compile normalize() options into a cached StagePlan.
     
     Args:
-        text: Hebrew text to normalize
         with_nikud: Whether to preserve nikud in output
-        spellcheck: Whether to perform spell checking (not implemented yet)
-        customization: Customization options (not implemented yet)
+        spellcheck: Whether to run the spellcheck stage
+        customization: Optional dict, see CUSTOMIZATION_OPTIONS
+        
+    Returns:
+        The StagePlan for these options (the same object for equal options)
+        
+    Raises:
+        ValueError: If the customization has unknown keys or invalid values
+    """
+    key = json.dumps([bool(with_nikud), bool(spellcheck), customization or {}], sort_keys=True, ensure_ascii=False)
+    return _compile_stage_plan(key)
+
+@lru_cache(maxsize=256)
+def _compile_stage_plan(key: str) -> StagePlan:
+    with_nikud, spellcheck, customization = json.loads(key)
+    
+    if not isinstance(customization, dict):
+        raise ValueError("customization must be an object")
+    for name, value in customization.items():
+        expected = CUSTOMIZATION_OPTIONS.get(name)
+        if expected is None:
+            raise ValueError(f"Unknown customization option '{name}'. Allowed: {sorted(CUSTOMIZATION_OPTIONS)}")
+        if not isinstance(value, expected):
+            raise ValueError(f"Customization option '{name}' must be of type {expected.__name__}")
+    
+    rules = customization.get("full_ktiv_rules")
+    if rules is None:
+        rules = FULL_KTIV_RULES
+    else:
+        if not all(isinstance(rule, str) for rule in rules):
+            raise ValueError("Customization option 'full_ktiv_rules' must be a list of strings")
+        unknown = set(rules) - FULL_KTIV_RULES
+        if unknown:
+            raise ValueError(f"Unknown full ktiv rules {sorted(unknown)}. Allowed: {sorted(FULL_KTIV_RULES)}")
+        rules = frozenset(rules)
+    
+    return StagePlan(
+        final_letters=customization.get("final_letters", True),
+        full_ktiv=customization.get("full_ktiv", True),
+        full_ktiv_rules=rules,
+        # The lexicon was built with all rules and without nikud
+        use_lexicon=customization.get("lexicon", True) and rules == FULL_KTIV_RULES and not with_nikud,
+        remove_nikud=not with_nikud,
+        spellcheck=customization.get("spellcheck", spellcheck),
+    )
+
+def run_stage_plan(plan: StagePlan, text: str) -> str:
+    """
+    Run the stages of a compiled plan on text.
+    
+    Args:
+        plan: Plan from compile_stage_plan
+        text: Hebrew text to normalize
         
     Returns:
         Normalized Hebrew text
@@ -306,29 +450,78 @@ def normalize(text: str, with_nikud: bool=False, spellcheck: bool=False, customi
     if not text or text.isspace():
         return text.strip()
     
+    # The offline lexicon maps whole sentences, so the text is only split
+    # into sentences when the lexicon will be used
+    lexicon = None
+    if plan.full_ktiv and plan.use_lexicon:
+        try:
+            from .lexicon import get_full_ktiv_lexicon
+            lexicon = get_full_ktiv_lexicon()
+        except Exception as e:
+            # Without a readable lexicon every sentence goes to the model
+            pass
+
     # Step 1: Normalize final letters (this works without model)
-    try:
-        text = normalize_final_letters(text)
-    except Exception as e:
-        # If this fails, continue with original text
-        pass
+    sentences = None
+    if plan.final_letters:
+        try:
+            if lexicon is not None:
+                sentences = [s for s in map(normalize_final_letters, split_to_sentences(text)) if s]
+                text = ' '.join(sentences)
+            else:
+                text = normalize_final_letters(text)
+        except Exception as e:
+            # If this fails, continue with original text
+            pass
     
     # Step 2: Try to normalize full ktiv (only if model is available and text has content)
-    if text and len(text.strip()) > 0:
+    if plan.full_ktiv and text and len(text.strip()) > 0:
         try:
-            # Check if we can import the required modules
-            text = normalize_full_ktiv(text)
+            # Words covered by the offline lexicon skip the model; only
+            # sentences with unknown words are sent to it
+            if lexicon is not None and sentences is not None:
+                from .lexicon import normalize_full_ktiv_sentences
+                text = normalize_full_ktiv_sentences(sentences, lexicon)
+            else:
+                text = normalize_full_ktiv(text, plan.full_ktiv_rules)
         except (ImportError, Exception) as e:
             # If model is not available, skip this step
             # This is normal in testing environments
             pass
     
     # Step 3: Remove nikud if not requested
-    if not with_nikud:
+    if plan.remove_nikud:
         try:
             text = remove_nikud(text)
         except Exception as e:
             # If this fails, continue with current text
             pass
+    
+    # Step 4: Spellcheck the Hebrew words of the normalized text in place
+    if plan.spellcheck:
+        try:
+            from .spellcheck import spellcheck_in_place
+            text = spellcheck_in_place(text)
+        except Exception as e:
+            # If the spellchecker is not available, keep the normalized text
+            pass
 
     return text.strip()
+
+def normalize(text: str, with_nikud: bool=False, spellcheck: bool=False, customization=None) -> str:
+    """
+    Normalize Hebrew text with optional nikud preservation.
+    
+    Args:
+        text: Hebrew text to normalize
+        with_nikud: Whether to preserve nikud in output
+        spellcheck: Whether to run the spellcheck stage
+        customization: Stage selection and configuration, see CUSTOMIZATION_OPTIONS
+        
+    Returns:
+        Normalized Hebrew text
+        
+    Raises:
+        ValueError: If the customization is invalid
+    """
+    return run_stage_plan(compile_stage_plan(with_nikud, spellcheck, customization), text)
@@ -0,0 +1,104 @@
+"""
+Hebrew clitic-prefix decomposition for the spelling dictionary.
+
+Prefixed forms (והבית, לבית, שבבית...) are mostly a base word plus a sequence
+of the one-letter clitics ו / ש, כש, מש / ב, כ, ל, מ / ה. In prefix mode the
+dictionary build folds such forms into their base word and keeps per-prefix
+statistics instead, so the term table and the SymSpell delete index only hold
+base forms. At lookup time a word is split into candidate prefix + base pairs,
+the base is checked / corrected, and the prefix is reattached.
+
+A term prefix+base is folded only when
+- the prefix is a valid clitic sequence (PREFIX_RE) and the base has at least
+  MIN_BASE_LENGTH letters,
+- the base is itself kept in the dictionary, and
+- the base is at least as frequent as the prefixed form, which keeps words
+  that merely start with a clitic letter (הולך is not ה + ולך).
+"""
+
+import json
+import os
+import re
+from typing import Optional
+
+PREFIX_RE = re.compile(r"ו?(?:ש|כש|מש)?[בכלמ]?ה?")
+MAX_PREFIX_LENGTH = 5  # ו + כש + ב + ה
+MIN_BASE_LENGTH = 2
+
+
+def split_prefixes(word: str) -> list[tuple[str, str]]:
+    """All (prefix, base) splits of `word` with a valid, non-empty prefix; longest prefix first."""
+    splits = []
+    for length in range(min(MAX_PREFIX_LENGTH, len(word) - MIN_BASE_LENGTH), 0, -1):
+        prefix = word[:length]
+        if PREFIX_RE.fullmatch(prefix):
+            splits.append((prefix, word[length:]))
+    return splits
+
+
+class PrefixModel:
+    """Prefix frequencies of the folded forms, used to weight reattached prefixes."""
+
+    def __init__(self, prefix_counts: Optional[dict[str, int]] = None, total: int = 0):
+        self.prefix_counts = prefix_counts or {}
+        self.total = total  # occurrences of all dictionary words, folded or not
+
+    def __contains__(self, prefix: str) -> bool:
+        return prefix in self.prefix_counts
+
+    def weight(self, prefix: str) -> float:
+        """Share of word occurrences that carry `prefix` (1.0 for no prefix)."""
+        if not prefix:
+            return 1.0
+        return self.prefix_counts.get(prefix, 0) / self.total if self.total else 0.0
+
+    def splits(self, word: str) -> list[tuple[str, str]]:
+        """split_prefixes() limited to prefixes seen while building."""
+        return [(prefix, base) for prefix, base in split_prefixes(word) if prefix in self.prefix_counts]
+
+    @classmethod
+    def load(cls, filepath: str) -> "PrefixModel":
+        with open(filepath, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["prefixes"], data["total"])
+
+    def save(self, filepath: str) -> None:
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"total": self.total, "prefixes": self.prefix_counts}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, filepath)
+
+
+def decompose_counts(items: list[tuple[str, int]]) -> tuple[list[tuple[str, int]], PrefixModel]:
+    """
+    Fold prefixed forms into their base words.
+
+    Args:
+        items: (term, count) pairs of the pruned dictionary
+
+    Returns:
+        Tuple of (kept base terms in their original order with the counts of the
+        folded forms added, prefix model)
+    """
+    counts = dict(items)
+    kept: dict[str, int] = {}
+    folded: dict[str, str] = {}  # term -> base it was folded into
+    prefix_counts: dict[str, int] = {}
+
+    # Bases are shorter than the forms built on them, so their fate is known first
+    for term in sorted(counts, key=len):
+        count = counts[term]
+        for prefix, base in split_prefixes(term):
+            if base in kept and counts[base] >= count:
+                folded[term] = base
+                prefix_counts[prefix] = prefix_counts.get(prefix, 0) + count
+                break
+        else:
+            kept[term] = count
+
+    for term, base in folded.items():
+        kept[base] += counts[term]
+
+    result = [(term, kept[term]) for term, _ in items if term in kept]
+    return result, PrefixModel(prefix_counts, sum(counts.values()))
@@ -0,0 +1,300 @@
+"""
+Accuracy and latency benchmark of the spellchecker.
+
+A labelled set is a CSV with `form` (the input word) and `correct` (the
+expected correction) columns, like test_data.csv. Every form is corrected
+with the correction cache disabled, so each word pays for its full lookup,
+and the report holds
+
+- accuracy: corrected / not corrected / wrongly corrected words, split into
+  misspelled forms and forms that were already correct
+- latency: per-word percentiles in milliseconds and lookups per second
+- candidates: suggestions returned per word
+- tiers: words settled by each lookup tier (see SpellChecker.tier_info)
+- memory: RSS, USS and PSS of the process before the dictionary was loaded
+  and after the run, the size of the mapped index and how much of it is
+  resident. dictionary_mb is the PSS growth from before the load to after
+  the run: the private memory of the dictionary, overlays and caches plus
+  this process's share of the index pages the lookups touched. A mapped
+  index adds almost nothing to RSS when it is loaded, so the RSS growth at
+  load time is not a measure of the dictionary's memory.
+
+With workers > 1 the set is split into chunks corrected on a process pool;
+every worker loads its own spellchecker from the same files (see
+load_spellchecker), and lookups/sec is measured over the wall time of the
+run after the workers have loaded (the memory figures then only cover the
+load, since the lookups run in the workers). Reports are plain JSON, and compare_reports() lists the
+regressions of a report against a baseline report.
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import pathlib
+import time
+from typing import Optional
+
+import psutil
+
+PERCENTILES = (50, 90, 95, 99)
+MISTAKES_KEPT = 50
+
+
+def read_labelled_pairs(filename: str) -> list[tuple[str, str]]:
+    """
+    (form, correct) pairs of a labelled CSV; rows with an empty cell are skipped.
+
+    Raises:
+        ValueError: If the CSV has no 'form' or 'correct' column
+    """
+    with open(filename, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        if "form" not in (reader.fieldnames or []) or "correct" not in reader.fieldnames:
+            raise ValueError(f"{filename} must have 'form' and 'correct' columns (found: {reader.fieldnames})")
+        pairs = []
+        for row in reader:
+            form, correct = (row["form"] or "").strip(), (row["correct"] or "").strip()
+            if form and correct:
+                pairs.append((form, correct))
+    return pairs
+
+
+def percentiles(values: list[float], points=PERCENTILES) -> dict[str, float]:
+    """Nearest-rank percentiles of `values`, keyed "p50", "p90"..."""
+    ordered = sorted(values)
+    if not ordered:
+        return {f"p{point}": 0.0 for point in points}
+    return {f"p{point}": ordered[min(len(ordered) - 1, max(0, -(-point * len(ordered) // 100) - 1))]
+            for point in points}
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process."""
+    return psutil.Process().memory_info().rss
+
+
+def memory_bytes() -> dict[str, Optional[int]]:
+    """RSS, USS and PSS of this process; USS / PSS are None where psutil cannot read them."""
+    process = psutil.Process()
+    try:
+        info = process.memory_full_info()
+    except (psutil.AccessDenied, NotImplementedError):
+        info = process.memory_info()
+    return {"rss": info.rss, "uss": getattr(info, "uss", None), "pss": getattr(info, "pss", None)}
+
+
+def mapped_resident_bytes(filepath: str) -> Optional[int]:
+    """Resident pages of this process's mappings of `filepath`; None if it is not mapped."""
+    path = os.path.realpath(filepath)
+    try:
+        maps = psutil.Process().memory_maps(grouped=True)
+    except (psutil.AccessDenied, NotImplementedError, AttributeError):
+        return None
+    resident = [mapping.rss for mapping in maps if mapping.path == path]
+    return sum(resident) if resident else None
+
+
+def correct_pairs(spellchecker, pairs: list[tuple[str, str]], top_k: int = 1000) -> tuple[list[tuple], dict]:
+    """
+    Correct every form with the correction cache disabled.
+
+    Returns:
+        Tuple of ((form, correct, corrected, candidates, seconds) per pair, tier counts)
+    """
+    cache_size = spellchecker.cache_size
+    spellchecker.clear_cache()
+    spellchecker.cache_size = 0
+    stats: dict = {}
+    rows = []
+    try:
+        for form, correct in pairs:
+            start = time.perf_counter()
+            corrected, suggestions = spellchecker.correct_word(form, top_k, stats)
+            elapsed = time.perf_counter() - start
+            rows.append((form, correct, corrected, len(suggestions), elapsed))
+    finally:
+        spellchecker.cache_size = cache_size
+    return rows, stats
+
+
+# ---------- worker pool ----------
+
+_worker_spellchecker = None
+
+
+def init_benchmark_worker(load_options: dict) -> None:
+    """Pool initializer: load the spellchecker once per worker process."""
+    from app.utils.spellcheck import load_spellchecker
+
+    global _worker_spellchecker
+    _worker_spellchecker = load_spellchecker(**load_options)
+
+
+def benchmark_chunk(args: tuple[list[tuple[str, str]], int]) -> tuple[list[tuple], dict]:
+    """Correct one chunk of pairs in a worker (see correct_pairs)."""
+    pairs, top_k = args
+    return correct_pairs(_worker_spellchecker, pairs, top_k)
+
+
+# ---------- report ----------
+
+def summarize(rows: list[tuple], stats: dict, wall_seconds: float) -> dict:
+    """Accuracy, latency, candidate and tier sections of a report."""
+    misspelled = [row for row in rows if row[0] != row[1]]
+    already_correct = [row for row in rows if row[0] == row[1]]
+    correct = sum(1 for row in rows if row[2] == row[1])
+    not_corrected = sum(1 for row in misspelled if row[2] == row[0])
+    latencies = [row[4] * 1000 for row in rows]
+    candidates = [row[3] for row in rows]
+
+    return {
+        "words": len(rows),
+        "accuracy": {
+            "accuracy": correct / len(rows) if rows else 0.0,
+            "correct": correct,
+            "wrong": len(rows) - correct - not_corrected,
+            "not_corrected": not_corrected,
+            "misspelled_fixed": sum(1 for row in misspelled if row[2] == row[1]) / len(misspelled) if misspelled else 0.0,
+            "false_corrections": sum(1 for row in already_correct if row[2] != row[1]),
+        },
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            **percentiles(latencies),
+            "max": max(latencies, default=0.0),
+        },
+        "lookups_per_second": len(rows) / wall_seconds if wall_seconds > 0 else 0.0,
+        "wall_seconds": wall_seconds,
+        "candidates": {
+            "mean": sum(candidates) / len(candidates) if candidates else 0.0,
+            **percentiles(candidates, (50, 95)),
+            "max": max(candidates, default=0),
+        },
+        "tiers": stats,
+        "mistakes": [{"form": form, "expected": expected, "corrected": corrected}
+                     for form, expected, corrected, _, _ in rows if corrected != expected][:MISTAKES_KEPT],
+    }
+
+
+def benchmark_spellchecker(
+    spellchecker,
+    pairs: list[tuple[str, str]],
+    workers: int = 1,
+    top_k: int = 1000,
+    repeat: int = 1,
+    chunk_size: int = 64,
+    load_options: Optional[dict] = None,
+) -> dict:
+    """
+    Benchmark a labelled set.
+
+    Args:
+        spellchecker: Loaded SpellChecker (used when workers <= 1)
+        pairs: (form, correct) pairs, see read_labelled_pairs
+        workers: Worker processes; above 1 every worker loads its own spellchecker
+        top_k: Suggestions kept per word
+        repeat: Times the set is corrected (steadier timings for small sets)
+        chunk_size: Pairs sent to a worker at a time
+        load_options: load_spellchecker() arguments of the workers (default: settings)
+
+    Returns:
+        Report dictionary (see summarize)
+    """
+    pairs = pairs * max(1, repeat)
+    if workers <= 1:
+        correct_pairs(spellchecker, pairs[:1], top_k)  # warm-up: first-call costs are not lookup latency
+        start = time.perf_counter()
+        rows, stats = correct_pairs(spellchecker, pairs, top_k)
+    else:
+        rows, stats = [], {}
+        chunks = [(pairs[i:i + chunk_size], top_k) for i in range(0, len(pairs), chunk_size)]
+        with multiprocessing.Pool(workers, initializer=init_benchmark_worker, initargs=(load_options or {},)) as pool:
+            # Timing starts once the workers have loaded their spellcheckers
+            pool.map(benchmark_chunk, [(pairs[:1], top_k)] * workers, chunksize=1)
+            start = time.perf_counter()
+            for chunk_rows, chunk_stats in pool.imap(benchmark_chunk, chunks):
+                rows.extend(chunk_rows)
+                for name, value in chunk_stats.items():
+                    stats[name] = stats.get(name, 0) + value
+    report = summarize(rows, stats, time.perf_counter() - start)
+    report.update({"workers": max(1, workers), "top_k": top_k, "repeat": max(1, repeat)})
+    return report
+
+
+def run_benchmark(
+    filename: str,
+    workers: int = 1,
+    top_k: int = 1000,
+    repeat: int = 1,
+    load_options: Optional[dict] = None,
+) -> dict:
+    """Load the spellchecker (measuring its memory) and benchmark the labelled set in `filename`."""
+    from app.config import settings
+    from app.utils.spellcheck import load_spellchecker
+
+    load_options = load_options or {}
+    pairs = read_labelled_pairs(filename)
+    before = memory_bytes()
+    start = time.perf_counter()
+    spellchecker = load_spellchecker(**load_options)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = rss_bytes()
+
+    report = benchmark_spellchecker(spellchecker, pairs, workers, top_k, repeat, load_options=load_options)
+    index_path = load_options.get("index_path") or (
+        settings.spellchecker_trie_path if settings.spellchecker_term_store == "trie" else settings.spellchecker_index_path)
+    report["labelled_set"] = filename
+    report["dictionary"] = {
+        "store": type(spellchecker.symspell).__name__,
+        "words": len(spellchecker.symspell.words),
+        "load_seconds": load_seconds,
+        "index_path": index_path,
+        "index_mb": os.path.getsize(index_path) / 2**20 if index_path and os.path.isfile(index_path) else None,
+        "max_edit_distance": settings.spellchecker_max_edit_distance,
+        "prefix_length": settings.spellchecker_prefix_length,
+    }
+    after = memory_bytes()
+    resident = mapped_resident_bytes(index_path) if index_path else None
+    measure = "pss" if before["pss"] is not None and after["pss"] is not None else "rss"
+    report["memory"] = {
+        **{f"{name}_before_load_mb": value / 2**20 if value is not None else None for name, value in before.items()},
+        "rss_loaded_mb": rss_loaded / 2**20,
+        **{f"{name}_after_run_mb": value / 2**20 if value is not None else None for name, value in after.items()},
+        "index_mapped_mb": report["dictionary"]["index_mb"] if resident is not None else None,
+        "index_resident_mb": resident / 2**20 if resident is not None else None,
+        "dictionary_mb": (after[measure] - before[measure]) / 2**20,
+        "dictionary_measure": f"{measure} growth from before the load to after the run",
+    }
+    report["created"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return report
+
+
+def write_report(report: dict, filepath: str) -> None:
+    """Write a report as JSON (temp file + atomic replace)."""
+    pathlib.Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, filepath)
+
+
+def compare_reports(report: dict, baseline: dict, max_slowdown: float = 0.2, max_accuracy_drop: float = 0.0) -> list[str]:
+    """
+    Regressions of `report` against `baseline`.
+
+    Args:
+        max_slowdown: Allowed relative growth of the p50 / p95 latency (0.2 = 20%)
+        max_accuracy_drop: Allowed drop of the accuracy (absolute, 0.01 = one point)
+
+    Returns:
+        One message per regression (empty if there is none)
+    """
+    regressions = []
+    accuracy, base_accuracy = report["accuracy"]["accuracy"], baseline["accuracy"]["accuracy"]
+    if accuracy < base_accuracy - max_accuracy_drop:
+        regressions.append(f"accuracy {accuracy:.2%} < baseline {base_accuracy:.2%}")
+    for point in ("p50", "p95"):
+        latency, base_latency = report["latency_ms"][point], baseline["latency_ms"][point]
+        if base_latency > 0 and latency > base_latency * (1 + max_slowdown):
+            regressions.append(f"{point} latency {latency:.3f} ms > baseline {base_latency:.3f} ms")
+    return regressions
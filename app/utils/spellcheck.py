@@ -1,7 +1,44 @@
+import os
 import pathlib
 from symspellpy import SymSpell, Verbosity
+from symspellpy.suggest_item import SuggestItem
 import re
 import csv
+import heapq
+import math
+import functools
+import multiprocessing
+import threading
+import time
+
+# HebrewTokenizer.normalize: nikud removed, geresh and gershayim variants unified,
+# dashes turned into spaces. Nikud goes through a compiled regex (much faster than
+# str.translate); the other characters are rare, so the table only runs when needed.
+NIKUD_RE = re.compile(r'[\u0591-\u05C7]+')
+PUNCTUATION_TABLE = str.maketrans({
+    **{c: "'" for c in "`׳‛‚ʻ’"},
+    **{c: '"' for c in "“”„‟«»"},
+    **{c: " " for c in "‒–—―−"},
+})
+PUNCTUATION_RE = re.compile("[" + "".join(chr(code) for code in PUNCTUATION_TABLE) + "]")
+SPACES_RE = re.compile(r'[^\S\n]+')
+
+# A valid token is a whole whitespace-separated word: starts with a Hebrew letter,
+# continues with letters and quotes, and has a final letter only at the end or
+# right before a closing quote (ץ' is fine, ץר is not)
+_REGULAR = "אבגדהוזחטיכלמנסעפצקרשת"
+_FINAL = "ךםןףץ"
+TOKEN_RE = re.compile(
+    rf"""(?<!\S)(?:(?:[{_REGULAR}][{_REGULAR}'"]*)?[{_FINAL}]['"]?|[{_REGULAR}][{_REGULAR}'"]*)(?!\S)"""
+)
+
+# A Hebrew word inside running text: letters with inner quotes (צה"ל), not touching
+# other word characters or nikud, so the punctuation, digits and Latin text around
+# it can be kept as they are (SpellChecker.correct_text_in_place)
+WORD_RE = re.compile(
+    rf"""(?<![\w\u0591-\u05C7'"])[{_REGULAR}{_FINAL}](?:[{_REGULAR}{_FINAL}'"]*[{_REGULAR}{_FINAL}])?(?![\w\u0591-\u05C7])"""
+)
+
 
 class HebrewTokenizer:
 
@@ -11,27 +48,17 @@ class HebrewTokenizer:
         - מסיר ניקוד
         - מאחד גרשיים/גרשים
         - מנרמל מקפים
-        - מנקה רווחים מיותרים
+        - מנקה רווחים מיותרים (אבל שומר על ירידות שורה)
         - לא מפרק מילים עם גרשיים/מרכאות
         """
+        return SPACES_RE.sub(' ', self._unify(text)).strip()
 
-        # הסרת ניקוד (טווח יוניקוד של ניקוד עברי)
-        text = re.sub(r'[\u0591-\u05C7]', '', text)
-
-        # אחידות גרשים
-        text = re.sub(r"[`׳`‛‚ʻ’]", "'", text)   # גרש → '
-        text = re.sub(r'[“”„‟«»]', '"', text)    # מירכאות → "
-
-        # אחידות מקפים
-        text = re.sub(r'[־‒–—―−]', ' ', text)
-
-        # איחוד רווחים (אבל שומר על ירידות שורה)
-        text = re.sub(r'[^\S\n]+', ' ', text)
-
-        # ניקוי רווחים כפולים
-        text = re.sub(r' +', ' ', text)
-
-        return text.strip()
+    @staticmethod
+    def _unify(text: str) -> str:
+        text = NIKUD_RE.sub('', text)
+        if PUNCTUATION_RE.search(text):
+            text = text.translate(PUNCTUATION_TABLE)
+        return text
 
     def tokenize(self, text: str) -> list[str]:
         """
@@ -42,87 +69,173 @@ class HebrewTokenizer:
         4. If the word contants a final letter ךםןףץ not in the final spot, but including ' - remove it
              so ץ' at the end is fine, but ץר is not
         5. All remaining words are valid hebrew words
+
+        All of the rules are encoded in TOKEN_RE, which finds the valid words in one scan.
         """
-        
-        # 1. Split by whitespace
-        words = text.split()
-        
-        valid_tokens = []
-        
-        for word in words:
-            # 2. If word doesn't start with heb letter א-ת, remove it
-            if not word or not ('\u05D0' <= word[0] <= '\u05EA'):
-                continue
+        return TOKEN_RE.findall(text)
 
-            # 3. Check for final letters not in final position
-            final_letters = {'ך', 'ם', 'ן', 'ף', 'ץ'}
-            is_valid = True
-            
-            for i, char in enumerate(word):
-                if not ('\u05D0' <= char <= '\u05EA' or (i>=1 and char in ["'", '"'])):
-                    is_valid = False
-                    break
+    def iter_tokens(self, text: str):
+        """
+        Generator – tokenize(normalize(text)) in a single pass over the text.
 
-                if char in final_letters:
-                    # Check if this is the last character or followed by quote
-                    if i == len(word) - 1:
-                        # Final position - this is fine
-                        continue
-                    elif i == len(word) - 2 and word[i + 1] in ["'", '"']:
-                        # Second to last with quote - this is fine (e.g., ץ')
-                        continue
-                    else:
-                        # Final letter not in final position - invalid word
-                        is_valid = False
-                        break
-            
-            # 4. All remaining words are valid hebrew words
-            if is_valid:
-                valid_tokens.append(word)
-        
-        return valid_tokens
+        Collapsing whitespace and stripping do not change which words exist, so
+        only the character unification runs before matching tokens.
+        """
+        for match in TOKEN_RE.finditer(self._unify(text)):
+            yield match.group()
 
 
 import pathlib
+from typing import Iterator
+
+from app.utils.corpus_readers import (COMPRESSIONS, CorpusProgress, ProgressCallback, is_splittable, iter_texts,
+                                      print_progress, readahead)
+
 
 class CorpusLoader:
-    def __init__(self, data_dir: str):
+    """
+    Streams the corpus directory: .txt, .csv and .jsonl files, each optionally
+    compressed (.gz / .bz2 / .xz); see corpus_readers. Reader options default
+    to the spellchecker_corpus_* settings, and progress goes to `progress`
+    (print_progress by default, None for silence) every `progress_every` lines.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        text_field: str | None = None,
+        csv_column: str | None = None,
+        buffer_size: int | None = None,
+        readahead: int | None = None,
+        progress: ProgressCallback | None = print_progress,
+        progress_every: int = 100_000,
+    ):
+        from app.config import settings
+
         self.data_dir = pathlib.Path(data_dir)
+        self.text_field = settings.spellchecker_corpus_text_field if text_field is None else text_field
+        self.csv_column = settings.spellchecker_corpus_csv_column if csv_column is None else csv_column
+        self.buffer_size = buffer_size or settings.spellchecker_corpus_buffer_size
+        self.readahead = settings.spellchecker_corpus_readahead if readahead is None else readahead
+        self.progress = progress
+        self.progress_every = progress_every
+        self.position = (0, 0)  # (file index, texts read from it) of load_texts()
 
-    def load_texts(self):
-        """Generator – מחזיר שורות טקסט מכל הקבצים בהדרגה"""
-        print("Streaming texts from", self.data_dir)
+    def _report(self, event: str, **fields) -> None:
+        if self.progress is not None:
+            self.progress(CorpusProgress(event, **fields))
 
-        for file in self.data_dir.glob("*.txt"):
-            print(file)
-            with file.open(encoding="utf-8") as f:
-                for line in f:
-                    yield line.strip()
+    def corpus_files(self) -> list[pathlib.Path]:
+        """
+        Corpus files in streaming order: .txt, then .csv, then .jsonl files,
+        each type uncompressed first and then .gz, .bz2 and .xz.
+        """
+        files = []
+        for suffix in (".txt", ".csv", ".jsonl"):
+            for compression in ("", *COMPRESSIONS):
+                files.extend(sorted(self.data_dir.glob(f"*{suffix}{compression}")))
+        return files
+
+    def reader_options(self) -> dict:
+        """Options for load_shard_texts, so worker processes read files like this loader."""
+        return {"text_field": self.text_field, "csv_column": self.csv_column, "buffer_size": self.buffer_size}
+
+    def iter_file_texts(self, file) -> Iterator[str]:
+        """Generator – the stripped texts of one corpus file, read ahead on a thread if configured."""
+        texts = iter_texts(file, self.text_field, self.csv_column, self.buffer_size)
+        return readahead(texts, depth=self.readahead) if self.readahead > 0 else texts
+
+    def load_texts(self, start: tuple[int, int] = (0, 0)):
+        """
+        Generator – מחזיר שורות טקסט מכל הקבצים בהדרגה.
 
-        for file in self.data_dir.glob("*.csv"):
-            print(file)
-            with file.open(encoding="utf-8") as f:
-                for line in f:
-                    yield line.strip()
+        Args:
+            start: (file index, texts) read position to start from, e.g. from a
+                build checkpoint; the skipped texts are read but not yielded.
+                self.position is the read position after the last yielded text.
+        """
+        files = self.corpus_files()
+        start_file, skip = start
+        lines = 0
+        for files_done, file in enumerate(files):
+            if files_done < start_file:
+                continue
+            self._report("file", file=str(file), files_done=files_done, files_total=len(files), lines=lines)
+            texts = self.iter_file_texts(file)
+            if files_done == start_file and skip:
+                texts = islice(texts, skip, None)
+            self.position = (files_done, skip if files_done == start_file else 0)
+            for text in texts:
+                lines += 1
+                self.position = (files_done, self.position[1] + 1)
+                if lines % self.progress_every == 0:
+                    self._report("lines", file=str(file), files_done=files_done, files_total=len(files), lines=lines)
+                yield text
+        self._report("done", files_done=len(files), files_total=len(files), lines=lines)
+
+    def shards(self, shard_bytes: int = 16 * 1024 * 1024) -> list[tuple[str, int, int]]:
+        """
+        Split the corpus into (path, start, end) byte ranges of about `shard_bytes`,
+        in streaming order. A line belongs to the shard holding its first byte.
+        Files that cannot be split by bytes are one shard each.
+        """
+        shards = []
+        for file in self.corpus_files():
+            size = file.stat().st_size
+            if not is_splittable(file):
+                shards.append((str(file), 0, size))  # compressed / CSV / JSONL files are read whole
+                continue
+            for start in range(0, size, shard_bytes):
+                shards.append((str(file), start, min(start + shard_bytes, size)))
+        return shards
+
+    @staticmethod
+    def load_shard_texts(shard: tuple[str, int, int], text_field: str | None = None, csv_column: str | None = None,
+                         buffer_size: int | None = None):
+        """
+        Generator – the stripped lines of one shard, split exactly like the
+        text-mode reads of load_texts() (\n, \r\n and \r end a line). Files
+        that cannot be split are read whole with the given reader options
+        (default: the spellchecker_corpus_* settings).
+        """
+        path, start, end = shard
+        if not is_splittable(path):
+            from app.config import settings
+            yield from iter_texts(
+                path,
+                settings.spellchecker_corpus_text_field if text_field is None else text_field,
+                settings.spellchecker_corpus_csv_column if csv_column is None else csv_column,
+                buffer_size or settings.spellchecker_corpus_buffer_size,
+            )
+            return
+        with open(path, "rb") as f:
+            if start > 0:
+                # Skip the line that started in the previous shard
+                f.seek(start - 1)
+                f.readline()
+            position = f.tell()
+            while position < end:
+                raw = f.readline()
+                if not raw:
+                    break
+                position += len(raw)
+                text = raw.decode("utf-8")
+                if "\r" in text:
+                    parts = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+                    if parts[-1] == "":
+                        parts.pop()
+                    for part in parts:
+                        yield part.strip()
+                else:
+                    yield text.strip()
 
     def load_tokens(self, tokenizer):
-        """Generator – מנרמל ומחזיר טוקנים בהדרגה"""
-        # Global counter for progress tracking
-        global line_counter
-        line_counter = 0
-        
+        """Generator – מנרמל ומחזיר טוקנים בהדרגה (single pass per line, HebrewTokenizer.iter_tokens)"""
         for text in self.load_texts():
-            line_counter += 1
-            
-            # Display progress every 100,000 lines
-            if line_counter % 100000 == 0:
-                print(f"📊 Processed {line_counter:,} lines...")
-                
-            norm = tokenizer.normalize(text)
-            for tok in tokenizer.tokenize(norm):
-                yield tok
+            yield from tokenizer.iter_tokens(text)
 
-from collections import Counter
+from collections import Counter, OrderedDict
+from contextlib import nullcontext
 
 # עלויות החלפה מותאמות לעברית
 CONFUSIONS = {
@@ -137,63 +250,288 @@ CONFUSIONS = {
     ("ם", "ן"): 0.7, ("ן", "ם"): 0.7,
 }
 
-def weighted_levenshtein(a: str, b: str) -> float:
+# Same costs keyed by a single int built from the codepoint pair, so the inner
+# DP loop does one dict lookup on an int instead of building a tuple of strs
+CONFUSION_CODES = {(ord(x) << 21) | ord(y): cost for (x, y), cost in CONFUSIONS.items()}
+
+# Final letter forms; the regular form of each letter is what CONFUSION_SUBSTITUTIONS is keyed by
+FINAL_FORMS = {"כ": "ך", "מ": "ם", "נ": "ן", "פ": "ף", "צ": "ץ"}
+REGULAR_FORMS = {final: regular for regular, final in FINAL_FORMS.items()}
+
+# Letters each letter is commonly confused with (from CONFUSIONS), by regular form
+CONFUSION_SUBSTITUTIONS: dict[str, tuple[str, ...]] = {}
+for (x, y) in CONFUSIONS:
+    x, y = REGULAR_FORMS.get(x, x), REGULAR_FORMS.get(y, y)
+    CONFUSION_SUBSTITUTIONS[x] = CONFUSION_SUBSTITUTIONS.get(x, ()) + (y,)
+
+
+def fix_final_letters(word: str) -> str:
+    """Final forms at the end of the word only (שלומ -> שלום, ךלב -> כלב)."""
+    if not word:
+        return word
+    return "".join(REGULAR_FORMS.get(c, c) for c in word[:-1]) + FINAL_FORMS.get(word[-1], word[-1])
+
+
+def confusion_variants(word: str) -> set[str]:
+    """
+    Spellings `word` is likely a misspelling of: the word with its final
+    letters fixed, then one CONFUSIONS substitution or one doubled letter
+    removed (שלוםם, עולמם, אניי). The word itself is not included.
+    """
+    fixed = fix_final_letters(word)
+    variants = {fixed}
+    previous = None
+    for i, letter in enumerate(fixed):
+        regular = REGULAR_FORMS.get(letter, letter)
+        for other in CONFUSION_SUBSTITUTIONS.get(regular, ()):
+            variants.add(fix_final_letters(fixed[:i] + other + fixed[i + 1:]))
+        if regular == previous:
+            variants.add(fixed[:i - 1] + fixed[i:])
+        previous = regular
+    variants.discard(word)
+    return variants
+
+
+def confusion_candidates(word: str, words) -> list[SuggestItem]:
+    """
+    The confusion_variants() of `word` that are dictionary terms, as SymSpell
+    suggestions. Each variant is one probe of the term table (`words`, a dict
+    or the mapped index) instead of a delete-index search. A word that is a
+    term itself comes first at distance 0, so the tier never settles a
+    correctly spelled word on a rarer neighbour (שלום -> סלום).
+    """
+    candidates = []
+    count = words.get(word)
+    if count is not None:
+        candidates.append(SuggestItem(word, 0, count))
+    for variant in sorted(confusion_variants(word)):
+        count = words.get(variant)
+        if count is not None:
+            candidates.append(SuggestItem(variant, 1, count))
+    return candidates
+
+
+def weighted_levenshtein(a: str, b: str, max_cost: float = math.inf) -> float:
     """
     Levenshtein מותאם לעברית עם עלויות שונות להחלפות שכיחות.
+
+    Computed with two rows restricted to the band |i - j| <= max_cost (every
+    insertion/deletion costs 1). Returns math.inf as soon as the distance is
+    known to exceed max_cost; otherwise the exact distance.
     """
     n, m = len(a), len(b)
-    dp = [[0] * (m + 1) for _ in range(n + 1)]
+    if abs(n - m) > max_cost:
+        return math.inf
+    band = int(max_cost) if max_cost < max(n, m) else max(n, m)
+
+    a_codes = [ord(c) for c in a]
+    b_codes = [ord(c) for c in b]
+    confusions = CONFUSION_CODES
+    inf = math.inf
 
-    for i in range(n + 1):
-        dp[i][0] = i
-    for j in range(m + 1):
-        dp[0][j] = j
+    previous = [j if j <= band else inf for j in range(m + 1)]
+    current = [inf] * (m + 1)
 
     for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            cost = 0 if a[i - 1] == b[j - 1] else CONFUSIONS.get((a[i - 1], b[j - 1]), 1)
-            dp[i][j] = min(
-                dp[i - 1][j] + 1,        # מחיקה
-                dp[i][j - 1] + 1,        # הוספה
-                dp[i - 1][j - 1] + cost  # החלפה
-            )
-    return dp[n][m]
+        lo = max(1, i - band)
+        hi = min(m, i + band)
+        current[lo - 1] = i if lo == 1 else inf
+        row_min = current[lo - 1]
+
+        a_code = a_codes[i - 1]
+        key = a_code << 21
+        diagonal = previous[lo - 1]
+        left = current[lo - 1]
+        for j in range(lo, hi + 1):
+            b_code = b_codes[j - 1]
+            up = previous[j]
+            cost = 0 if a_code == b_code else confusions.get(key | b_code, 1)
+            value = up + 1                       # מחיקה
+            if left + 1 < value:
+                value = left + 1                 # הוספה
+            if diagonal + cost < value:
+                value = diagonal + cost          # החלפה
+            current[j] = value
+            if value < row_min:
+                row_min = value
+            diagonal = up
+            left = value
+        if hi < m:
+            current[hi + 1] = inf
+
+        # Every path goes through this row - abandon once all of it is too expensive
+        if row_min > max_cost:
+            return inf
+        previous, current = current, previous
+
+    return previous[m] if previous[m] <= max_cost else inf
+
+def rank_candidates(word: str, candidates: list, top_k: int) -> list[dict]:
+    """
+    Rank SymSpell suggestions for `word` by weighted levenshtein, then by
+    frequency, then by SymSpell order, and return the best `top_k`.
+
+    Only the best `top_k` candidates are kept; once `top_k` are found, the
+    distance of the worst one is the ceiling for the next candidates and
+    weighted_levenshtein abandons anything above it.
+    """
+    if top_k <= 0:
+        return []
+
+    # Max-heap (by negated key) of the best candidates so far; ties keep SymSpell order
+    best = []
+    for index, c in enumerate(candidates):
+        ceiling = -best[0][0] if len(best) >= top_k else math.inf
+        distance = weighted_levenshtein(word, c.term, ceiling)
+        if distance > ceiling:
+            continue
+        entry = (-distance, c.count, -index, c)
+        if len(best) < top_k:
+            heapq.heappush(best, entry)
+        else:
+            heapq.heappushpop(best, entry)
+
+    ranked = sorted(best, key=lambda e: (-e[0], -e[1], -e[2]))  # קודם לפי מרחק מותאם, אח"כ לפי שכיחות
+    return [{"term": e[3].term, "distance": -e[0], "count": e[3].count} for e in ranked]
+
 
 def hebrew_rerank(symspell, word: str, top_k: int = 5):
     """
     משתמש ב-SymSpell כדי למצוא מועמדים ואז מדרג עם weighted levenshtein.
     """
+    return hebrew_rerank_batch(symspell, [word], top_k)[0]
+
+
+def lookup_distance(symspell) -> int:
+    """Edit distance of the full lookups: the largest one `symspell` was built for (lookups above it fail)."""
+    return symspell._max_dictionary_edit_distance
+
+
+def hebrew_rerank_batch(symspell, words: list[str], top_k: int = 5) -> list[list[dict]]:
+    """
+    hebrew_rerank for a batch of words.
+
+    When NumPy is available and the batch has at least
+    settings.vectorized_min_candidates candidates in total, all of them are
+    scored in one vectorized DP (vectorized.weighted_levenshtein_batch) and
+    each word's top-k is picked with np.argpartition. Rankings are identical
+    to rank_candidates.
+    """
     # חובה להשתמש ב-Verbosity.ALL כדי לקבל את כל המועמדים
-    candidates = symspell.lookup(word, verbosity=Verbosity.ALL, max_edit_distance=2)
-
-    print(f"      🔍 All suggestions for '{word}':")
-    for i, suggestion in enumerate(candidates[:top_k], 1):  # Show top 5
-        distance = suggestion.distance
-        count = suggestion.count
-        term = suggestion.term
-        print(f"         {i}. '{term}' (distance: {distance}, frequency: {count})")
-
-
-    reranked_candidates = [
-        {
-            "term": c.term,
-            "distance": weighted_levenshtein(word, c.term),
-            "count": c.count,
-        }
-        for c in candidates
+    distance = lookup_distance(symspell)
+    candidate_lists = [symspell.lookup(word, verbosity=Verbosity.ALL, max_edit_distance=distance) for word in words]
+    return rerank_lookups(words, candidate_lists, top_k)
+
+
+def rerank_lookups(words: list[str], candidate_lists: list[list], top_k: int = 5) -> list[list[dict]]:
+    """Rank each word's SymSpell suggestions (see hebrew_rerank_batch)."""
+    from app.config import settings
+    from app.utils import vectorized
+
+    total = sum(map(len, candidate_lists))
+    if top_k <= 0 or not vectorized.available() or total < settings.vectorized_min_candidates:
+        return [rank_candidates(word, candidates, top_k) for word, candidates in zip(words, candidate_lists)]
+
+    pair_words = [word for word, candidates in zip(words, candidate_lists) for _ in candidates]
+    pair_terms = [c.term for candidates in candidate_lists for c in candidates]
+    distances = vectorized.weighted_levenshtein_batch(pair_words, pair_terms)
+    counts = vectorized.np.array([c.count for candidates in candidate_lists for c in candidates], dtype=vectorized.np.int64)
+
+    results = []
+    start = 0
+    for candidates in candidate_lists:
+        end = start + len(candidates)
+        order = vectorized.top_k_order(distances[start:end], counts[start:end], top_k)
+        results.append([
+            {"term": candidates[i].term, "distance": float(distances[start + i]), "count": candidates[i].count}
+            for i in order.tolist()
+        ])
+        start = end
+    return results
+
+
+def tiered_rerank_batch(
+    symspell,
+    words: list[str],
+    top_k: int = 5,
+    max_cost: float = 1.0,
+    short_word_length: int = 3,
+    stats: dict | None = None,
+    use_confusions: bool = True,
+) -> list[list[dict]]:
+    """
+    hebrew_rerank_batch with cheap first tiers.
+
+    With `use_confusions`, the confusion tier first looks up the variants from
+    confusion_variants() directly in the term table. Tier 1 asks SymSpell for
+    the CLOSEST suggestions within edit distance 1. A word is settled by a tier
+    when its best reranked candidate has a weighted distance of at most
+    `max_cost`; the others go on to the next tier and finally to tier 2, the
+    full Verbosity.ALL lookup at the dictionary's edit distance (see
+    lookup_distance; at most 1 for words of at most `short_word_length` letters).
+
+    Args:
+        symspell: SymSpell dictionary
+        words: Words to correct
+        top_k: Suggestions kept per word
+        max_cost: Weighted distance that settles a word before tier 2
+        short_word_length: Words up to this length are capped at edit distance 1
+        stats: Optional dict; "confusion", "tier1", "tier2" and "unresolved" word counts are added to it
+        use_confusions: Try the confusion tier first
+
+    Returns:
+        Ranked suggestions for each word
+    """
+    results: list[list[dict]] = [[] for _ in words]
+    pending = list(range(len(words)))
+    distance = lookup_distance(symspell)
+    tiers = [
+        ("confusion", lambda word: confusion_candidates(word, symspell.words)),
+        ("tier1", lambda word: symspell.lookup(word, verbosity=Verbosity.CLOSEST, max_edit_distance=min(1, distance))),
     ]
+    if not use_confusions:
+        tiers = tiers[1:]
 
-    ranked = sorted(
-        reranked_candidates,
-        key=lambda x: (x["distance"], -x["count"])  # קודם לפי מרחק מותאם, אח"כ לפי שכיחות
-    )
+    for name, lookup in tiers:
+        if not pending:
+            break
+        tier_words = [words[i] for i in pending]
+        escalated = []
+        for i, suggestions in zip(pending, rerank_lookups(tier_words, [lookup(word) for word in tier_words], top_k)):
+            if suggestions and suggestions[0]["distance"] <= max_cost:
+                results[i] = suggestions
+            else:
+                escalated.append(i)
+        if stats is not None:
+            stats[name] = stats.get(name, 0) + len(pending) - len(escalated)
+        pending = escalated
 
-    return ranked[:top_k]
+    if pending:
+        pending_words = [words[i] for i in pending]
+        candidate_lists = [
+            symspell.lookup(word, verbosity=Verbosity.ALL,
+                            max_edit_distance=min(1, distance) if len(word) <= short_word_length else distance)
+            for word in pending_words
+        ]
+        for i, suggestions in zip(pending, rerank_lookups(pending_words, candidate_lists, top_k)):
+            results[i] = suggestions
+
+    if stats is not None:
+        stats["tier2"] = stats.get("tier2", 0) + len(pending)
+        stats["unresolved"] = stats.get("unresolved", 0) + sum(1 for i in pending if not results[i])
+    return results
 
 
 from itertools import islice
 from typing import Iterable, List
 
+from app.utils.counting import SpillingCounter
+from app.utils.dictionary_updates import (
+    companion_paths, dictionary_lock, dictionary_snapshot, file_lock, read_counts, read_deltas, read_manifest,
+    save_full_build,
+)
+from app.utils.prefixes import PrefixModel, decompose_counts
+
 class SymSpellBuilder:
     """
     Build SymSpell dictionary efficiently:
@@ -210,6 +548,9 @@ class SymSpellBuilder:
         )
         self.max_edit_distance = max_edit_distance
         self.prefix_length = prefix_length
+        self.prefix_model: PrefixModel | None = None  # set by prefix-mode builds
+        self.surface_items: List[tuple[str, int]] | None = None  # pruned terms before folding (prefix mode)
+        self.checkpoint: "BuildCheckpoint | None" = None  # set by checkpointed builds until saved
 
     # ---------- helpers ----------
 
@@ -238,6 +579,75 @@ class SymSpellBuilder:
         print("Finished building counts from stream")
         return counts
 
+    @staticmethod
+    def build_counts_parallel(
+        loader: "CorpusLoader",
+        workers: int,
+        shard_bytes: int = 16 * 1024 * 1024,
+        counts=None,
+        checkpoint: "BuildCheckpoint | None" = None,
+        checkpoint_every: int = 10,
+        start_shard: int = 0,
+    ):
+        """
+        Count corpus tokens on a process pool: the corpus is split into byte-range
+        shards (CorpusLoader.shards), every worker tokenizes and counts its shard,
+        and the shard counts are merged in corpus order, so the result (including
+        the first-seen order of the terms) equals the serial
+        build_counts_from_stream(loader.load_tokens(...)).
+
+        Shard counts are merged into `counts` (a Counter or SpillingCounter;
+        a new Counter by default), which is returned. With a checkpoint, the
+        counts and the number of merged shards are saved every
+        `checkpoint_every` shards; start_shard skips the shards of a resumed
+        checkpoint.
+        """
+        counts = Counter() if counts is None else counts
+        shards = loader.shards(shard_bytes)
+        with multiprocessing.Pool(workers) as pool:
+            count = functools.partial(count_shard, reader_options=loader.reader_options())
+            for i, shard_counts in enumerate(pool.imap(count, shards[start_shard:]), start_shard):
+                counts.update(shard_counts)
+                loader._report("shards", file=shards[i][0], shards_done=i + 1, shards_total=len(shards))
+                if checkpoint is not None and checkpoint_every > 0 and (i + 1) % checkpoint_every == 0 \
+                        and i + 1 < len(shards):
+                    checkpoint.save(counts, {"shards": i + 1})
+        return counts
+
+    @staticmethod
+    def count_texts(
+        loader: "CorpusLoader",
+        tokenizer,
+        counts,
+        chunk_size: int = 10_000_000,
+        checkpoint: "BuildCheckpoint | None" = None,
+        checkpoint_every: int = 10,
+        start: tuple[int, int] = (0, 0),
+    ):
+        """
+        Serial counting of loader.load_texts(start) into `counts` (Counter or
+        SpillingCounter) by chunks of about `chunk_size` tokens.
+
+        With a checkpoint, the counts and the read position are saved every
+        `checkpoint_every` chunks. Chunks end on text boundaries, so the saved
+        position is exact.
+        """
+        texts = loader.load_texts(start)
+        chunk: list[str] = []
+        chunks = 0
+        for text in texts:
+            chunk.extend(tokenizer.iter_tokens(text))
+            if len(chunk) < chunk_size:
+                continue
+            counts.update(chunk)
+            chunk = []
+            chunks += 1
+            if checkpoint is not None and checkpoint_every > 0 and chunks % checkpoint_every == 0:
+                file_index, texts_read = loader.position
+                checkpoint.save(counts, {"file": file_index, "texts": texts_read})
+        counts.update(chunk)
+        return counts
+
     @staticmethod
     def prune_counts(counts: Counter, min_freq: int) -> List[tuple[str, int]]:
         """Filter rare tokens after full accumulation."""
@@ -245,6 +655,30 @@ class SymSpellBuilder:
             return list(counts.items())
         return [(w, c) for w, c in counts.items() if c >= min_freq]
 
+    @staticmethod
+    def prune_into(counts, min_freq: int, residual_path: str | None = None) -> List[tuple[str, int]]:
+        """
+        prune_counts for a Counter or SpillingCounter. With residual_path, the
+        pruned terms are written there as 'term count' lines, so incremental
+        updates can promote them later (see dictionary_updates).
+        """
+        if residual_path is None:
+            if isinstance(counts, SpillingCounter):
+                return counts.items(min_freq)
+            return SymSpellBuilder.prune_counts(counts, min_freq)
+
+        pathlib.Path(residual_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(residual_path, "w", encoding="utf-8") as f:
+            def write(term: str, count: int) -> None:
+                f.write(f"{term} {count}\n")
+
+            if isinstance(counts, SpillingCounter):
+                return counts.items(min_freq, pruned=write)
+            for term, count in counts.items():
+                if count < min_freq:
+                    write(term, count)
+            return SymSpellBuilder.prune_counts(counts, min_freq)
+
     # ---------- main API ----------
 
     def build_symspell_from_counts(self, items: List[tuple[str, int]]) -> None:
@@ -253,29 +687,144 @@ class SymSpellBuilder:
             # ב־symspellpy זה מצטבר אם המילה כבר קיימת
             self.sym_spell.create_dictionary_entry(word, freq)
 
+    def build_from_items(self, items: List[tuple[str, int]], strip_prefixes: bool = False) -> None:
+        """
+        Populate SymSpell from pruned (word, freq) pairs. With strip_prefixes,
+        prefixed forms are folded into their base words first (see prefixes.py)
+        and the prefix statistics are kept in self.prefix_model.
+        """
+        self.build_symspell_from_counts(self.fold_items(items, strip_prefixes))
+
+    def fold_items(self, items: List[tuple[str, int]], strip_prefixes: bool = False) -> List[tuple[str, int]]:
+        """
+        The pruned (word, freq) pairs as they go into the dictionary: with
+        strip_prefixes, prefixed forms folded into their base words and the
+        prefix statistics kept in self.prefix_model (the unfolded pairs are
+        kept in self.surface_items for dictionary updates, see save_full_build).
+        """
+        if strip_prefixes:
+            self.surface_items = items
+            items, self.prefix_model = decompose_counts(items)
+        return items
+
     def build_from_tokens(
         self,
         tokens: Iterable[str],
         flush_every: int = 10_000_000,
         min_freq: int = 1,
+        max_terms: int = 0,
+        strip_prefixes: bool = False,
     ) -> None:
-        """Full pipeline: counts -> prune -> symspell."""
-        counts = self.build_counts_from_stream(tokens, chunk_size=flush_every, max_chunks=10000)
-        items = self.prune_counts(counts, min_freq=min_freq)
-        self.build_symspell_from_counts(items)
+        """
+        Full pipeline: counts -> prune -> symspell.
+
+        With max_terms > 0 at most that many distinct tokens are counted in
+        memory; the rest is spilled to sorted runs on disk (SpillingCounter)
+        and merged exactly, so the dictionary is the same.
+        """
+        if max_terms > 0:
+            with SpillingCounter(max_terms) as counter:
+                for chunk in self.chunked(tokens, min(flush_every, max_terms)):
+                    counter.update(chunk)
+                items = counter.items(min_freq)
+        else:
+            counts = self.build_counts_from_stream(tokens, chunk_size=flush_every, max_chunks=10000)
+            items = self.prune_counts(counts, min_freq=min_freq)
+        self.build_from_items(items, strip_prefixes)
+
+    def build_from_corpus(
+        self,
+        loader: "CorpusLoader",
+        tokenizer,
+        min_freq: int = 1,
+        workers: int = 1,
+        max_terms: int = 0,
+        strip_prefixes: bool = False,
+        checkpoint_dir: str | None = None,
+        checkpoint_every: int = 10,
+        flush_every: int = 10_000_000,
+        shard_bytes: int = 16 * 1024 * 1024,
+        residual_path: str | None = None,
+    ) -> None:
+        """Build from a corpus directory (see count_corpus for the arguments)."""
+        items = self.count_corpus(loader, tokenizer, min_freq, workers, max_terms, checkpoint_dir, checkpoint_every,
+                                  flush_every, shard_bytes, residual_path)
+        self.build_from_items(items, strip_prefixes)
+
+    def count_corpus(
+        self,
+        loader: "CorpusLoader",
+        tokenizer,
+        min_freq: int = 1,
+        workers: int = 1,
+        max_terms: int = 0,
+        checkpoint_dir: str | None = None,
+        checkpoint_every: int = 10,
+        flush_every: int = 10_000_000,
+        shard_bytes: int = 16 * 1024 * 1024,
+        residual_path: str | None = None,
+    ) -> List[tuple[str, int]]:
+        """
+        Count a corpus directory and prune the counts to min_freq, counting on
+        `workers` processes when workers > 1.
+
+        With max_terms > 0 at most that many distinct tokens are counted in
+        memory (SpillingCounter). With checkpoint_dir, the partial counts and
+        the read position are saved there every `checkpoint_every` chunks of
+        `flush_every` tokens (serial) or shards (parallel), and a restarted
+        build resumes from the last checkpoint (see build_checkpoint);
+        save_dictionary() removes it. With residual_path, the terms below
+        min_freq are written there as 'term count' lines (see prune_into).
+
+        Returns:
+            Pruned (term, count) pairs in first-seen order
+        """
+        checkpoint = None
+        position = None
+        if checkpoint_dir is None:
+            counts = SpillingCounter(max_terms) if max_terms > 0 else Counter()
+        else:
+            from app.utils.build_checkpoint import BuildCheckpoint, corpus_fingerprint
+            if workers <= 1:
+                fingerprint = corpus_fingerprint(loader, mode="serial", spilling=max_terms > 0)
+            else:
+                fingerprint = corpus_fingerprint(loader, mode="parallel", shard_bytes=shard_bytes,
+                                                 spilling=max_terms > 0)
+            checkpoint = BuildCheckpoint(checkpoint_dir, fingerprint)
+            counts, position = checkpoint.resume(max_terms)
+
+        try:
+            if workers <= 1:
+                start = (position["file"], position["texts"]) if position else (0, 0)
+                chunk_size = min(flush_every, max_terms) if max_terms > 0 else flush_every
+                self.count_texts(loader, tokenizer, counts, chunk_size, checkpoint, checkpoint_every, start)
+            else:
+                self.build_counts_parallel(loader, workers, shard_bytes, counts, checkpoint, checkpoint_every,
+                                           start_shard=position["shards"] if position else 0)
+            items = self.prune_into(counts, min_freq, residual_path)
+        finally:
+            if isinstance(counts, SpillingCounter):
+                counts.close()  # a checkpoint's runs are kept until save_dictionary()
+        self.checkpoint = checkpoint
+        return items
 
     def get_spellchecker(self) -> SymSpell:
         """Return the built SymSpell object."""
         return self.sym_spell
 
     # ---------- I/O ----------
-    def save_dictionary(self, filepath: str) -> None:
+    def save_dictionary(self, filepath: str, items: Iterable[tuple[str, int]] | None = None) -> None:
         """
         Save as 'term count' (space-separated), compatible with
         sym_spell.load_dictionary(..., term_index=0, count_index=1).
+        The file is written to a temp file and moved over `filepath` atomically.
+        `items` ((term, count) pairs) are written instead of the SymSpell terms
+        by builds that never fill SymSpell (the trie term store).
         """
-        with open(filepath, "w", encoding="utf-8") as f:
-            for term, val in self.sym_spell.words.items():
+        pathlib.Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for term, val in (self.sym_spell.words.items() if items is None else items):
                 # val הוא בדרך כלל int; אם זו גירסה/פורק עם אובייקטים, ננסה .count
                 if isinstance(val, int):
                     freq = val
@@ -287,6 +836,14 @@ class SymSpellBuilder:
                 else:
                     raise TypeError(f"Unsupported value type for term {term!r}: {type(val)}")
                 f.write(f"{term} {freq}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        # Readers see the old or the new dictionary, never a partly written one
+        os.replace(tmp_path, filepath)
+        if self.checkpoint is not None:
+            # The dictionary now holds everything the build checkpoint counted
+            self.checkpoint.clear()
+            self.checkpoint = None
 
     def load(self, filepath: str, term_index: int = 0, count_index: int = 1, separator: str = " ") -> None:
         # אתחול נקי על בסיס הערכים ששמרנו
@@ -297,23 +854,430 @@ class SymSpellBuilder:
         if not ok:
             raise FileNotFoundError(f"Could not load dictionary from {filepath}")
 
+    def save_index(self, filepath: str, dictionary_path: str | None = None) -> None:
+        """
+        Save the term table and delete index as a binary index (see symspell_index).
+        `dictionary_path` is the dictionary file the terms were saved to or loaded from.
+        """
+        from app.utils.symspell_index import source_stamp, write_symspell_index
+        write_symspell_index(self.sym_spell, filepath, source_stamp(dictionary_path))
+
+    def load_index(self, filepath: str) -> None:
+        """Memory-map a binary index; nothing is parsed or regenerated."""
+        from app.utils.symspell_index import MappedSymSpell
+        sym_spell = MappedSymSpell(filepath)
+        if (sym_spell.index.max_edit_distance, sym_spell.index.prefix_length) != (self.max_edit_distance, self.prefix_length):
+            sym_spell.index.close()
+            raise ValueError(f"Index {filepath} was built with different SymSpell parameters")
+        self.sym_spell = sym_spell
+
+    def save_trie(self, filepath: str, dictionary_path: str | None = None) -> None:
+        """Save the terms and counts as a compact trie file (see term_trie and save_index)."""
+        from app.utils.symspell_index import source_stamp
+        from app.utils.term_trie import write_term_trie
+        write_term_trie(self.sym_spell.words, filepath, source_stamp(dictionary_path))
+
+    def load_trie(self, filepath: str) -> None:
+        """Memory-map a trie file; lookups search the trie instead of a delete index."""
+        from app.utils.term_trie import TrieSymSpell
+        self.sym_spell = TrieSymSpell(filepath, self.max_edit_distance)
+
+def count_shard(shard: tuple[str, int, int], reader_options: dict | None = None) -> Counter:
+    """Token counts of one corpus shard (runs in a worker process)."""
+    tokenizer = HebrewTokenizer()
+    texts = CorpusLoader.load_shard_texts(shard, **(reader_options or {}))
+    return Counter(token for text in texts for token in tokenizer.iter_tokens(text))
+
 class SpellChecker:
-    def __init__(self, symspell, tokenizer):
+    """
+    Corrects tokens with SymSpell + hebrew_rerank.
+
+    When only the best correction is asked for (top_k = 1), words already in
+    the dictionary with a count of at least `known_min_count` are returned as
+    they are without a SymSpell lookup (an exact match has weighted distance
+    0, so reranking would pick it anyway). With top_k > 1 known words are
+    looked up too, and come first at distance 0 followed by their other
+    suggestions (see _known_first). With a mapped index
+    and `use_bloom_filter`, unknown words are rejected by the index's Bloom
+    filter before the term table is probed (useful when the index pages are
+    not resident; with warm pages the exact probe is cheaper).
+
+    Corrections are kept in a bounded LRU cache keyed by (word, top_k), so a
+    word that was already corrected costs a dict lookup instead of a SymSpell
+    search. The cache is cleared whenever the dictionary is replaced.
+
+    With a `prefix_model` (prefix-mode dictionaries hold base forms only) a
+    word is also tried as prefix + base: the base is checked / corrected and
+    the prefix reattached, its count scaled by the prefix's corpus share.
+
+    With `tiered_lookup` unknown words are looked up with tiered_rerank_batch
+    (confusion variants and distance 1 / CLOSEST first, distance 2 / ALL only
+    when needed) instead of the full hebrew_rerank_batch. How many words each tier settled is counted
+    per request (the `stats` argument) and in total (tier_info()).
+
+    Lookups and dictionary changes (apply_delta, set_dictionary, reload) hold
+    the same lock, so a refresh never mutates the term and delete tables while
+    another thread reads them. Lookups are CPU-bound Python and run one at a
+    time under the GIL anyway, so the lock costs little; a batch ranked on the
+    worker pool releases it while the workers run (see lookup_words).
+    """
+
+    def __init__(self, symspell, tokenizer, cache_size: int = 50_000,
+                 dictionary_path: str | None = None, delta_seq: int = 0, known_min_count: int = 1,
+                 use_bloom_filter: bool = False, prefix_model: PrefixModel | None = None,
+                 tiered_lookup: bool = True, tier_max_cost: float = 1.0, short_word_length: int = 3,
+                 use_confusions: bool = True, index_path: str | None = None):
         self.symspell = symspell
         self.tokenizer = tokenizer
+        self.cache_size = cache_size
+        self.known_min_count = known_min_count
+        self.use_bloom_filter = use_bloom_filter
+        self.prefix_model = prefix_model
+        self.tiered_lookup = tiered_lookup
+        self.tier_max_cost = tier_max_cost
+        self.short_word_length = short_word_length
+        self.use_confusions = use_confusions
+        self.dictionary_path = dictionary_path
+        self.index_path = index_path
+        self.delta_seq = delta_seq  # last dictionary update (delta log entry) applied
+        self._cache: OrderedDict[tuple[str, int], tuple[str, list]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._dictionary_lock = threading.RLock()  # lookups vs dictionary changes
+        self._generation = 0  # bumped by every dictionary change
+        self._refresh_lock = threading.Lock()  # one refresh at a time
+        self._checked_at = time.monotonic()  # last delta seq check of refresh_if_stale
+        self._hits = 0
+        self._misses = 0
+        self._tier_counts: Counter = Counter()
+
+    # ---------- cache ----------
+
+    def _cache_get(self, key: tuple[str, int]):
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key: tuple[str, int], result: tuple[str, list]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def cache_info(self) -> dict:
+        """Cache statistics: hits, misses, current size and maximum size."""
+        with self._cache_lock:
+            return {"hits": self._hits, "misses": self._misses, "size": len(self._cache), "max_size": self.cache_size}
+
+    def tier_info(self) -> dict:
+        """Words settled by each lookup tier since startup (known, cached, confusion, tier1, tier2, unresolved)."""
+        with self._cache_lock:
+            return dict(self._tier_counts)
+
+    def _record_tiers(self, stats: dict) -> None:
+        with self._cache_lock:
+            self._tier_counts.update(stats)
+
+    def clear_cache(self) -> None:
+        """Drop all cached corrections and reset the statistics."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def set_dictionary(self, symspell) -> None:
+        """Replace the SymSpell dictionary; cached corrections are no longer valid."""
+        with self._dictionary_lock:
+            self.symspell = symspell
+            self._generation += 1
+        self.clear_cache()
+
+    def apply_delta(self, counts: dict[str, int]) -> None:
+        """
+        Add count increments for changed terms to the dictionary in place. Only
+        those terms (and, for new terms, their deletes) are touched.
+        """
+        with self._dictionary_lock:
+            for term, count in counts.items():
+                self.symspell.create_dictionary_entry(term, count)
+            self._generation += 1
+        self.clear_cache()
+
+    def refresh(self, up_to_seq: int | None = None) -> dict:
+        """
+        Apply the dictionary updates logged since this spellchecker was loaded
+        (see dictionary_updates.update_dictionary). If the dictionary was rebuilt
+        since then (dictionary_updates.save_full_build), it is reloaded instead.
+        With `up_to_seq`, only the updates up to that delta seq are applied (a
+        batch worker catching up with the server), and a later rebuild is not
+        reloaded.
 
-    def correct_word(self, word: str, top_k: int = 1000) -> str:
-        suggestions = hebrew_rerank(self.symspell, word, top_k)
-        if suggestions:
-            return suggestions[0]['term'],suggestions
-        return word,[]
+        Returns:
+            Dictionary with the number of applied updates, changed terms, the
+            current delta seq and whether the dictionary was reloaded
+        """
+        with self._refresh_lock:
+            return self._refresh(up_to_seq)
+
+    def _refresh(self, up_to_seq: int | None) -> dict:
+        applied, changed = 0, 0
+        if self.dictionary_path and pathlib.Path(self.dictionary_path).is_file():
+            with dictionary_lock(self.dictionary_path, shared=True):
+                base_seq = read_manifest(self.dictionary_path).get("base_seq", 0)
+                rebuilt = self.delta_seq < base_seq and (up_to_seq is None or up_to_seq >= base_seq)
+                deltas = [] if rebuilt else read_deltas(self.dictionary_path, self.delta_seq)
+            if up_to_seq is not None:
+                deltas = [(seq, counts) for seq, counts in deltas if seq <= up_to_seq]
+            if rebuilt:
+                self.reload()
+                return {"applied_updates": 0, "changed_terms": 0, "delta_seq": self.delta_seq, "reloaded": True}
+            for seq, counts in deltas:
+                with self._dictionary_lock:  # the delta seq moves with the terms (see lookup_words)
+                    self.apply_delta(counts)
+                    self.delta_seq = seq
+                applied += 1
+                changed += len(counts)
+        return {"applied_updates": applied, "changed_terms": changed, "delta_seq": self.delta_seq, "reloaded": False}
+
+    def reload(self) -> None:
+        """Replace the dictionary with a fresh load of dictionary_path (see load_spellchecker)."""
+        fresh = load_spellchecker(self.dictionary_path, index_path=self.index_path, build=False)
+        with self._dictionary_lock:
+            self.symspell = fresh.symspell
+            self.prefix_model = fresh.prefix_model
+            self.delta_seq = fresh.delta_seq
+            self._generation += 1
+        self.clear_cache()
+
+    def refresh_if_stale(self, interval: float) -> dict | None:
+        """
+        refresh() when `interval` seconds have passed since the last check and
+        the manifest has a newer delta seq; None when nothing was checked or
+        applied. Server workers call this on every request (see
+        get_spellchecker), so an update reaches all of them, not only the one
+        that served /spellcheck/refresh.
+        """
+        now = time.monotonic()
+        if interval <= 0 or now - self._checked_at < interval or not self.dictionary_path:
+            return None
+        self._checked_at = now
+        if read_manifest(self.dictionary_path)["delta_seq"] <= self.delta_seq:
+            return None
+        return self.refresh()
+
+    # ---------- correction ----------
+
+    def _base_count(self, word: str) -> int | None:
+        if self.use_bloom_filter and hasattr(self.symspell, "might_contain") and not self.symspell.might_contain(word):
+            return None
+        count = self.symspell.words.get(word)
+        if count is None or count < self.known_min_count:
+            return None
+        return count
+
+    def known_count(self, word: str) -> int | None:
+        """
+        Dictionary count of `word` if it is a known word above the threshold, else None.
+        In prefix mode a known base with a known prefix counts too (estimated count).
+        """
+        count = self._base_count(word)
+        if count is not None or self.prefix_model is None:
+            return count
+        for prefix, base in self.prefix_model.splits(word):
+            count = self._base_count(base)
+            if count is not None:
+                return max(1, round(count * self.prefix_model.weight(prefix)))
+        return None
+
+    def _rerank(self, words: list[str], top_k: int, stats: dict) -> list[list]:
+        if self.tiered_lookup:
+            return tiered_rerank_batch(self.symspell, words, top_k, self.tier_max_cost, self.short_word_length, stats,
+                                       self.use_confusions)
+        stats["full"] = stats.get("full", 0) + len(words)
+        return hebrew_rerank_batch(self.symspell, words, top_k)
+
+    def _rank_missing(self, words: list[str], top_k: int, stats: dict) -> list[list]:
+        """Reranked suggestions for each of `words` (not settled by the known-word check)."""
+        if self.prefix_model is None:
+            return self._rerank(words, top_k, stats)
+
+        splits = [[("", word)] + self.prefix_model.splits(word) for word in words]
+        bases = list(dict.fromkeys(base for word_splits in splits for _, base in word_splits))
+        base_suggestions = dict(zip(bases, self._rerank(bases, top_k, stats)))
+
+        results = []
+        for word_splits in splits:
+            candidates = []
+            for prefix, base in word_splits:
+                weight = self.prefix_model.weight(prefix)
+                for suggestion in base_suggestions[base]:
+                    candidates.append({
+                        "term": prefix + suggestion["term"],
+                        "distance": suggestion["distance"],
+                        "count": max(1, round(suggestion["count"] * weight)) if prefix else suggestion["count"],
+                    })
+            candidates.sort(key=lambda c: (c["distance"], -c["count"]))
+            ranked, seen = [], set()
+            for candidate in candidates:
+                if candidate["term"] not in seen:
+                    seen.add(candidate["term"])
+                    ranked.append(candidate)
+            results.append(ranked[:top_k])
+        return results
+
+    def correct_word(self, word: str, top_k: int = 1000, stats: dict | None = None) -> str:
+        stats = {} if stats is None else stats
+        with self._dictionary_lock:
+            result = self._correct_word(word, top_k, stats)
+        self._record_tiers(stats)
+        return result
+
+    @staticmethod
+    def _known_first(word: str, count: int, suggestions: list, top_k: int) -> list:
+        """A known word's suggestions: the word at distance 0, then the others, `top_k` in all."""
+        return ([{"term": word, "distance": 0, "count": count}]
+                + [suggestion for suggestion in suggestions if suggestion["term"] != word])[:top_k]
 
-    def correct_text(self, text: str) -> str:
-        norm = self.tokenizer.normalize(text)
-        tokens = self.tokenizer.tokenize(norm)
-        corrected_tokens = [self.correct_word(t)[0] for t in tokens]
+    def _correct_word(self, word: str, top_k: int, stats: dict):
+        count = self.known_count(word)
+        if count is not None:
+            stats["known"] = stats.get("known", 0) + 1
+            if top_k <= 1:
+                return word, [{"term": word, "distance": 0, "count": count}]
+
+        key = (word, top_k)
+        cached = self._cache_get(key)
+        if cached is not None:
+            stats["cached"] = stats.get("cached", 0) + 1
+            return cached
+        suggestions = self._rank_missing([word], top_k, stats)[0]
+        if count is not None:
+            suggestions = self._known_first(word, count, suggestions, top_k)
+        result = (suggestions[0]['term'], suggestions) if suggestions else (word, [])
+        self._cache_put(key, result)
+        return result
+
+    def correct_words(self, words: list[str], top_k: int = 1, stats: dict | None = None) -> list[str]:
+        """
+        Best correction for each word.
+
+        Repeated words are corrected once, known words and cached words are
+        not looked up, and the remaining words are reranked in a single batch.
+        If `stats` is given, the number of distinct words settled by each tier
+        is added to it.
+        """
+        results = self.lookup_words(words, top_k, stats)
+        return [results[word][0] for word in words]
+
+    def lookup_words(self, words: list[str], top_k: int = 1000, stats: dict | None = None, pool=None,
+                     chunk_size: int = 512) -> dict[str, tuple[str, list]]:
+        """
+        (correction, suggestions) for every distinct word, like correct_word.
+
+        With a `pool` (see get_batch_pool), words that need a lookup are
+        reranked on its worker processes in chunks of `chunk_size`, when there
+        is more than one chunk of them. The dictionary lock is not held while
+        the pool works, so a large batch does not hold up other requests or a
+        refresh: the words and the delta seq the workers catch up to are taken
+        under the lock, and the results are only cached if the dictionary did
+        not change in the meantime.
+        """
+        stats = {} if stats is None else stats
+        with self._dictionary_lock:
+            results, missing, known = self._settle_words(words, top_k, stats)
+            on_pool = pool is not None and len(missing) > chunk_size
+            if missing and not on_pool:
+                self._store_ranked(results, missing, known, self._rank_missing(missing, top_k, stats), top_k)
+            delta_seq, generation = self.delta_seq, self._generation
+
+        if on_pool:
+            try:
+                ranked = self._rank_on_pool(pool, missing, top_k, stats, chunk_size, delta_seq)
+            except BatchWorkerError as e:
+                print(f"⚠️  Warning: Batch pool unavailable ({e}); ranking in process")
+                close_batch_pool(failed=True)
+                ranked = None
+            with self._dictionary_lock:
+                if ranked is None:
+                    ranked, generation = self._rank_missing(missing, top_k, stats), self._generation
+                self._store_ranked(results, missing, known, ranked, top_k, cache=generation == self._generation)
+        self._record_tiers(stats)
+        return results
+
+    def _settle_words(self, words: list[str], top_k: int, stats: dict):
+        """
+        Known and cached results of the distinct `words`.
+
+        Returns:
+            Tuple of (results so far, words still to rank, word -> count of the
+            known words among them)
+        """
+        results: dict[str, tuple[str, list]] = {}
+        missing = []
+        known = {}
+        for word in dict.fromkeys(words):
+            count = self.known_count(word)
+            if count is not None:
+                stats["known"] = stats.get("known", 0) + 1
+                if top_k <= 1:
+                    results[word] = (word, [{"term": word, "distance": 0, "count": count}])
+                    continue
+                known[word] = count
+            cached = self._cache_get((word, top_k))
+            if cached is None:
+                missing.append(word)
+            else:
+                results[word] = cached
+                stats["cached"] = stats.get("cached", 0) + 1
+        return results, missing, known
+
+    def _store_ranked(self, results: dict, missing: list[str], known: dict, ranked: list[list], top_k: int,
+                      cache: bool = True) -> None:
+        """Add the ranked suggestions of `missing` to `results` (and to the cache)."""
+        for word, suggestions in zip(missing, ranked):
+            if word in known:
+                suggestions = self._known_first(word, known[word], suggestions, top_k)
+            result = (suggestions[0]['term'], suggestions) if suggestions else (word, [])
+            if cache:
+                self._cache_put((word, top_k), result)
+            results[word] = result
+
+    def _rank_on_pool(self, pool, words: list[str], top_k: int, stats: dict, chunk_size: int,
+                      delta_seq: int) -> list[list]:
+        """_rank_missing on the batch pool, in chunks of `chunk_size` words, at dictionary update `delta_seq`."""
+        ranked, pool_stats = [], {}
+        chunks = [(words[i:i + chunk_size], top_k, delta_seq) for i in range(0, len(words), chunk_size)]
+        for chunk_ranked, chunk_stats in pool.imap(rank_chunk, chunks):
+            ranked.extend(chunk_ranked)
+            for name, value in chunk_stats.items():
+                pool_stats[name] = pool_stats.get(name, 0) + value
+        for name, value in pool_stats.items():
+            stats[name] = stats.get(name, 0) + value
+        return ranked
+
+    def correct_text(self, text: str, stats: dict | None = None) -> str:
+        tokens = list(self.tokenizer.iter_tokens(text))
+        corrected_tokens = self.correct_words(tokens, stats=stats)
         return " ".join(corrected_tokens)
 
+    def correct_text_in_place(self, text: str, stats: dict | None = None) -> str:
+        """
+        Correct the Hebrew words of `text` (WORD_RE) where they stand; unlike
+        correct_text, punctuation, digits, Latin text and whitespace are kept.
+        """
+        words = [match.group() for match in WORD_RE.finditer(text)]
+        if not words:
+            return text
+        results = self.lookup_words(words, 1, stats)
+        return WORD_RE.sub(lambda match: results[match.group()][0], text)
+
 
 def spellchecker_test(spellchecker, filename: str):
     """
@@ -458,17 +1422,24 @@ def builder_spellcheck(load_from_file: bool = True):
     try:
         # 1. טוקניזציה
         tokenizer = HebrewTokenizer()
-        builder = SymSpellBuilder(2, 7)  # Default values
+        builder = SymSpellBuilder(settings.spellchecker_max_edit_distance, settings.spellchecker_prefix_length)
 
         if load_from_file:
-            builder.load("app/data/symspell/symspell.txt")
+            builder.load(settings.spellchecker_dictionary_path)
             print(f"Loaded dictionary with {len(builder.sym_spell.words):,} words")
         else:
-            # 2. Load corpus
-            tokens = loader.load_tokens(tokenizer)
-            # 3. Build dictionary
-            builder.build_from_tokens(tokens, flush_every=10000000, min_freq=5)
-            builder.save_dictionary("app/data/symspell/symspell.txt")
+            # 2+3. Count the corpus and build the dictionary
+            # A crashed build resumes from its checkpoint next to the dictionary
+            checkpoint_every = settings.spellchecker_build_checkpoint_every
+            dictionary_path = settings.spellchecker_dictionary_path
+            builder.build_from_corpus(loader, tokenizer, min_freq=settings.spellchecker_min_freq,
+                                      workers=settings.spellchecker_build_workers,
+                                      max_terms=settings.spellchecker_count_max_terms,
+                                      checkpoint_dir=f"{dictionary_path}.checkpoint"
+                                      if checkpoint_every > 0 else None,
+                                      checkpoint_every=checkpoint_every,
+                                      residual_path=str(companion_paths(dictionary_path)["build_residual"]))
+            save_full_build(builder, dictionary_path, loader.corpus_files())
 
         # 4. Create spellchecker
         spellchecker = SpellChecker(builder.get_spellchecker(), tokenizer)
@@ -484,18 +1455,382 @@ def builder_spellcheck(load_from_file: bool = True):
         return None
 
 
+def prefix_stats_path(dictionary_path: str) -> str:
+    """
+    Prefix statistics file of a dictionary: settings.spellchecker_prefix_stats_path
+    for the configured dictionary, the "prefixes" companion file
+    (symspell.prefixes.json, see dictionary_updates.companion_paths) for any other.
+    """
+    from app.config import settings
+
+    if os.path.abspath(dictionary_path) == os.path.abspath(settings.spellchecker_dictionary_path):
+        return settings.spellchecker_prefix_stats_path
+    return str(companion_paths(dictionary_path)["prefixes"])
+
+
+def index_source(index_path: str) -> tuple[int, int] | None:
+    """The source_stamp() in the header of a SymSpell index or term trie file; None for any other file."""
+    from app.utils import symspell_index, term_trie
+
+    with open(index_path, "rb") as f:
+        head = f.read(max(symspell_index.HEADER.size, term_trie.HEADER.size))
+    for module in (symspell_index, term_trie):
+        if head[:len(module.MAGIC)] == module.MAGIC and len(head) >= module.HEADER.size:
+            magic, version, *fields = module.HEADER.unpack_from(head)
+            return tuple(fields[-2:]) if version == module.VERSION else None
+    return None
+
+
+def index_is_current(index_path: str, dictionary_path: str) -> bool:
+    """
+    The binary index exists and was built from the dictionary file as it is
+    now: the file's size and mtime match the ones recorded in the index header.
+    Any index is current when there is no dictionary file.
+    """
+    from app.utils.symspell_index import source_stamp
+
+    if not pathlib.Path(index_path).is_file():
+        return False
+    if not pathlib.Path(dictionary_path).is_file():
+        return True
+    return index_source(index_path) == source_stamp(dictionary_path)
+
+
+def save_index_quietly(builder: SymSpellBuilder, index_path: str, dictionary_path: str | None = None) -> bool:
+    """Write the binary index for the next start; a failure only costs startup time. Returns True if written."""
+    try:
+        builder.save_index(index_path, dictionary_path)
+        return True
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Warning: Could not write spelling index to '{index_path}': {e}")
+        return False
+
+
+def load_spellchecker(
+    dictionary_path: str | None = None,
+    corpus_dir: str | None = None,
+    index_path: str | None = None,
+    build: bool = True,
+) -> SpellChecker:
+    """
+    Load a SpellChecker with the configured SymSpell parameters.
+
+    A binary index built from the dictionary file as it is now (see
+    index_is_current) is memory-mapped. Otherwise the dictionary file is loaded, or the dictionary
+    is built from the corpus directory and saved to the dictionary path; in
+    both cases the binary index is written and then mapped. Without either,
+    an empty dictionary is used (words are returned unchanged). In prefix mode
+    the prefix statistics written by the build are loaded as well.
+
+    Every worker process therefore serves from the same mapped file, whose
+    pages are shared through the page cache. Loading holds an exclusive lock
+    next to the index, so when several workers start together only the first
+    one builds the index and the others wait and map it.
+
+    With settings.spellchecker_term_store = "trie" the index is a term trie
+    file (see term_trie) instead: it is written from the dictionary when it is
+    missing or stale, and the spellchecker runs on the mapped trie.
+
+    Args:
+        dictionary_path: 'term count' dictionary file (default: settings.spellchecker_dictionary_path)
+        corpus_dir: Corpus directory (default: settings.spellchecker_corpus_dir)
+        index_path: Binary index file (default: settings.spellchecker_index_path, or
+            settings.spellchecker_trie_path with the trie term store)
+        build: Whether a missing dictionary may be built from the corpus directory
+
+    Returns:
+        SpellChecker instance
+    """
+    from app.config import settings
+
+    dictionary_path = dictionary_path or settings.spellchecker_dictionary_path
+    corpus_dir = corpus_dir or settings.spellchecker_corpus_dir
+
+    if not index_path:
+        index_path = settings.spellchecker_trie_path if settings.spellchecker_term_store == "trie" \
+            else settings.spellchecker_index_path
+
+    tokenizer = HebrewTokenizer()
+    builder = SymSpellBuilder(settings.spellchecker_max_edit_distance, settings.spellchecker_prefix_length)
+
+    # One process at a time fills the index: the first worker to start builds it, the others
+    # wait on the lock, then find it current and map the same file
+    has_source = pathlib.Path(dictionary_path).is_file() or (build and pathlib.Path(corpus_dir).is_dir())
+    index_guard = file_lock(f"{index_path}.lock") if has_source else nullcontext()
+    with dictionary_snapshot(dictionary_path) as delta_seq, index_guard:
+        load_dictionary_into(builder, tokenizer, dictionary_path, corpus_dir if build else None, index_path,
+                             settings.spellchecker_term_store)
+
+    prefix_model = None
+    if settings.spellchecker_prefix_mode:
+        prefix_path = prefix_stats_path(dictionary_path)
+        if pathlib.Path(prefix_path).is_file():
+            prefix_model = PrefixModel.load(prefix_path)
+        else:
+            prefix_model = builder.prefix_model
+        if prefix_model is None:
+            print(f"⚠️  Warning: Prefix mode is on but there are no prefix statistics at "
+                  f"'{prefix_path}'")
+
+    return SpellChecker(builder.get_spellchecker(), tokenizer, cache_size=settings.spellchecker_cache_size,
+                        dictionary_path=dictionary_path, delta_seq=delta_seq,
+                        known_min_count=settings.spellchecker_known_min_count,
+                        use_bloom_filter=settings.spellchecker_bloom_filter, prefix_model=prefix_model,
+                        tiered_lookup=settings.spellchecker_tiered_lookup,
+                        tier_max_cost=settings.spellchecker_tier_max_cost,
+                        short_word_length=settings.spellchecker_short_word_length,
+                        use_confusions=settings.spellchecker_confusion_candidates, index_path=index_path)
+
+
+def load_dictionary_into(builder: SymSpellBuilder, tokenizer, dictionary_path: str, corpus_dir: str | None,
+                         index_path: str, term_store: str = "symspell") -> None:
+    """
+    Fill `builder` from the binary index, the dictionary file or the corpus
+    (see load_spellchecker); corpus_dir None never builds.
+    """
+    from app.config import settings
+    from app.utils.symspell_index import source_stamp
+    from app.utils.term_trie import write_term_trie
+
+    trie = term_store == "trie"
+    if index_is_current(index_path, dictionary_path):
+        try:
+            if trie:
+                builder.load_trie(index_path)
+            else:
+                builder.load_index(index_path)
+            print(f"✅ Mapped spelling index with {len(builder.sym_spell.words):,} words from {index_path}")
+            return
+        except ValueError as e:
+            print(f"⚠️  Warning: {e}; loading the text dictionary instead")
+
+    if pathlib.Path(dictionary_path).is_file() and trie:
+        # The trie is written straight from the counts; no delete index is generated
+        write_term_trie(read_counts(pathlib.Path(dictionary_path)), index_path, source_stamp(dictionary_path))
+        builder.load_trie(index_path)
+        print(f"✅ Loaded spelling dictionary with {len(builder.sym_spell.words):,} words from {dictionary_path} "
+              f"into {index_path}")
+    elif pathlib.Path(dictionary_path).is_file():
+        builder.load(dictionary_path)
+        print(f"✅ Loaded spelling dictionary with {len(builder.sym_spell.words):,} words from {dictionary_path}")
+        if save_index_quietly(builder, index_path, dictionary_path):
+            builder.load_index(index_path)  # use the shared mapped pages instead of a private copy
+    elif corpus_dir is not None and pathlib.Path(corpus_dir).is_dir():
+        loader = CorpusLoader(corpus_dir)
+        # A build killed halfway resumes from its checkpoint next to the dictionary
+        checkpoint_every = settings.spellchecker_build_checkpoint_every
+        items = builder.count_corpus(loader, tokenizer, min_freq=settings.spellchecker_min_freq,
+                                     workers=settings.spellchecker_build_workers,
+                                     max_terms=settings.spellchecker_count_max_terms,
+                                     checkpoint_dir=f"{dictionary_path}.checkpoint" if checkpoint_every > 0 else None,
+                                     checkpoint_every=checkpoint_every,
+                                     residual_path=str(companion_paths(dictionary_path)["build_residual"]))
+        items = builder.fold_items(items, settings.spellchecker_prefix_mode)
+        if trie:
+            # The trie is written straight from the counts; no delete index is generated
+            save_full_build(builder, dictionary_path, loader.corpus_files(), items)
+            write_term_trie(dict(items), index_path, source_stamp(dictionary_path))
+            builder.load_trie(index_path)
+        else:
+            builder.build_symspell_from_counts(items)
+            save_full_build(builder, dictionary_path, loader.corpus_files())
+            if save_index_quietly(builder, index_path, dictionary_path):
+                builder.load_index(index_path)
+        if builder.prefix_model is not None:
+            builder.prefix_model.save(prefix_stats_path(dictionary_path))
+        print(f"✅ Built spelling dictionary with {len(builder.sym_spell.words):,} words from {corpus_dir}")
+    elif corpus_dir is None:
+        print(f"❌ Error: No spelling dictionary at '{dictionary_path}' or index at '{index_path}'. "
+              "Build them with `python -m app.cli build-dictionary` (or `build-index` for an existing "
+              "dictionary); until then spellcheck returns words unchanged.")
+    else:
+        print(f"⚠️  Warning: No spelling dictionary at '{dictionary_path}' and no corpus at '{corpus_dir}'. "
+              "Spellcheck will return words unchanged.")
+
+
+class BatchWorkerError(RuntimeError):
+    """A batch pool worker could not load the server's dictionary."""
+
+
+# Spellchecker of a batch pool worker process (see get_batch_pool), or why it could not be loaded
+_worker_spellchecker: SpellChecker | None = None
+_worker_error: str | None = None
+
+
+def init_batch_worker(dictionary_path: str | None, index_path: str | None) -> None:
+    """
+    Pool initializer: map the server's dictionary once per worker.
+
+    Nothing is built from the corpus. The initializer never raises, because
+    Pool replaces a worker whose initializer fails forever and imap() never
+    returns; the error is reported by rank_chunk instead.
+    """
+    global _worker_spellchecker, _worker_error
+    try:
+        if not any(path and pathlib.Path(path).is_file() for path in (dictionary_path, index_path)):
+            raise FileNotFoundError(f"No spelling dictionary at '{dictionary_path}' or index at '{index_path}'")
+        _worker_spellchecker = load_spellchecker(dictionary_path, index_path=index_path, build=False)
+    except Exception as e:
+        _worker_error = f"{type(e).__name__}: {e}"
+
+
+def rank_chunk(args: tuple[list[str], int, int]) -> tuple[list[list], dict]:
+    """
+    Rerank a chunk of unknown words in a batch worker; returns the suggestions
+    and tier stats. The worker first applies the dictionary updates the server
+    has applied (up to its delta_seq) and it has not.
+
+    Raises:
+        BatchWorkerError: If the worker could not load the dictionary
+    """
+    words, top_k, delta_seq = args
+    if _worker_spellchecker is None:
+        raise BatchWorkerError(_worker_error or "batch worker has no spellchecker")
+    if _worker_spellchecker.delta_seq < delta_seq:
+        _worker_spellchecker.refresh(up_to_seq=delta_seq)
+    stats = {}
+    return _worker_spellchecker._rank_missing(words, top_k, stats), stats
+
+
+_batch_pool = None
+_batch_pool_paths: tuple[str | None, str | None] | None = None
+_batch_pool_failed = False
+_batch_pool_lock = threading.Lock()
+
+
+def get_batch_pool(spellchecker: SpellChecker):
+    """
+    Process pool for batch spellchecking, started on first use with
+    settings.spellchecker_batch_workers processes; None when that is below 2
+    or after the workers failed to load (see close_batch_pool). Workers are
+    spawned (not forked from the server's threads) and each one maps the
+    dictionary and index files `spellchecker` was loaded from.
+    """
+    global _batch_pool, _batch_pool_paths
+    from app.config import settings
+
+    if settings.spellchecker_batch_workers < 2 or _batch_pool_failed:
+        return None
+    paths = (spellchecker.dictionary_path, spellchecker.index_path)
+    with _batch_pool_lock:
+        if _batch_pool is not None and _batch_pool_paths != paths:
+            _batch_pool.close()
+            _batch_pool.join()
+            _batch_pool = None
+        if _batch_pool is None:
+            context = multiprocessing.get_context("spawn")
+            _batch_pool = context.Pool(settings.spellchecker_batch_workers, initializer=init_batch_worker,
+                                       initargs=paths)
+            _batch_pool_paths = paths
+        return _batch_pool
+
+
+def close_batch_pool(failed: bool = False) -> None:
+    """Stop the batch pool; with `failed`, batches are ranked in process from then on."""
+    global _batch_pool, _batch_pool_failed
+    with _batch_pool_lock:
+        _batch_pool_failed = _batch_pool_failed or failed
+        if _batch_pool is not None:
+            if failed:
+                _batch_pool.terminate()
+            else:
+                _batch_pool.close()
+            _batch_pool.join()
+            _batch_pool = None
+
+
+def correct_batch(texts: list[str], top_k: int = 0, stats: dict | None = None) -> list[dict]:
+    """
+    Spellcheck many texts at once.
+
+    Tokens are deduplicated across the whole batch, resolved once (on the
+    batch pool when one is configured) and the texts are reassembled in order.
+
+    Args:
+        texts: Texts to spellcheck
+        top_k: Suggestions returned per distinct token of each text (0 = corrections only)
+        stats: Optional dict the tier statistics are added to
+
+    Returns:
+        One {"input", "output"} dictionary per text, plus "suggestions"
+        (token -> suggestions) when top_k > 0
+    """
+    from app.config import settings
+
+    spellchecker = get_spellchecker()
+    token_lists = [list(spellchecker.tokenizer.iter_tokens(text)) for text in texts]
+    results = spellchecker.lookup_words(
+        [token for tokens in token_lists for token in tokens], max(top_k, 1), stats,
+        pool=get_batch_pool(spellchecker), chunk_size=settings.spellchecker_batch_chunk_size,
+    )
+
+    batch = []
+    for text, tokens in zip(texts, token_lists):
+        item = {"input": text, "output": " ".join(results[token][0] for token in tokens)}
+        if top_k > 0:
+            item["suggestions"] = {token: results[token][1][:top_k] for token in dict.fromkeys(tokens)}
+        batch.append(item)
+    return batch
+
+
+# Shared spellchecker, loaded once at app startup (see app.main)
+_spellchecker: SpellChecker | None = None
+_spellchecker_lock = threading.Lock()
+
+
+def init_spellchecker(dictionary_path: str | None = None, index_path: str | None = None) -> SpellChecker:
+    """
+    Load the shared spellchecker from the prebuilt dictionary or index,
+    replacing any previous one. Nothing is built from the corpus: a server
+    start never spends hours counting it (see the build-dictionary and
+    build-index commands). Without either file spellcheck returns words unchanged.
+    """
+    global _spellchecker
+    spellchecker = load_spellchecker(dictionary_path, index_path=index_path, build=False)
+    with _spellchecker_lock:
+        _spellchecker = spellchecker
+    return spellchecker
+
+
+def get_spellchecker() -> SpellChecker:
+    """
+    Return the shared spellchecker.
+
+    It is loaded at app startup; processes that skip the startup hook (scripts,
+    tests) load it here on first use, from the prebuilt files like
+    init_spellchecker. Every settings.spellchecker_refresh_interval
+    seconds it picks up dictionary updates (see SpellChecker.refresh_if_stale).
+    """
+    from app.config import settings
+
+    global _spellchecker
+    if _spellchecker is None:
+        with _spellchecker_lock:
+            if _spellchecker is None:
+                _spellchecker = load_spellchecker(build=False)
+    _spellchecker.refresh_if_stale(settings.spellchecker_refresh_interval)
+    return _spellchecker
+
+
 def spellcheck(text: str) -> str:
     """
-    Basic spellcheck function that can work without external dependencies.
+    Spellcheck Hebrew text with the shared SymSpell spellchecker.
     
     Args:
         text: Hebrew text to spellcheck
         
     Returns:
-        Spellchecked text (currently a placeholder)
+        Corrected Hebrew tokens joined by spaces
+    """
+    return get_spellchecker().correct_text(text)
+
+
+def spellcheck_in_place(text: str) -> str:
+    """
+    Spellcheck the Hebrew words of text with the shared spellchecker, keeping
+    everything around them (see SpellChecker.correct_text_in_place).
     """
-    # Placeholder — future: AlephBERT / HSpell
-    return text + " [spellchecked]"
+    return get_spellchecker().correct_text_in_place(text)
 
 
 # Only run if this file is executed directly
@@ -0,0 +1,374 @@
+"""
+Prebuilt binary SymSpell index, memory-mapped at startup.
+
+SymSpell.load_dictionary re-parses the text dictionary and regenerates every
+delete variant on every start. The index file stores the finished structures
+instead:
+
+- the term table: UTF-8 terms in dictionary order with an offset table and
+  their counts
+- the delete index: UTF-8 delete strings with an offset table, and for every
+  delete the ids of the terms it came from (in SymSpell's insertion order)
+- one open-addressing hash table (zlib.crc32, linear probing) per table, so a
+  key is found with one or two probes
+- a blocked Bloom filter over the terms (all bits of a key in one 64-byte
+  block), so unknown words are rejected without touching the term pages
+
+All sections are flat native arrays, so the file is mapped read-only and used
+in place: opening it costs no parsing, and every worker process that maps the
+same file shares its pages through the OS page cache.
+
+MappedSymSpell is a SymSpell whose `_words` / `_deletes` are Mapping views
+over the index, so SymSpell.lookup runs unchanged and returns exactly what the
+in-memory dictionary returns. Incremental updates go to in-memory overlays.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from collections.abc import Mapping
+
+from symspellpy import SymSpell, helpers
+
+MAGIC = b"HNSYMIDX"
+VERSION = 3
+BYTE_ORDER_MARK = 0x01020304
+EMPTY_SLOT = 0xFFFFFFFF
+
+# magic, version, byte order mark, max edit distance, prefix length, max length, terms, deletes,
+# size and mtime (ns) of the dictionary file the index was built from (see source_stamp)
+HEADER = struct.Struct("=8sIIIIIIIQQ")
+# (offset, size) for every section, in SECTIONS order
+SECTIONS = (
+    ("term_offsets", "I"),
+    ("term_blob", "B"),
+    ("term_counts", "q"),
+    ("term_slots", "I"),
+    ("delete_offsets", "I"),
+    ("delete_blob", "B"),
+    ("posting_offsets", "I"),
+    ("postings", "I"),
+    ("delete_slots", "I"),
+    ("bloom", "B"),
+)
+
+
+def _hash_slots(keys: list[bytes]) -> array:
+    """Open-addressing table (power-of-two size, load <= 0.5) of key ids, EMPTY_SLOT when free."""
+    size = 1
+    while size < 2 * len(keys):
+        size *= 2
+    mask = size - 1
+    slots = array("I", [EMPTY_SLOT]) * size
+    for key_id, key in enumerate(keys):
+        slot = zlib.crc32(key) & mask
+        while slots[slot] != EMPTY_SLOT:
+            slot = (slot + 1) & mask
+        slots[slot] = key_id
+    return slots
+
+
+BLOOM_BLOCK_BYTES = 64
+BLOOM_HASHES = 7
+BLOOM_BITS_PER_KEY = 10
+
+
+def _bloom_key(key: bytes, blocks: int) -> tuple[int, int]:
+    """(block index, bit mask within the block) of a key: 64 hash bits pick the block, 7 x 9 bits the bits."""
+    digest = int.from_bytes(hashlib.blake2b(key, digest_size=16).digest(), "little")
+    mask = 0
+    bits = digest >> 64
+    for _ in range(BLOOM_HASHES):
+        mask |= 1 << (bits & 511)
+        bits >>= 9
+    return (digest & 0xFFFFFFFFFFFFFFFF) % blocks, mask
+
+
+def _bloom_filter(keys: list[bytes]) -> bytes:
+    """Blocked Bloom filter (~1% false positives at 10 bits per key)."""
+    blocks = max(1, -(-len(keys) * BLOOM_BITS_PER_KEY // (BLOOM_BLOCK_BYTES * 8)))
+    values = [0] * blocks
+    for key in keys:
+        block, mask = _bloom_key(key, blocks)
+        values[block] |= mask
+    return b"".join(value.to_bytes(BLOOM_BLOCK_BYTES, "little") for value in values)
+
+
+def _offsets(blobs: list[bytes]) -> tuple[array, bytes]:
+    """Concatenate byte strings into one blob plus an offsets table (len(blobs) + 1 entries)."""
+    offsets = array("I", [0])
+    total = 0
+    for blob in blobs:
+        total += len(blob)
+        offsets.append(total)
+    return offsets, b"".join(blobs)
+
+
+def write_symspell_index(symspell: SymSpell, filepath: str, source: tuple[int, int] = (0, 0)) -> None:
+    """
+    Write the term table and delete index of a built SymSpell to `filepath`.
+
+    The file is written next to the target and renamed into place, so readers
+    never map a half-written index. `source` is the source_stamp() of the
+    dictionary file the SymSpell was loaded from, kept in the header so a
+    loader can tell whether the index still matches that file.
+
+    Raises:
+        ValueError: If a section does not fit the 32-bit offset tables
+    """
+    terms = list(symspell._words)
+    term_ids = {term: i for i, term in enumerate(terms)}
+    encoded_terms = [term.encode("utf-8") for term in terms]
+    term_offsets, term_blob = _offsets(encoded_terms)
+    term_counts = array("q", symspell._words.values())
+
+    deletes = [delete for delete, suggestions in symspell._deletes.items() if suggestions]
+    encoded_deletes = [delete.encode("utf-8") for delete in deletes]
+    delete_offsets, delete_blob = _offsets(encoded_deletes)
+    posting_offsets = array("I", [0])
+    postings = array("I")
+    for delete in deletes:
+        postings.extend(term_ids[term] for term in symspell._deletes[delete])
+        posting_offsets.append(len(postings))
+
+    if max(len(term_blob), len(delete_blob), len(postings)) >= EMPTY_SLOT:
+        raise ValueError("Dictionary too large for the 32-bit index format")
+
+    sections = {
+        "term_offsets": term_offsets.tobytes(),
+        "term_blob": term_blob,
+        "term_counts": term_counts.tobytes(),
+        "term_slots": _hash_slots(encoded_terms).tobytes(),
+        "delete_offsets": delete_offsets.tobytes(),
+        "delete_blob": delete_blob,
+        "posting_offsets": posting_offsets.tobytes(),
+        "postings": postings.tobytes(),
+        "delete_slots": _hash_slots(encoded_deletes).tobytes(),
+        "bloom": _bloom_filter(encoded_terms),
+    }
+
+    header = HEADER.pack(
+        MAGIC, VERSION, BYTE_ORDER_MARK,
+        symspell._max_dictionary_edit_distance, symspell._prefix_length, symspell._max_length,
+        len(terms), len(deletes), *source,
+    )
+    write_sections(filepath, header, [sections[name] for name, _ in SECTIONS])
+
+
+def source_stamp(dictionary_path) -> tuple[int, int]:
+    """(size, mtime in ns) of the dictionary file an index is built from; (0, 0) if there is none."""
+    try:
+        stat = os.stat(dictionary_path)
+    except (OSError, TypeError):
+        return 0, 0
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_sections(filepath: str, header: bytes, sections: list[bytes]) -> None:
+    """
+    Write `header`, a table of (offset, size) pairs and the 8-byte aligned
+    sections to a temporary file, then rename it to `filepath`.
+    """
+    table_size = struct.calcsize("=" + "QQ" * len(sections))
+    position = len(header) + table_size
+    table = []
+    for section in sections:
+        position += -position % 8  # keep every array 8-byte aligned
+        table.extend((position, len(section)))
+        position += len(section)
+
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(struct.pack("=" + "QQ" * len(sections), *table))
+        for section, offset in zip(sections, table[::2]):
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, filepath)
+
+
+def map_sections(buffer: memoryview, offset: int, spec: tuple[tuple[str, str], ...]) -> dict[str, memoryview]:
+    """Typed memoryviews of the sections written by write_sections, by name (`spec` is (name, format) pairs)."""
+    table = struct.unpack_from("=" + "QQ" * len(spec), buffer, offset)
+    return {name: buffer[start:start + size].cast(fmt) for (name, fmt), start, size in zip(spec, table[::2], table[1::2])}
+
+
+class SymSpellIndex:
+    """Read-only view of an index file; arrays are memoryviews over the mapping."""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        with open(filepath, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        magic, version, byte_order, *params = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filepath} is not a SymSpell index (version {VERSION})")
+        if byte_order != BYTE_ORDER_MARK:
+            raise ValueError(f"{filepath} was written on a machine with a different byte order")
+        (self.max_edit_distance, self.prefix_length, self.max_length,
+         self.term_count, self.delete_count, *self.source) = params
+        self.source = tuple(self.source)
+
+        for name, view in map_sections(buffer, HEADER.size, SECTIONS).items():
+            setattr(self, name, view)
+        self._buffer = buffer
+
+    def _find(self, key: bytes, slots, offsets, blob) -> int:
+        mask = len(slots) - 1
+        if mask < 0:
+            return -1
+        slot = zlib.crc32(key) & mask
+        while True:
+            key_id = slots[slot]
+            if key_id == EMPTY_SLOT:
+                return -1
+            if blob[offsets[key_id]:offsets[key_id + 1]] == key:
+                return key_id
+            slot = (slot + 1) & mask
+
+    def find_term(self, term: str) -> int:
+        """Id of `term`, or -1."""
+        return self._find(term.encode("utf-8"), self.term_slots, self.term_offsets, self.term_blob)
+
+    def find_delete(self, delete: str) -> int:
+        """Id of the delete string, or -1."""
+        return self._find(delete.encode("utf-8"), self.delete_slots, self.delete_offsets, self.delete_blob)
+
+    def might_contain(self, term: str) -> bool:
+        """False if `term` is certainly not in the term table (Bloom filter, one block read)."""
+        blocks = len(self.bloom) // BLOOM_BLOCK_BYTES
+        block, mask = _bloom_key(term.encode("utf-8"), blocks)
+        start = block * BLOOM_BLOCK_BYTES
+        return int.from_bytes(self.bloom[start:start + BLOOM_BLOCK_BYTES], "little") & mask == mask
+
+    def term(self, term_id: int) -> str:
+        return str(self.term_blob[self.term_offsets[term_id]:self.term_offsets[term_id + 1]], "utf-8")
+
+    def delete(self, delete_id: int) -> str:
+        return str(self.delete_blob[self.delete_offsets[delete_id]:self.delete_offsets[delete_id + 1]], "utf-8")
+
+    def suggestions(self, delete_id: int) -> list[str]:
+        """Terms a delete string was generated from, in dictionary insertion order."""
+        start, end = self.posting_offsets[delete_id], self.posting_offsets[delete_id + 1]
+        return [self.term(term_id) for term_id in self.postings[start:end]]
+
+    def close(self) -> None:
+        for name, _ in SECTIONS:
+            getattr(self, name).release()
+        self._buffer.release()
+        self._mmap.close()
+
+
+class IndexedWords(Mapping):
+    """
+    term -> count view used as SymSpell._words. Updated counts and new terms
+    live in an in-memory overlay; the mapped file is never written.
+    """
+
+    def __init__(self, index: SymSpellIndex):
+        self.index = index
+        self.overlay: dict[str, int] = {}
+        self.new_terms: list[str] = []
+
+    def __getitem__(self, term: str) -> int:
+        count = self.overlay.get(term)
+        if count is not None:
+            return count
+        term_id = self.index.find_term(term)
+        if term_id < 0:
+            raise KeyError(term)
+        return self.index.term_counts[term_id]
+
+    def __contains__(self, term) -> bool:
+        return isinstance(term, str) and (term in self.overlay or self.index.find_term(term) >= 0)
+
+    def __iter__(self):
+        yield from (self.index.term(i) for i in range(self.index.term_count))
+        yield from self.new_terms
+
+    def __len__(self) -> int:
+        return self.index.term_count + len(self.new_terms)
+
+    def set(self, term: str, count: int) -> None:
+        if term not in self:
+            self.new_terms.append(term)
+        self.overlay[term] = count
+
+
+class IndexedDeletes(Mapping):
+    """delete -> [terms] view used as SymSpell._deletes, with a copy-on-write overlay."""
+
+    def __init__(self, index: SymSpellIndex):
+        self.index = index
+        self.overlay: dict[str, list[str]] = {}
+
+    def __getitem__(self, delete: str) -> list[str]:
+        suggestions = self.overlay.get(delete)
+        if suggestions is not None:
+            return suggestions
+        delete_id = self.index.find_delete(delete)
+        if delete_id < 0:
+            raise KeyError(delete)
+        return self.index.suggestions(delete_id)
+
+    def __contains__(self, delete) -> bool:
+        return isinstance(delete, str) and (delete in self.overlay or self.index.find_delete(delete) >= 0)
+
+    def __iter__(self):
+        yield from (self.index.delete(i) for i in range(self.index.delete_count))
+        yield from (delete for delete in self.overlay if self.index.find_delete(delete) < 0)
+
+    def __len__(self) -> int:
+        return self.index.delete_count + sum(1 for delete in self.overlay if self.index.find_delete(delete) < 0)
+
+    def append(self, delete: str, term: str) -> None:
+        suggestions = self.overlay.get(delete)
+        if suggestions is None:
+            suggestions = self.overlay[delete] = list(self.get(delete, []))
+        suggestions.append(term)
+
+
+class MappedSymSpell(SymSpell):
+    """
+    SymSpell served from a memory-mapped index. Lookups behave exactly like the
+    in-memory SymSpell the index was written from.
+
+    create_dictionary_entry works as in SymSpell (used for incremental
+    dictionary updates): changed counts, new terms and the delete lists they
+    touch are copied into in-memory overlays. Deleting entries is not supported.
+    """
+
+    def __init__(self, filepath: str):
+        index = SymSpellIndex(filepath)
+        super().__init__(max_dictionary_edit_distance=index.max_edit_distance, prefix_length=index.prefix_length)
+        self.index = index
+        self._words = IndexedWords(index)
+        self._deletes = IndexedDeletes(index)
+        self._max_length = index.max_length
+
+    def might_contain(self, term: str) -> bool:
+        """False if `term` is certainly not in the dictionary; entries added since loading count as present."""
+        return term in self._words.overlay or self.index.might_contain(term)
+
+    def create_dictionary_entry(self, key: str, count: int) -> bool:
+        if count <= 0:
+            return False
+        if key in self._words:
+            self._words.set(key, helpers.increment_count(count, self._words[key]))
+            return False
+
+        self._words.set(key, count)
+        if len(key) > self._max_length:
+            self._max_length = len(key)
+        for delete in self._edits_prefix(key):
+            self._deletes.append(delete, key)
+        return True
+
+    def delete_dictionary_entry(self, key: str) -> bool:
+        raise TypeError("MappedSymSpell does not support deleting entries; rebuild the index instead")
@@ -0,0 +1,299 @@
+"""
+Compact memory-mapped trie term store for the spelling dictionary.
+
+A SymSpell dictionary keeps every term as a str key of a dict plus its delete
+variants, well over 100 bytes per term and several times that with the delete
+index. The trie file stores the terms as a character trie in three flat
+arrays, in breadth-first node order:
+
+- first_child: id of the first child of every node (plus one trailing entry),
+  so the children of node i are first_child[i] .. first_child[i + 1] - 1
+- labels: the character (UTF-16 code unit) on the edge into every node;
+  siblings are sorted, so a child is found by binary search
+- counts: the term count of every node, 0 for nodes that end no term
+
+That is 14 bytes per node and shared prefixes are stored once. The file is
+mapped read-only like the SymSpell index (see symspell_index), so it costs no
+parsing and its pages are shared between worker processes.
+
+TermTrie supports exact lookup, prefix iteration and a bounded optimal string
+alignment (Damerau) distance search that walks the trie with one DP row per
+node and prunes subtrees that cannot come back within the distance.
+TrieSymSpell wraps it in the part of the SymSpell interface SpellChecker uses
+(`words`, `lookup`, `create_dictionary_entry`), so a SpellChecker runs on it
+unchanged. Lookups are slower than SymSpell's delete index but need no
+delete index in memory.
+"""
+
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Mapping
+from typing import Iterator
+
+from symspellpy import Verbosity
+from symspellpy.editdistance import DistanceAlgorithm, EditDistance
+from symspellpy.suggest_item import SuggestItem
+
+from app.utils.symspell_index import BYTE_ORDER_MARK, map_sections, write_sections
+
+MAGIC = b"HNTRIE\0\0"
+VERSION = 2
+
+# magic, version, byte order mark, nodes, terms, max term length,
+# size and mtime (ns) of the source dictionary file (see symspell_index.source_stamp)
+HEADER = struct.Struct("=8sIIIIIQQ")
+SECTIONS = (
+    ("first_child", "I"),
+    ("labels", "H"),
+    ("counts", "q"),
+)
+
+
+def write_term_trie(words: Mapping[str, int], filepath: str, source: tuple[int, int] = (0, 0)) -> None:
+    """
+    Write the terms and counts of `words` (e.g. SymSpell.words) as a trie file.
+    `source` is the source_stamp() of the dictionary file the terms came from.
+
+    Raises:
+        ValueError: If a term has a character outside the Basic Multilingual Plane
+    """
+    terms = sorted(words)
+    first_child = array("I")
+    labels = array("H", [0])
+    counts = array("q", [words[""] if "" in words else 0])
+
+    # Every queued node covers the sorted terms that share its prefix
+    queue = deque([(0, len(terms), 0)])
+    while queue:
+        lo, hi, depth = queue.popleft()
+        first_child.append(len(labels))
+        if lo < hi and len(terms[lo]) == depth:
+            lo += 1  # the node's own term sorts first
+        while lo < hi:
+            char = terms[lo][depth]
+            end = lo + 1
+            while end < hi and terms[end][depth] == char:
+                end += 1
+            if ord(char) > 0xFFFF:
+                raise ValueError(f"Term {terms[lo]!r} has a character outside the Basic Multilingual Plane")
+            labels.append(ord(char))
+            counts.append(words[terms[lo]] if len(terms[lo]) == depth + 1 else 0)
+            queue.append((lo, end, depth + 1))
+            lo = end
+    first_child.append(len(labels))
+
+    header = HEADER.pack(MAGIC, VERSION, BYTE_ORDER_MARK, len(labels), len(terms),
+                         max(map(len, terms), default=0), *source)
+    write_sections(filepath, header, [first_child.tobytes(), labels.tobytes(), counts.tobytes()])
+
+
+class TermTrie:
+    """Read-only view of a trie file; arrays are memoryviews over the mapping."""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        with open(filepath, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self._mmap)
+
+        (magic, version, byte_order, self.node_count, self.term_count, self.max_length,
+         *source) = HEADER.unpack_from(buffer, 0)
+        self.source = tuple(source)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filepath} is not a term trie (version {VERSION})")
+        if byte_order != BYTE_ORDER_MARK:
+            raise ValueError(f"{filepath} was written on a machine with a different byte order")
+
+        for name, view in map_sections(buffer, HEADER.size, SECTIONS).items():
+            setattr(self, name, view)
+        self._buffer = buffer
+
+    def find(self, prefix: str) -> int:
+        """Node id reached by `prefix`, or -1."""
+        first_child, labels = self.first_child, self.labels
+        node = 0
+        for char in prefix:
+            code = ord(char)
+            hi = first_child[node + 1]
+            node = bisect_left(labels, code, first_child[node], hi)
+            if node == hi or labels[node] != code:
+                return -1
+        return node
+
+    def count(self, term: str) -> int:
+        """Count of `term`, 0 if it is not in the trie."""
+        node = self.find(term)
+        return self.counts[node] if node >= 0 else 0
+
+    def items(self, prefix: str = "") -> Iterator[tuple[str, int]]:
+        """(term, count) pairs of all terms starting with `prefix`, in sorted order."""
+        node = self.find(prefix)
+        if node < 0:
+            return
+        first_child, labels, counts = self.first_child, self.labels, self.counts
+        stack = [(node, prefix)]
+        while stack:
+            node, term = stack.pop()
+            if counts[node]:
+                yield term, counts[node]
+            for child in range(first_child[node + 1] - 1, first_child[node] - 1, -1):
+                stack.append((child, term + chr(labels[child])))
+
+    def search(self, word: str, max_distance: int) -> list[tuple[str, int, int]]:
+        """
+        Terms within optimal string alignment distance `max_distance` of `word`.
+
+        Returns:
+            List of (term, distance, count) in trie order
+        """
+        first_child, labels, counts = self.first_child, self.labels, self.counts
+        codes = [ord(char) for char in word]
+        n = len(codes)
+        first_row = list(range(n + 1))
+
+        results = []
+        if counts[0] and n <= max_distance:
+            results.append(("", n, counts[0]))
+        # (node, term of the parent, parent row, grandparent row, parent label)
+        stack = [(child, "", first_row, None, 0) for child in range(first_child[0], first_child[1])]
+        while stack:
+            node, prefix, previous, before, previous_code = stack.pop()
+            code = labels[node]
+            left = row_min = previous[0] + 1
+            row = [left]
+            for j in range(1, n + 1):
+                value = previous[j - 1] + (codes[j - 1] != code)  # החלפה
+                if previous[j] < value:
+                    value = previous[j] + 1                      # מחיקה
+                if left < value:
+                    value = left + 1                             # הוספה
+                if before is not None and j > 1 and code == codes[j - 2] and previous_code == codes[j - 1] \
+                        and before[j - 2] < value:
+                    value = before[j - 2] + 1                    # החלפת סדר
+                row.append(value)
+                left = value
+                if value < row_min:
+                    row_min = value
+
+            term = prefix + chr(code)
+            if counts[node] and row[n] <= max_distance:
+                results.append((term, row[n], counts[node]))
+            # Go deeper while a row entry is in range, or a transposition with this
+            # node's letter can still reach back to the parent row
+            if row_min <= max_distance or any(
+                    previous[j - 2] < max_distance for j in range(2, n + 1) if codes[j - 1] == code):
+                for child in range(first_child[node], first_child[node + 1]):
+                    stack.append((child, term, row, previous, code))
+        return results
+
+    def close(self) -> None:
+        for name, _ in SECTIONS:
+            getattr(self, name).release()
+        self._buffer.release()
+        self._mmap.close()
+
+
+class TrieWords(Mapping):
+    """term -> count view of a TermTrie, with an in-memory overlay for updates."""
+
+    def __init__(self, trie: TermTrie):
+        self.trie = trie
+        self.overlay: dict[str, int] = {}
+        self.new_terms: list[str] = []
+
+    def __getitem__(self, term: str) -> int:
+        count = self.overlay.get(term)
+        if count is not None:
+            return count
+        count = self.trie.count(term) if isinstance(term, str) else 0
+        if not count:
+            raise KeyError(term)
+        return count
+
+    def __contains__(self, term) -> bool:
+        return isinstance(term, str) and (term in self.overlay or self.trie.count(term) > 0)
+
+    def __iter__(self):
+        yield from (term for term, _ in self.trie.items())
+        yield from self.new_terms
+
+    def __len__(self) -> int:
+        return self.trie.term_count + len(self.new_terms)
+
+    def set(self, term: str, count: int) -> None:
+        if term not in self:
+            self.new_terms.append(term)
+        self.overlay[term] = count
+
+
+class TrieSymSpell:
+    """
+    SymSpell-compatible dictionary served from a TermTrie.
+
+    lookup returns the same suggestions as SymSpell.lookup (all terms within
+    the edit distance, sorted by distance and then by count); TOP and CLOSEST
+    search distance 1, 2, ... and stop at the first distance with a match.
+    create_dictionary_entry adds to an in-memory overlay.
+    """
+
+    def __init__(self, filepath: str, max_dictionary_edit_distance: int = 2):
+        self.trie = TermTrie(filepath)
+        self._words = TrieWords(self.trie)
+        self._max_dictionary_edit_distance = max_dictionary_edit_distance
+        self._max_length = self.trie.max_length
+        self._distance = EditDistance(DistanceAlgorithm.DAMERAU_OSA)
+
+    @property
+    def words(self) -> TrieWords:
+        return self._words
+
+    def create_dictionary_entry(self, key: str, count: int) -> bool:
+        if count <= 0:
+            return False
+        if key in self._words:
+            self._words.set(key, self._words[key] + count)
+            return False
+        self._words.set(key, count)
+        self._max_length = max(self._max_length, len(key))
+        return True
+
+    def _matches(self, phrase: str, distance: int) -> list[SuggestItem]:
+        words = self._words
+        matches = [SuggestItem(term, d, words[term]) for term, d, _ in self.trie.search(phrase, distance)]
+        for term in words.new_terms:
+            d = self._distance.compare(phrase, term, distance)
+            if d >= 0:
+                matches.append(SuggestItem(term, d, words[term]))
+        matches.sort(key=lambda item: (item.distance, -item.count, item.term))
+        return matches
+
+    def lookup(self, phrase: str, verbosity: Verbosity, max_edit_distance: int | None = None,
+               include_unknown: bool = False) -> list[SuggestItem]:
+        if max_edit_distance is None:
+            max_edit_distance = self._max_dictionary_edit_distance
+        if max_edit_distance > self._max_dictionary_edit_distance:
+            raise ValueError("distance too large")
+
+        suggestions = []
+        count = self._words.get(phrase)
+        if count is not None and verbosity != Verbosity.ALL:
+            suggestions = [SuggestItem(phrase, 0, count)]
+        elif len(phrase) - max_edit_distance <= self._max_length:
+            if verbosity == Verbosity.ALL:
+                suggestions = self._matches(phrase, max_edit_distance)
+            else:
+                for distance in range(1, max_edit_distance + 1):
+                    suggestions = self._matches(phrase, distance)
+                    if suggestions:
+                        break
+                if verbosity == Verbosity.TOP:
+                    suggestions = suggestions[:1]
+                else:
+                    suggestions = [item for item in suggestions if item.distance == suggestions[0].distance]
+
+        if include_unknown and not suggestions:
+            suggestions = [SuggestItem(phrase, max_edit_distance + 1, 0)]
+        return suggestions
@@ -0,0 +1,249 @@
+"""
+NumPy codepoint-array kernels for bulk text transforms.
+
+A batch of strings is packed into one uint32 codepoint array plus an offsets
+array, the character-level rules run as array masks and lookup tables, and
+the results are unpacked back into strings. Every kernel returns exactly what
+the per-string Python implementation returns:
+
+- normalize_final_letters_batch -> normalizer.normalize_final_letters
+- weighted_levenshtein_batch    -> spellcheck.weighted_levenshtein
+
+Nikud removal and tokenization are left to compiled regexes
+(normalizer.remove_nikud, spellcheck.TOKEN_RE), which already run in C and
+are faster than packing/unpacking the batch.
+
+NumPy is optional; the batch helpers in normalizer.py and spellcheck.py call
+`should_vectorize()` and fall back to the Python implementations.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+NIKUD_FIRST, NIKUD_LAST = 0x0591, 0x05C7
+ALEF, TAV = 0x05D0, 0x05EA
+DAGESH = 0x05BC
+VAV = ord('ו')
+FINAL_TO_REGULAR = {ord(f): ord(r) for f, r in {"ך": "כ", "ם": "מ", "ן": "נ", "ף": "פ", "ץ": "צ"}.items()}
+REGULAR_TO_FINAL = {r: f for f, r in FINAL_TO_REGULAR.items()}
+
+_tables = None
+
+
+def available() -> bool:
+    """Whether the vectorized backend can be used."""
+    return np is not None
+
+
+def should_vectorize(texts: list[str]) -> bool:
+    """Use the vectorized kernels for batches of at least settings.vectorized_min_chars characters."""
+    if np is None:
+        return False
+    from app.config import settings
+    return sum(map(len, texts)) >= settings.vectorized_min_chars
+
+
+def _get_tables() -> dict:
+    """Build the lookup tables once (Basic Multilingual Plane only)."""
+    global _tables
+    if _tables is None:
+        space = np.array([chr(i).isspace() for i in range(0x10000)], dtype=bool)
+        # Word separators of normalizer.split_to_words: [\s\-־,.?!]
+        separator = space.copy()
+        separator[[ord(c) for c in "-־,.?!"]] = True
+
+        to_regular = np.arange(0x10000, dtype=np.uint32)
+        to_final = np.arange(0x10000, dtype=np.uint32)
+        for final, regular in FINAL_TO_REGULAR.items():
+            to_regular[final] = regular
+            to_final[regular] = final
+
+        _tables = {"space": space, "separator": separator, "to_regular": to_regular, "to_final": to_final}
+    return _tables
+
+
+def _lookup(table, codepoints):
+    """Index a BMP table; codepoints outside the BMP map to False."""
+    return table[np.minimum(codepoints, 0xFFFF)] & (codepoints <= 0xFFFF)
+
+
+def pack(texts: list[str]):
+    """Pack strings into (codepoints, offsets) with offsets[i]:offsets[i+1] per string."""
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    codepoints = np.frombuffer("".join(texts).encode("utf-32-le"), dtype="<u4")
+    return codepoints, offsets
+
+
+def unpack(codepoints, offsets) -> list[str]:
+    """Inverse of pack()."""
+    joined = codepoints.astype("<u4", copy=False).tobytes().decode("utf-32-le")
+    bounds = offsets.tolist()
+    return [joined[bounds[i]:bounds[i + 1]] for i in range(len(bounds) - 1)]
+
+
+def _segment_starts(size: int, offsets):
+    """Boolean mask of positions that start a string."""
+    starts = np.zeros(size + 1, dtype=bool)
+    starts[offsets[:-1]] = True
+    return starts[:size]
+
+
+def _segment_ends(size: int, offsets):
+    """Boolean mask of positions that end a string."""
+    ends = np.zeros(size, dtype=bool)
+    ends[offsets[1:][offsets[1:] > offsets[:-1]] - 1] = True
+    return ends
+
+
+def normalize_final_letters_batch(texts: list[str]) -> list[str]:
+    """
+    Vectorized normalizer.normalize_final_letters for a batch of strings.
+
+    Words are split on the same separators as split_to_words; within a word the
+    first character and every non-nikud character is a letter, nikud is
+    dropped, and a dagesh marks the preceding letter (except vav). Words are
+    re-joined with single spaces.
+    """
+    tables = _get_tables()
+    codepoints, offsets = pack(texts)
+    size = len(codepoints)
+    if size == 0:
+        return ["" for _ in texts]
+
+    separator = _lookup(tables["separator"], codepoints)
+    string_start = _segment_starts(size, offsets)
+    prev_separator = np.concatenate(([True], separator[:-1])) | string_start
+    word_start = ~separator & prev_separator
+    nikud = (codepoints >= NIKUD_FIRST) & (codepoints <= NIKUD_LAST)
+    letter = ~separator & (word_start | ~nikud)
+
+    letter_positions = np.flatnonzero(letter)
+    letters = codepoints[letter_positions]
+    word_ids = np.cumsum(word_start)[letter_positions]
+    last_in_word = np.ones(len(letters), dtype=bool)
+    last_in_word[:-1] = word_ids[1:] != word_ids[:-1]
+
+    # A dagesh belongs to the closest letter before it (vav + dagesh is shuruk)
+    letter_index = np.cumsum(letter) - 1
+    dagesh_positions = np.flatnonzero(~separator & ~letter & (codepoints == DAGESH))
+    has_dagesh = np.zeros(len(letters), dtype=bool)
+    owners = letter_index[dagesh_positions]
+    has_dagesh[owners[letters[owners] != VAV]] = True
+
+    is_final_form = np.isin(letters, list(FINAL_TO_REGULAR))
+    is_regular_form = np.isin(letters, list(REGULAR_TO_FINAL))
+    to_regular = is_final_form & (~last_in_word | has_dagesh)
+    to_final = is_regular_form & last_in_word
+    letters = np.where(to_regular, tables["to_regular"][np.minimum(letters, 0xFFFF)], letters)
+    letters = np.where(to_final, tables["to_final"][np.minimum(letters, 0xFFFF)], letters)
+
+    # One space before every word except the first word of each string
+    first_word = np.zeros(len(letters), dtype=bool)
+    segment_of_letter = np.searchsorted(offsets, letter_positions, side="right") - 1
+    starts_word = word_start[letter_positions]
+    first_word_positions = np.flatnonzero(starts_word)
+    first_of_segment = np.ones(len(first_word_positions), dtype=bool)
+    first_of_segment[1:] = segment_of_letter[first_word_positions[1:]] != segment_of_letter[first_word_positions[:-1]]
+    first_word[first_word_positions[first_of_segment]] = True
+    needs_space = starts_word & ~first_word
+
+    output = np.insert(letters.astype(np.uint32), np.flatnonzero(needs_space), ord(" "))
+    per_segment = np.bincount(segment_of_letter, minlength=len(texts)) + \
+        np.bincount(segment_of_letter[needs_space], minlength=len(texts))
+    new_offsets = np.concatenate(([0], np.cumsum(per_segment)))
+    return unpack(output, new_offsets)
+
+
+def _confusion_table():
+    """Substitution costs between Hebrew letters, indexed by letter id (id 27 = any other char)."""
+    tables = _get_tables()
+    if "confusion" not in tables:
+        from .spellcheck import CONFUSIONS
+
+        letter_ids = np.full(0x10000, TAV - ALEF + 1, dtype=np.intp)
+        letter_ids[ALEF:TAV + 1] = np.arange(TAV - ALEF + 1)
+        confusion = np.ones((TAV - ALEF + 2, TAV - ALEF + 2), dtype=np.float64)
+        for (a, b), cost in CONFUSIONS.items():
+            confusion[ord(a) - ALEF, ord(b) - ALEF] = cost
+        tables["letter_ids"] = letter_ids
+        tables["confusion"] = confusion
+    return tables["letter_ids"], tables["confusion"]
+
+
+def _pad(texts: list[str]):
+    """Pack strings into a (len(texts), max_len) codepoint matrix padded with zeros, plus lengths."""
+    codepoints, offsets = pack(texts)
+    lengths = np.diff(offsets)
+    width = int(lengths.max()) if len(texts) else 0
+    matrix = np.zeros((len(texts), width), dtype=np.uint32)
+    if len(codepoints):
+        rows = np.repeat(np.arange(len(texts)), lengths)
+        columns = np.arange(len(codepoints)) - np.repeat(offsets[:-1], lengths)
+        matrix[rows, columns] = codepoints
+    return matrix, lengths
+
+
+def weighted_levenshtein_batch(words: list[str], terms: list[str]):
+    """
+    Vectorized spellcheck.weighted_levenshtein for the pairs (words[p], terms[p]).
+
+    The DP runs cell by cell over the padded strings with every pair in one
+    vector, so each cell performs the same float operations as the Python
+    implementation and the distances are bit-identical. Cells past the end of a
+    string never feed the cells before it, so padding does not change results.
+    """
+    pairs = len(words)
+    result = np.zeros(pairs, dtype=np.float64)
+    if pairs == 0:
+        return result
+
+    letter_ids, confusion = _confusion_table()
+    word_codes, word_lengths = _pad(words)
+    term_codes, term_lengths = _pad(terms)
+    rows, columns = word_codes.shape[1], term_codes.shape[1]
+    pair_index = np.arange(pairs)
+
+    previous = np.tile(np.arange(columns + 1, dtype=np.float64), (pairs, 1))
+    done = word_lengths == 0
+    result[done] = term_lengths[done]
+    term_ids = letter_ids[np.minimum(term_codes, 0xFFFF)]
+    term_bmp = term_codes <= 0xFFFF
+
+    for i in range(1, rows + 1):
+        a_codes = word_codes[:, i - 1:i]
+        a_ids = letter_ids[np.minimum(a_codes, 0xFFFF)]
+        costs = np.where(a_codes == term_codes, 0.0,
+                         np.where(term_bmp & (a_codes <= 0xFFFF), confusion[a_ids, term_ids], 1.0))
+        current = np.empty_like(previous)
+        current[:, 0] = i
+        for j in range(1, columns + 1):
+            value = previous[:, j] + 1                                   # מחיקה
+            np.minimum(value, current[:, j - 1] + 1, out=value)         # הוספה
+            np.minimum(value, previous[:, j - 1] + costs[:, j - 1], out=value)  # החלפה
+            current[:, j] = value
+        ending = word_lengths == i
+        result[ending] = current[pair_index[ending], term_lengths[ending]]
+        previous = current
+    return result
+
+
+def top_k_order(distances, counts, top_k: int):
+    """
+    Indices of the `top_k` best candidates ordered by (distance, -count, index),
+    the ranking of spellcheck.hebrew_rerank. np.argpartition finds the k-th best
+    distance so only candidates up to it are sorted.
+    """
+    size = len(distances)
+    if top_k <= 0 or size == 0:
+        return np.zeros(0, dtype=np.intp)
+    if top_k < size:
+        kth = distances[np.argpartition(distances, top_k - 1)[:top_k]].max()
+        selected = np.flatnonzero(distances <= kth)
+    else:
+        selected = np.arange(size)
+    order = np.lexsort((selected, -counts[selected], distances[selected]))
+    return selected[order[:top_k]]
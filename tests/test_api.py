@@ -36,3 +36,39 @@ def test_api_v1_endpoints():
     # Test spellcheck endpoint
     res = client.post("/api/v1/spellcheck", json={"text": "שלום"})
     assert res.status_code in [200, 422, 500]
+
+def test_normalize_incremental():
+    """Test incremental normalization with a document id"""
+    payload = {"text": "שלום עולם. מה שלומך?", "document_id": "test-doc"}
+    res = client.post("/api/v1/normalize", json=payload)
+    assert res.status_code == 200
+    assert res.json()["normalized_sentences"] == 2
+
+    payload["text"] = "שלום עולם. מה נשמע?"
+    res = client.post("/api/v1/normalize", json=payload)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["document_id"] == "test-doc"
+    assert data["reused_sentences"] == 1
+    assert data["normalized_sentences"] == 1
+
+def test_normalize_customization():
+    """Test stage selection through customization"""
+    res = client.post("/api/v1/normalize", json={"text": "הולכ הביתה", "customization": {"full_ktiv": False}})
+    assert res.status_code == 200
+    assert res.json()["output"] == "הולך הביתה"
+
+    res = client.post("/api/v1/normalize", json={"text": "שלום", "customization": {"bogus": True}})
+    assert res.status_code == 422
+
+def test_spellcheck_batch():
+    """Batch spellcheck returns one result per text, in order"""
+    res = client.post("/api/v1/spellcheck/batch", json={"texts": ["שלום עולם", "", "שלום"], "top_k": 2})
+    assert res.status_code == 200
+    results = res.json()["results"]
+    assert [r["input"] for r in results] == ["שלום עולם", "", "שלום"]
+    assert results[1] == {"input": "", "output": "", "suggestions": {}}
+    assert set(results[0]["suggestions"]) == {"שלום", "עולם"}
+
+    res = client.post("/api/v1/spellcheck/batch", json={"texts": ["שלום"], "top_k": -1})
+    assert res.status_code == 422
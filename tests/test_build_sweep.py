@@ -0,0 +1,62 @@
+import json
+import os
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from app.utils.build_sweep import (format_table, measure_serving, pareto_front, parse_objectives, run_sweep,
+                                 sweep_configs)
+from app.utils.spellcheck import CorpusLoader
+
+
+def test_pareto_front():
+    """Dominated configurations are dropped; ties and trade-offs stay on the front"""
+    rows = [
+        {"name": "a", "accuracy": 0.9, "p95_ms": 1.0, "index_mb": 10.0},
+        {"name": "b", "accuracy": 0.8, "p95_ms": 0.5, "index_mb": 5.0},
+        {"name": "c", "accuracy": 0.8, "p95_ms": 1.0, "index_mb": 10.0},  # worse than a everywhere
+        {"name": "d", "accuracy": 0.9, "p95_ms": 1.0, "index_mb": 10.0},  # same as a
+    ]
+    assert [row["name"] for row in pareto_front(rows)] == ["a", "b", "d"]
+    assert [row["name"] for row in pareto_front(rows, parse_objectives("accuracy"))] == ["a", "d"]
+    assert sweep_configs([1, 2], [2, 7], [5]) == [
+        {"max_edit_distance": 1, "prefix_length": 2, "min_freq": 5},
+        {"max_edit_distance": 1, "prefix_length": 7, "min_freq": 5},
+        {"max_edit_distance": 2, "prefix_length": 7, "min_freq": 5},
+    ]
+
+
+def test_run_sweep(tmp_path):
+    """Every configuration is built, benchmarked and written to sweep.json and sweep.md"""
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_text("שלום עולם הולך הביתה\nספר ראיון עובדים\nשלום ספר\n" * 20, encoding="utf-8")
+    labelled = tmp_path / "labelled.csv"
+    labelled.write_text("form,correct\nשלומ,שלום\nעולמם,עולם\nספרר,ספר\n", encoding="utf-8")
+
+    result = run_sweep(str(corpus), str(labelled), str(tmp_path / "sweep"), max_edit_distances=[1, 2],
+                       prefix_lengths=[7], min_freqs=[1], loader=CorpusLoader(str(corpus), progress=None))
+    rows = result["configs"]
+    assert [(row["max_edit_distance"], row["prefix_length"]) for row in rows] == [(1, 7), (2, 7)]
+    for row in rows:
+        assert row["words"] == 7
+        assert row["index_mb"] > 0
+        assert row["accuracy"] == 1.0
+    assert rows[0]["index_mb"] < rows[1]["index_mb"]  # fewer deletes at distance 1
+    assert any(row["pareto"] for row in rows)
+    saved = json.loads((tmp_path / "sweep" / "sweep.json").read_text(encoding="utf-8"))
+    assert len(saved["configs"]) == 2
+    assert (tmp_path / "sweep" / "sweep.md").read_text(encoding="utf-8") == format_table(rows) + "\n"
+
+
+def test_serving_needs_the_built_index(tmp_path):
+    """The serving step never builds: without the index of the dictionary it fails"""
+    dictionary = tmp_path / "symspell-f1.txt"
+    dictionary.write_text("שלום 5\n", encoding="utf-8")
+    config = {"max_edit_distance": 1, "prefix_length": 7, "min_freq": 1}
+    with pytest.raises(FileNotFoundError):
+        measure_serving(config, str(dictionary), str(tmp_path / "missing.idx"), [("שלומ", "שלום")])
+    assert not (tmp_path / "missing.idx").exists()
@@ -0,0 +1,87 @@
+import gzip
+import json
+import os
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.cli import main, normalize_files, write_json_atomic
+
+LINES = ["שָׁלוֹם עוֹלָם", "", "ספרים טובימ", "הולכ הביתה"]
+EXPECTED = ["שלום עולם", "", "ספרים טובים", "הולך הביתה"]
+
+
+def test_normalize_plain_and_gzip(tmp_path):
+    """Plain and gzip inputs are normalized in order into one output file"""
+    plain = tmp_path / "a.txt"
+    plain.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    compressed = tmp_path / "b.txt.gz"
+    with gzip.open(compressed, "wt", encoding="utf-8") as f:
+        f.write("\n".join(LINES) + "\n")
+    output = tmp_path / "out.txt"
+
+    lines = normalize_files([str(plain), str(compressed)], str(output), full_ktiv=False, batch_size=3, workers=2)
+
+    assert lines == 2 * len(LINES)
+    assert output.read_text(encoding="utf-8").splitlines() == EXPECTED + EXPECTED
+
+
+def test_normalize_jsonl_text_field(tmp_path):
+    """JSONL records keep their other fields and get the text field replaced"""
+    source = tmp_path / "in.jsonl"
+    source.write_text(
+        "\n".join(json.dumps({"id": i, "body": line}, ensure_ascii=False) for i, line in enumerate(LINES)) + "\n",
+        encoding="utf-8",
+    )
+    output = tmp_path / "out.jsonl"
+
+    main(["normalize", str(source), "-o", str(output), "--text-field", "body", "--no-full-ktiv", "--workers", "1"])
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [r["id"] for r in records] == list(range(len(LINES)))
+    assert [r["body"] for r in records] == EXPECTED
+
+
+def test_resume_from_checkpoint(tmp_path):
+    """A killed job resumes after the last checkpoint and drops partial output"""
+    source = tmp_path / "in.txt"
+    source.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    output = tmp_path / "out.txt"
+    checkpoint = tmp_path / "job.ckpt.json"
+
+    # Simulate a job killed after two lines with a half-written third line
+    done = "\n".join(EXPECTED[:2]) + "\n"
+    output.write_bytes(done.encode("utf-8") + "ספר".encode("utf-8"))
+    write_json_atomic(str(checkpoint), {
+        "inputs": [str(source)],
+        "file_index": 0,
+        "input_offset": len(("\n".join(LINES[:2]) + "\n").encode("utf-8")),
+        "output_offset": len(done.encode("utf-8")),
+        "lines": 2,
+    })
+
+    lines = normalize_files([str(source)], str(output), full_ktiv=False, checkpoint_path=str(checkpoint))
+
+    assert lines == 2
+    assert output.read_text(encoding="utf-8").splitlines() == EXPECTED
+
+
+def test_output_is_synced_before_every_checkpoint(tmp_path, monkeypatch):
+    """The output is on disk before a checkpoint points past it"""
+    source = tmp_path / "in.txt"
+    source.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    output = tmp_path / "out.txt"
+    checkpoint = tmp_path / "job.ckpt.json"
+    synced = []
+    fsync = os.fsync
+
+    def recording_fsync(fd):
+        synced.append(os.path.basename(os.readlink(f"/proc/self/fd/{fd}")))
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    normalize_files([str(source)], str(output), full_ktiv=False, batch_size=2, checkpoint_path=str(checkpoint))
+
+    assert synced == ["out.txt", "job.ckpt.json.tmp"] * 3
+
@@ -0,0 +1,89 @@
+import bz2
+import gzip
+import json
+import lzma
+import os
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+from collections import Counter
+
+from app.utils.corpus_readers import corpus_format, iter_records, iter_texts, readahead
+from app.utils.spellcheck import CorpusLoader, HebrewTokenizer, SymSpellBuilder
+
+LINES = ["שלום עולם", "  ספר טוב  ", "", 'ארה"ב, ישראל']
+
+
+def test_compressed_text_files(tmp_path):
+    """.gz / .bz2 / .xz text files stream the same lines as the plain file"""
+    data = ("\n".join(LINES) + "\r\nסוף").encode("utf-8")
+    (tmp_path / "a.txt").write_bytes(data)
+    for suffix, compress in ((".gz", gzip.compress), (".bz2", bz2.compress), (".xz", lzma.compress)):
+        (tmp_path / f"a.txt{suffix}").write_bytes(compress(data))
+        assert list(iter_texts(tmp_path / f"a.txt{suffix}")) == list(iter_texts(tmp_path / "a.txt"))
+    assert list(iter_texts(tmp_path / "a.txt")) == [line.strip() for line in LINES] + ["סוף"]
+    assert corpus_format("corpus.jsonl.xz") == ("jsonl", ".xz")
+    assert corpus_format("notes.md") == (None, "")
+
+
+def test_jsonl_and_csv_columns(tmp_path):
+    records = [{"text": "שלום עולם", "id": 1}, {"id": 2}, {"text": " ספר "}]
+    (tmp_path / "a.jsonl.gz").write_bytes(gzip.compress("\n".join(map(json.dumps, records)).encode("utf-8")))
+    assert list(iter_texts(tmp_path / "a.jsonl.gz")) == ["שלום עולם", "ספר"]
+    assert list(iter_texts(tmp_path / "a.jsonl.gz", text_field="id")) == []
+
+    (tmp_path / "a.csv").write_text('form,correct\nשלומ,"ארה""ב, שלום"\n', encoding="utf-8")
+    assert list(iter_texts(tmp_path / "a.csv", csv_column="correct")) == ['ארה"ב, שלום']
+    assert list(iter_texts(tmp_path / "a.csv", csv_column="0")) == ["form", "שלומ"]
+    assert list(iter_texts(tmp_path / "a.csv")) == ["form correct", 'שלומ ארה"ב, שלום']
+    with pytest.raises(ValueError):
+        list(iter_texts(tmp_path / "a.csv", csv_column="text"))
+
+
+def test_records_report_offsets_to_resume_from(tmp_path):
+    """iter_records gives the decompressed offset after each line; reading from it yields the rest"""
+    records = [{"text": "שלום", "id": 1}, {"id": 2}, {"text": "ספר", "id": 3}]
+    data = ("\n".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n\n").encode("utf-8")
+    (tmp_path / "a.jsonl.bz2").write_bytes(bz2.compress(data))
+
+    rows = list(iter_records(tmp_path / "a.jsonl.bz2"))
+    assert [(text, record) for _, _, text, record in rows] == [("שלום", records[0]), ("", records[1]), ("ספר", records[2])]
+    assert rows[-1][1] == (tmp_path / "a.jsonl.bz2").stat().st_size
+    assert [record for _, _, _, record in iter_records(tmp_path / "a.jsonl.bz2", start_offset=rows[0][0])] == records[1:]
+
+    (tmp_path / "a.txt.gz").write_bytes(gzip.compress("שלום\r\n  ספר \n".encode("utf-8")))
+    assert [(offset, text) for offset, _, text, _ in iter_records(tmp_path / "a.txt.gz")] == [(10, "שלום"), (20, "  ספר ")]
+
+
+def test_readahead():
+    assert list(readahead(iter(range(10_000)), depth=2, batch_size=7)) == list(range(10_000))
+
+    def failing():
+        yield 1
+        raise OSError("disk")
+
+    with pytest.raises(OSError):
+        list(readahead(failing()))
+
+
+def test_loader_formats_serial_and_parallel(tmp_path):
+    """Mixed formats count the same serially and on worker processes, with progress events"""
+    (tmp_path / "a.txt").write_text("שלום עולם\nספר\n", encoding="utf-8")
+    (tmp_path / "b.txt.gz").write_bytes(gzip.compress("עולם ספר\n".encode("utf-8")))
+    (tmp_path / "c.csv").write_text("id,text\n1,שלום ספר\n", encoding="utf-8")
+    (tmp_path / "d.jsonl.bz2").write_bytes(bz2.compress(json.dumps({"body": "עולם"}).encode("utf-8")))
+
+    events = []
+    loader = CorpusLoader(str(tmp_path), text_field="body", csv_column="text", readahead=2,
+                          progress=events.append, progress_every=2)
+    assert [path.name for path in loader.corpus_files()] == ["a.txt", "b.txt.gz", "c.csv", "d.jsonl.bz2"]
+    tokens = list(loader.load_tokens(HebrewTokenizer()))
+    assert tokens == ["שלום", "עולם", "ספר", "עולם", "ספר", "שלום", "ספר", "עולם"]
+    assert [e.event for e in events].count("file") == 4
+    assert events[-1].event == "done" and events[-1].lines == 5
+
+    parallel = SymSpellBuilder.build_counts_parallel(loader, workers=2, shard_bytes=4)
+    assert list(parallel.items()) == list(Counter(tokens).items())
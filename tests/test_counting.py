@@ -0,0 +1,41 @@
+import os
+import random
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from collections import Counter
+
+from app.utils.counting import SpillingCounter
+from app.utils.spellcheck import SymSpellBuilder
+
+
+def random_tokens(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("אבגדהוזחטיכלמנסעפצקרשת") for _ in range(rng.randint(2, 5))) for _ in range(500)]
+    # Zipf-like: a few frequent words and a long tail
+    return [vocabulary[min(int(rng.paretovariate(1.0)) - 1, len(vocabulary) - 1)] if rng.random() < 0.7
+            else rng.choice(vocabulary) for _ in range(count)]
+
+
+def test_spilling_counter_matches_counter():
+    """Spilled runs merge to the exact pruned counts, in first-seen order"""
+    tokens = random_tokens(20_000)
+    for min_freq in (1, 3, 50):
+        expected = SymSpellBuilder.prune_counts(Counter(tokens), min_freq)
+        with SpillingCounter(max_terms=40) as counter:
+            for chunk in SymSpellBuilder.chunked(tokens, 100):
+                counter.update(chunk)
+            assert len(counter.runs) > 1
+            assert counter.items(min_freq) == expected
+
+
+def test_build_from_tokens_bounded():
+    """The bounded build produces the same dictionary as the in-memory build"""
+    tokens = random_tokens(5_000)
+    exact = SymSpellBuilder(2, 7)
+    exact.build_from_tokens(tokens, min_freq=2)
+    bounded = SymSpellBuilder(2, 7)
+    bounded.build_from_tokens(tokens, min_freq=2, max_terms=25)
+    assert list(bounded.sym_spell.words.items()) == list(exact.sym_spell.words.items())
@@ -0,0 +1,165 @@
+import os
+import pathlib
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.dictionary_updates import companion_paths, read_counts, read_manifest, save_full_build, update_dictionary
+from app.utils.prefixes import PrefixModel
+from app.utils.spellcheck import CorpusLoader, HebrewTokenizer, SymSpellBuilder, load_spellchecker
+from app.utils.symspell_index import MappedSymSpell
+
+
+def write_corpus(path, text: str) -> str:
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_update_dictionary_merges_new_files(tmp_path):
+    """New files are counted once, merged into symspell.txt and logged as a delta"""
+    dictionary_path = tmp_path / "symspell.txt"
+    builder = SymSpellBuilder(2, 7)
+    builder.build_symspell_from_counts([("שלום", 5), ("עולם", 3)])
+    builder.save_dictionary(str(dictionary_path))
+
+    first = write_corpus(tmp_path / "a.txt", "שלום ספר\nספר ספר\n")
+    stats = update_dictionary([first], str(dictionary_path), min_freq=2)
+    assert stats["new_terms"] == 1
+    assert read_counts(dictionary_path) == {"שלום": 6, "עולם": 3, "ספר": 3}
+
+    # The same content under another name is not counted again
+    copy = write_corpus(tmp_path / "copy.txt", "שלום ספר\nספר ספר\n")
+    assert update_dictionary([first, copy], str(dictionary_path), min_freq=2)["ingested_files"] == 0
+
+    # Below-threshold terms are kept aside until they reach min_freq
+    update_dictionary([write_corpus(tmp_path / "b.txt", "הולך")], str(dictionary_path), min_freq=2)
+    assert "הולך" not in read_counts(dictionary_path)
+    update_dictionary([write_corpus(tmp_path / "c.txt", "הולך שלום")], str(dictionary_path), min_freq=2)
+    assert read_counts(dictionary_path)["הולך"] == 2
+
+
+def test_refresh_applies_deltas(tmp_path):
+    """A loaded spellchecker picks up updates without reloading, including from the mapped index"""
+    dictionary_path = tmp_path / "symspell.txt"
+    builder = SymSpellBuilder(2, 7)
+    builder.build_symspell_from_counts([("שלום", 5)])
+    builder.save_dictionary(str(dictionary_path))
+    index_path = str(tmp_path / "symspell.idx")
+    load_spellchecker(str(dictionary_path), str(tmp_path / "none"), index_path)
+
+    spellchecker = load_spellchecker(str(dictionary_path), str(tmp_path / "none"), index_path)
+    assert isinstance(spellchecker.symspell, MappedSymSpell)
+    assert spellchecker.correct_text("ספרר") == "ספרר"
+
+    update_dictionary([write_corpus(tmp_path / "a.txt", "ספר ספר ספר")], str(dictionary_path), min_freq=2)
+    assert spellchecker.refresh() == {"applied_updates": 1, "changed_terms": 1, "delta_seq": 1,
+                                     "reloaded": False}
+    assert spellchecker.correct_text("ספרר") == "ספר"
+    assert spellchecker.symspell.words["ספר"] == 3
+    assert spellchecker.refresh()["applied_updates"] == 0
+
+    # A batch worker only catches up with the delta seq the server has applied
+    worker = load_spellchecker(str(dictionary_path), str(tmp_path / "none"), index_path)
+    update_dictionary([write_corpus(tmp_path / "b.txt", "עולם עולם")], str(dictionary_path), min_freq=2)
+    assert worker.refresh(up_to_seq=1) == {"applied_updates": 0, "changed_terms": 0, "delta_seq": 1,
+                                           "reloaded": False}
+    assert "עולם" not in worker.symspell.words
+    assert worker.refresh(up_to_seq=2)["applied_updates"] == 1
+    assert worker.symspell.words["עולם"] == 2
+
+    # A spellchecker loaded after the update already has it
+    reloaded = load_spellchecker(str(dictionary_path), str(tmp_path / "none"), index_path)
+    assert reloaded.delta_seq == 2
+    assert reloaded.refresh()["applied_updates"] == 0
+
+
+def test_full_build_seeds_update_state(tmp_path):
+    """A full build records its corpus files and residual, and a rebuild resets the delta log"""
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    write_corpus(corpus / "a.txt", "שלום שלום עולם\n")
+    dictionary_path = str(tmp_path / "symspell.txt")
+    paths = companion_paths(dictionary_path)
+
+    def full_build():
+        builder = SymSpellBuilder(2, 7)
+        loader = CorpusLoader(str(corpus))
+        builder.build_from_corpus(loader, HebrewTokenizer(), min_freq=2,
+                                  residual_path=str(paths["build_residual"]))
+        return save_full_build(builder, dictionary_path, loader.corpus_files())
+
+    assert full_build() == 1
+    assert read_counts(paths["residual"]) == {"עולם": 1}
+    index_path = str(tmp_path / "symspell.idx")
+    spellchecker = load_spellchecker(dictionary_path, str(tmp_path / "none"), index_path)
+
+    # The corpus file is not counted again; the residual term is promoted by a new file
+    stats = update_dictionary([str(corpus / "a.txt"), write_corpus(tmp_path / "b.txt", "עולם")],
+                              dictionary_path, min_freq=2)
+    assert stats["ingested_files"] == 1 and stats["new_terms"] == 1
+    assert read_counts(paths["residual"]) == {}
+    assert read_counts(pathlib.Path(dictionary_path)) == {"שלום": 2, "עולם": 2}
+
+    # A rebuild starts a new delta log; a server loaded before it reloads
+    write_corpus(corpus / "c.txt", "ספר ספר")
+    assert full_build() == 3
+    assert not paths["deltas"].exists()
+    assert read_manifest(dictionary_path)["base_seq"] == 3
+    assert spellchecker.refresh()["reloaded"]
+    assert spellchecker.delta_seq == 3
+    assert spellchecker.symspell.words["ספר"] == 2
+
+
+def prefix_mode_build(corpus, dictionary_path: str) -> None:
+    paths = companion_paths(dictionary_path)
+    builder = SymSpellBuilder(2, 7)
+    loader = CorpusLoader(str(corpus), progress=None)
+    builder.build_from_corpus(loader, HebrewTokenizer(), min_freq=2, strip_prefixes=True,
+                              residual_path=str(paths["build_residual"]))
+    save_full_build(builder, dictionary_path, loader.corpus_files())
+    builder.prefix_model.save(str(paths["prefixes"]))
+
+
+def test_prefix_mode_update_matches_a_rebuild(tmp_path):
+    """Updating a prefix-mode dictionary gives the counts and prefix statistics of a full rebuild"""
+    first = "בית בית בית בית והבית והבית לבית ספר ספר הספר הספר הספר\n"
+    second = "לבית ספר ספר\n"
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    write_corpus(corpus / "a.txt", first)
+    dictionary_path = str(tmp_path / "symspell.txt")
+    prefix_mode_build(corpus, dictionary_path)
+    assert read_manifest(dictionary_path)["prefix_mode"]
+    assert read_counts(pathlib.Path(dictionary_path)) == {"בית": 6, "ספר": 2, "הספר": 3}
+
+    stats = update_dictionary([write_corpus(tmp_path / "b.txt", second)], dictionary_path, min_freq=2)
+
+    rebuilt = tmp_path / "rebuilt"
+    rebuilt.mkdir()
+    write_corpus(rebuilt / "a.txt", first)
+    write_corpus(rebuilt / "b.txt", second)
+    rebuilt_path = str(rebuilt / "symspell.txt")
+    prefix_mode_build(rebuilt, rebuilt_path)
+    assert read_counts(pathlib.Path(dictionary_path)) == read_counts(pathlib.Path(rebuilt_path)) == \
+        {"בית": 8, "ספר": 7}
+    assert PrefixModel.load(str(companion_paths(dictionary_path)["prefixes"])).__dict__ == \
+        PrefixModel.load(str(companion_paths(rebuilt_path)["prefixes"])).__dict__
+    # הספר is now folded into ספר, which a delta cannot express: servers reload
+    assert read_manifest(dictionary_path)["base_seq"] == stats["delta_seq"]
+
+
+def test_refresh_if_stale_polls_the_manifest(tmp_path):
+    """Workers pick up updates on their own once the refresh interval has passed"""
+    dictionary_path = tmp_path / "symspell.txt"
+    builder = SymSpellBuilder(2, 7)
+    builder.build_symspell_from_counts([("שלום", 5)])
+    builder.save_dictionary(str(dictionary_path))
+    spellchecker = load_spellchecker(str(dictionary_path), str(tmp_path / "none"), str(tmp_path / "symspell.idx"))
+
+    update_dictionary([write_corpus(tmp_path / "a.txt", "ספר ספר ספר")], str(dictionary_path), min_freq=2)
+    assert spellchecker.refresh_if_stale(3600) is None
+    assert spellchecker.refresh_if_stale(0) is None
+    spellchecker._checked_at -= 10
+    assert spellchecker.refresh_if_stale(5)["applied_updates"] == 1
+    assert spellchecker.symspell.words["ספר"] == 3
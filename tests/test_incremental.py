@@ -0,0 +1,49 @@
+import os
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.incremental import DocumentCache
+from app.utils.normalizer import split_to_sentences
+
+
+def test_split_to_sentences():
+    """Sentences split on punctuation and line breaks, punctuation kept"""
+    text = "שלום עולם. מה שלומך? טוב!\nשורה חדשה"
+    assert split_to_sentences(text) == ["שלום עולם.", "מה שלומך?", "טוב!", "שורה חדשה"]
+    assert split_to_sentences("   ") == []
+
+
+def test_only_changed_sentences_are_normalized():
+    """A second version re-normalizes only the edited sentence"""
+    calls = []
+
+    def fake_normalize(text, with_nikud=False, spellcheck=False, customization=None):
+        calls.append(text)
+        return text.upper()
+
+    cache = DocumentCache(normalize_fn=fake_normalize)
+    output, stats = cache.normalize("doc", "a b. c d. e f.")
+    assert output == "A B. C D. E F."
+    assert stats == {"sentences": 3, "reused_sentences": 0, "normalized_sentences": 3}
+
+    calls.clear()
+    output, stats = cache.normalize("doc", "a b. c x. e f.")
+    assert calls == ["c x."]
+    assert output == "A B. C X. E F."
+    assert stats["reused_sentences"] == 2
+
+    # Different options do not reuse cached output
+    calls.clear()
+    cache.normalize("doc", "a b. c x. e f.", with_nikud=True)
+    assert len(calls) == 3
+
+
+def test_documents_are_evicted_lru():
+    """Only the most recently used documents are kept"""
+    cache = DocumentCache(max_documents=1, normalize_fn=lambda text, *args: text)
+    cache.normalize("first", "a.")
+    cache.normalize("second", "b.")
+    _, stats = cache.normalize("first", "a.")
+    assert stats["reused_sentences"] == 0
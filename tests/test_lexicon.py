@@ -0,0 +1,52 @@
+import os
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.config import settings
+from app.utils.lexicon import FullKtivLexicon, LexiconBuilder, get_full_ktiv_lexicon, normalize_full_ktiv_sentences
+
+
+def test_builder_keeps_only_unambiguous_words():
+    """Words with one full ktiv output enter the lexicon, ambiguous ones do not"""
+    builder = LexiconBuilder()
+    builder.add("שלום עולם", "שלום עולם")
+    builder.add("ספר טוב", "ספר טוב")
+    builder.add("ספר שלום", "סיפר שלום")
+    builder.add("לא מיושר", "לא")  # misaligned sentence is skipped
+
+    lexicon = builder.build(min_count=1)
+    assert lexicon.mapping == {"שלום": "שלום", "עולם": "עולם", "טוב": "טוב"}
+    assert builder.stats()["ambiguous_words"] == 1
+    assert builder.stats()["skipped_sentences"] == 1
+    assert "שלום" not in builder.build(min_count=3)
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    """Identity mappings are stored compactly and restored on load"""
+    path = tmp_path / "lexicon" / "full_ktiv.tsv"
+    FullKtivLexicon({"שלום": "שלום", "אויר": "אוויר"}).save(str(path))
+
+    assert path.read_text(encoding="utf-8") == "אויר\tאוויר\nשלום\t\n"
+    assert FullKtivLexicon.load(str(path)).mapping == {"שלום": "שלום", "אויר": "אוויר"}
+
+
+def test_covered_sentences_skip_the_model():
+    """Sentences whose words are all in the lexicon are mapped without the model"""
+    lexicon = FullKtivLexicon({"אנחנו": "אנחנו", "באויר": "באוויר", "נמצאים": "נמצאים"})
+    assert normalize_full_ktiv_sentences(["אנחנו נמצאים באויר"], lexicon) == "אנחנו נמצאים באוויר"
+
+
+def test_lexicon_built_after_startup_is_picked_up(tmp_path, monkeypatch):
+    """A missing lexicon is not cached, and a rebuilt one replaces the loaded one"""
+    path = tmp_path / "full_ktiv.tsv"
+    monkeypatch.setattr(settings, "full_ktiv_lexicon_path", str(path))
+    assert get_full_ktiv_lexicon() is None
+
+    FullKtivLexicon({"אויר": "אוויר"}).save(str(path))
+    assert get_full_ktiv_lexicon().mapping == {"אויר": "אוויר"}
+
+    FullKtivLexicon({"אויר": "אוויר", "שלום": "שלום"}).save(str(path))
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1))
+    assert "שלום" in get_full_ktiv_lexicon().mapping
@@ -0,0 +1,72 @@
+import os
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.prefixes import PrefixModel, decompose_counts, split_prefixes
+from app.utils.spellcheck import HebrewTokenizer, SpellChecker, SymSpellBuilder
+
+
+def test_split_prefixes():
+    """Only valid clitic sequences are split off, longest first"""
+    assert split_prefixes("והבית") == [("וה", "בית"), ("ו", "הבית")]
+    assert split_prefixes("כשהילד") == [("כשה", "ילד"), ("כש", "הילד"), ("כ", "שהילד")]
+    assert split_prefixes("בית") == [("ב", "ית")]
+    assert split_prefixes("לב") == []
+    assert ("ה", "ולך") in split_prefixes("הולך")
+
+
+def test_decompose_counts_folds_prefixed_forms():
+    """Prefixed forms fold into frequent bases; rarer bases keep their own forms"""
+    items = [("הבית", 40), ("בית", 100), ("לבית", 30), ("ולך", 2), ("הולך", 50), ("ילד", 20)]
+    kept, model = decompose_counts(items)
+    assert kept == [("בית", 170), ("ולך", 2), ("הולך", 50), ("ילד", 20)]
+    assert model.prefix_counts == {"ה": 40, "ל": 30}
+    assert model.total == 242
+    assert model.weight("") == 1.0
+    assert model.weight("ה") == 40 / 242
+
+
+def test_prefix_model_roundtrip(tmp_path):
+    model = PrefixModel({"ו": 3, "וה": 1}, 10)
+    path = str(tmp_path / "prefixes.json")
+    model.save(path)
+    loaded = PrefixModel.load(path)
+    assert loaded.prefix_counts == model.prefix_counts and loaded.total == 10
+    assert loaded.splits("והבית") == [("וה", "בית"), ("ו", "הבית")]
+
+
+def test_prefix_mode_correction():
+    """Prefixed words are known through their base and corrected with the prefix kept"""
+    tokens = ["שלום"] * 50 + ["ושלום"] * 10 + ["בית"] * 50 + ["הבית"] * 20 + ["לבית"] * 5
+    builder = SymSpellBuilder(max_edit_distance=2, prefix_length=7)
+    builder.build_from_tokens(tokens, strip_prefixes=True)
+    assert set(builder.sym_spell.words) == {"שלום", "בית"}
+
+    checker = SpellChecker(builder.get_spellchecker(), HebrewTokenizer(), prefix_model=builder.prefix_model)
+    assert checker.known_count("הבית") is not None
+    assert checker.correct_word("הבית")[0] == "הבית"
+    assert checker.correct_word("ושלומ")[0] == "ושלום"
+    assert checker.correct_text("לביית ושלם") == "לבית ושלום"
+
+
+def test_prefix_statistics_follow_the_dictionary(tmp_path, monkeypatch):
+    """A dictionary outside the configured path keeps its prefix statistics next to it"""
+    from app.config import settings
+    from app.utils.spellcheck import load_spellchecker, prefix_stats_path
+
+    monkeypatch.setattr(settings, "spellchecker_prefix_mode", True)
+    assert prefix_stats_path(settings.spellchecker_dictionary_path) == settings.spellchecker_prefix_stats_path
+    dictionary_path = str(tmp_path / "custom.txt")
+    assert prefix_stats_path(dictionary_path) == str(tmp_path / "custom.prefixes.json")
+
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_text(" ".join(["בית"] * 8 + ["הבית"] * 6), encoding="utf-8")
+    load_spellchecker(dictionary_path, str(corpus), str(tmp_path / "custom.idx"))
+    assert PrefixModel.load(prefix_stats_path(dictionary_path)).prefix_counts == {"ה": 6}
+
+    spellchecker = load_spellchecker(dictionary_path, str(tmp_path / "none"), str(tmp_path / "custom.idx"))
+    assert spellchecker.prefix_model is not None
+    assert spellchecker.known_count("הבית") is not None
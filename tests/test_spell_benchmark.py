@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.spell_benchmark import (benchmark_spellchecker, compare_reports, percentiles, read_labelled_pairs,
+                                       run_benchmark, write_report)
+from app.utils.spellcheck import SymSpellBuilder, load_spellchecker
+
+DICTIONARY = {"שלום": 500, "עולם": 300, "הביתה": 200, "הולך": 150, "ספר": 100, "ראיון": 80, "עובדים": 60}
+LABELLED = "form,correct\nשלום,שלום\nשלומ,שלום\nעולמם,עולם\nספרר,ספר\nהולכ,הולך\nזזזזזז,ראיון\n"
+
+
+def write_files(tmp_path) -> tuple[dict, str]:
+    dictionary_path = tmp_path / "symspell.txt"
+    builder = SymSpellBuilder(2, 7)
+    builder.build_symspell_from_counts(list(DICTIONARY.items()))
+    builder.save_dictionary(str(dictionary_path))
+    labelled = tmp_path / "labelled.csv"
+    labelled.write_text(LABELLED, encoding="utf-8")
+    load_options = {"dictionary_path": str(dictionary_path), "corpus_dir": str(tmp_path / "none"),
+                    "index_path": str(tmp_path / "symspell.idx")}
+    return load_options, str(labelled)
+
+
+def test_benchmark_report(tmp_path):
+    """Accuracy, latency and candidate sections of a report; workers give the same accuracy"""
+    load_options, labelled = write_files(tmp_path)
+    pairs = read_labelled_pairs(labelled)
+    assert len(pairs) == 6
+
+    report = run_benchmark(labelled, repeat=2, load_options=load_options)
+    assert report["words"] == 12
+    assert report["accuracy"]["correct"] == 10
+    assert report["accuracy"]["not_corrected"] == 2  # זזזזזז has no suggestion and is kept
+    assert report["accuracy"]["wrong"] == 0
+    assert report["accuracy"]["false_corrections"] == 0
+    assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+    assert report["lookups_per_second"] > 0
+    assert report["dictionary"]["words"] == len(DICTIONARY)
+    assert report["dictionary"]["index_mb"] > 0
+    # The index is mapped, so its size and resident pages are reported next to the PSS growth
+    assert report["memory"]["index_mapped_mb"] == report["dictionary"]["index_mb"]
+    assert report["memory"]["index_resident_mb"] > 0
+    assert report["memory"]["dictionary_measure"].startswith("pss")
+    assert report["mistakes"][0]["form"] == "זזזזזז"
+
+    parallel = benchmark_spellchecker(load_spellchecker(**load_options), pairs, workers=2, chunk_size=2,
+                                      load_options=load_options)
+    assert parallel["accuracy"] == {**report["accuracy"], "correct": 5, "not_corrected": 1}
+    assert parallel["workers"] == 2 and parallel["words"] == 6
+
+    output = tmp_path / "report.json"
+    write_report(report, str(output))
+    assert json.loads(output.read_text(encoding="utf-8"))["words"] == 12
+
+
+def test_compare_reports():
+    """Slower percentiles and lower accuracy are reported as regressions"""
+    assert percentiles([4.0, 1.0, 3.0, 2.0], (50, 99)) == {"p50": 2.0, "p99": 4.0}
+    baseline = {"accuracy": {"accuracy": 0.9}, "latency_ms": {"p50": 1.0, "p95": 2.0}}
+    assert compare_reports({"accuracy": {"accuracy": 0.9}, "latency_ms": {"p50": 1.1, "p95": 2.2}}, baseline) == []
+    regressions = compare_reports({"accuracy": {"accuracy": 0.8}, "latency_ms": {"p50": 1.0, "p95": 3.0}}, baseline)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("accuracy")
@@ -0,0 +1,431 @@
+import os
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import math
+import multiprocessing
+import threading
+from collections import Counter
+
+from app.utils.spellcheck import (CorpusLoader, HebrewTokenizer, SymSpellBuilder, confusion_candidates,
+                                  confusion_variants, hebrew_rerank, index_is_current, load_spellchecker,
+                                  weighted_levenshtein)
+from app.utils.symspell_index import MappedSymSpell
+
+DICTIONARY = {"שלום": 500, "עולם": 300, "הביתה": 200, "הולך": 150, "ספר": 100, "ראיון": 80, "עובדים": 60}
+
+
+def write_dictionary(tmp_path) -> str:
+    path = tmp_path / "symspell" / "symspell.txt"
+    builder = SymSpellBuilder(2, 7)
+    builder.build_symspell_from_counts(list(DICTIONARY.items()))
+    builder.save_dictionary(str(path))
+    return str(path)
+
+
+def test_load_spellchecker_from_dictionary(tmp_path):
+    """The dictionary file is loaded with the configured SymSpell parameters"""
+    spellchecker = load_spellchecker(dictionary_path=write_dictionary(tmp_path), corpus_dir=str(tmp_path / "none"),
+                                     index_path=str(tmp_path / "symspell.idx"))
+
+    assert spellchecker.symspell.words == DICTIONARY
+    assert spellchecker.correct_word("שלוםם")[0] == "שלום"
+    assert spellchecker.correct_text("שלומ ספרר world") == "שלום ספר"
+    assert spellchecker.correct_text_in_place("שלומ, ספרר 3 world!\nהולכ") == "שלום, ספר 3 world!\nהולך"
+
+
+def test_load_spellchecker_without_data(tmp_path):
+    """Without a dictionary or corpus, words are returned unchanged"""
+    spellchecker = load_spellchecker(dictionary_path=str(tmp_path / "missing.txt"), corpus_dir=str(tmp_path / "none"),
+                                     index_path=str(tmp_path / "symspell.idx"))
+    assert spellchecker.correct_text("שלומ ספרר") == "שלומ ספרר"
+
+
+def test_server_start_never_builds_from_the_corpus(tmp_path, monkeypatch, capsys):
+    """init_spellchecker only loads prebuilt files; a missing dictionary is reported, not built"""
+    from app.config import settings
+    from app.utils import spellcheck
+
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_text(" ".join(["שלום"] * 10), encoding="utf-8")
+    monkeypatch.setattr(settings, "spellchecker_corpus_dir", str(corpus))
+    monkeypatch.setattr(spellcheck, "_spellchecker", None)
+
+    spellchecker = spellcheck.init_spellchecker(str(tmp_path / "missing.txt"), str(tmp_path / "symspell.idx"))
+    assert len(spellchecker.symspell.words) == 0
+    assert not (tmp_path / "missing.txt").exists()
+    assert "build-dictionary" in capsys.readouterr().out
+
+
+def test_weighted_levenshtein_bounded():
+    """The cost ceiling only turns distances above it into inf"""
+    assert weighted_levenshtein("שלום", "שלום") == 0
+    assert weighted_levenshtein("כתב", "קתב") == 0.3
+    assert weighted_levenshtein("ספר", "ספרים") == 2
+    assert weighted_levenshtein("ספר", "ספרים", max_cost=2) == 2
+    assert weighted_levenshtein("ספר", "ספרים", max_cost=1.5) == math.inf
+    assert weighted_levenshtein("", "אב", max_cost=1) == math.inf
+    assert weighted_levenshtein("אבגד", "דגבא", max_cost=10) == weighted_levenshtein("אבגד", "דגבא")
+
+
+def test_hebrew_rerank_top_k(tmp_path):
+    """Keeping only the top k gives the head of the full ranking"""
+    spellchecker = load_spellchecker(dictionary_path=write_dictionary(tmp_path), corpus_dir=str(tmp_path / "none"),
+                                     index_path=str(tmp_path / "symspell.idx"))
+    full = hebrew_rerank(spellchecker.symspell, "עולמ", top_k=1000)
+    assert full[0]["term"] == "עולם"
+    assert hebrew_rerank(spellchecker.symspell, "עולמ", top_k=2) == full[:2]
+
+
+def test_correction_cache(tmp_path):
+    """Repeated words are corrected once and served from the cache afterwards"""
+    spellchecker = load_spellchecker(dictionary_path=write_dictionary(tmp_path), corpus_dir=str(tmp_path / "none"),
+                                     index_path=str(tmp_path / "symspell.idx"))
+
+    assert spellchecker.correct_words(["שלומ", "ספרר", "שלומ"]) == ["שלום", "ספר", "שלום"]
+    assert spellchecker.cache_info()["misses"] == 2
+    assert spellchecker.correct_text("שלומ שלומ") == "שלום שלום"
+    assert spellchecker.cache_info()["hits"] == 1
+
+    spellchecker.set_dictionary(SymSpellBuilder(2, 7).get_spellchecker())
+    assert spellchecker.cache_info() == {"hits": 0, "misses": 0, "size": 0, "max_size": spellchecker.cache_size}
+    assert spellchecker.correct_text("שלומ") == "שלומ"
+
+
+def test_correction_cache_is_bounded(tmp_path):
+    """The least recently used words are evicted beyond cache_size"""
+    spellchecker = load_spellchecker(dictionary_path=write_dictionary(tmp_path), corpus_dir=str(tmp_path / "none"),
+                                     index_path=str(tmp_path / "symspell.idx"))
+    spellchecker.cache_size = 2
+    spellchecker.correct_words(["שלומ", "ספרר", "עולמ"])
+    assert spellchecker.cache_info()["size"] == 2
+
+
+def test_parallel_counts_match_serial(tmp_path):
+    """Sharded counting gives the same counts, in the same order, as the serial stream"""
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_bytes("שלום עולם\r\nהולך הביתה\rשלום ספר\n".encode("utf-8") * 50)
+    (corpus / "b.csv").write_bytes("ספר,עולם\nראיון עובדים".encode("utf-8"))
+    loader = CorpusLoader(str(corpus))
+
+    serial = SymSpellBuilder.build_counts_from_stream(loader.load_tokens(HebrewTokenizer()))
+    parallel = SymSpellBuilder.build_counts_parallel(loader, workers=2, shard_bytes=100)
+    assert list(parallel.items()) == list(serial.items())
+
+
+def test_binary_index_matches_dictionary(tmp_path):
+    """The mapped index returns the same lookups as the in-memory dictionary"""
+    builder = SymSpellBuilder(2, 7)
+    builder.build_symspell_from_counts(list(DICTIONARY.items()))
+    builder.save_index(str(tmp_path / "symspell.idx"))
+    mapped = MappedSymSpell(str(tmp_path / "symspell.idx"))
+
+    assert dict(mapped.words.items()) == DICTIONARY
+    for word in ["שלומ", "עולם", "ספרר", "הבית", "ראיונ", "x"]:
+        assert hebrew_rerank(mapped, word, 1000) == hebrew_rerank(builder.sym_spell, word, 1000)
+
+
+def test_load_spellchecker_writes_and_maps_index(tmp_path):
+    """The text dictionary is indexed once and mapped on the next start"""
+    dictionary_path = write_dictionary(tmp_path)
+    index_path = str(tmp_path / "symspell.idx")
+    load_spellchecker(dictionary_path=dictionary_path, corpus_dir=str(tmp_path / "none"), index_path=index_path)
+
+    spellchecker = load_spellchecker(dictionary_path=dictionary_path, corpus_dir=str(tmp_path / "none"), index_path=index_path)
+    assert isinstance(spellchecker.symspell, MappedSymSpell)
+    assert spellchecker.correct_text("שלומ ספרר") == "שלום ספר"
+
+
+def test_index_of_another_dictionary_is_not_mapped(tmp_path):
+    """An index records the dictionary file it was built from; a newer index of another file is rebuilt"""
+    dictionary_path = write_dictionary(tmp_path)
+    index_path = str(tmp_path / "symspell.idx")
+    other = SymSpellBuilder(2, 7)
+    other.build_symspell_from_counts([("ספרים", 10)])
+    other.save_dictionary(str(tmp_path / "other.txt"))
+    other.save_index(index_path, str(tmp_path / "other.txt"))
+    assert index_is_current(index_path, str(tmp_path / "other.txt"))
+    assert not index_is_current(index_path, dictionary_path)
+
+    spellchecker = load_spellchecker(dictionary_path=dictionary_path, corpus_dir=str(tmp_path / "none"),
+                                     index_path=index_path)
+    assert spellchecker.symspell.words == DICTIONARY
+    assert index_is_current(index_path, dictionary_path)
+
+
+def test_tokenizer_single_pass():
+    """iter_tokens normalizes and extracts tokens like normalize() + tokenize()"""
+    tokenizer = HebrewTokenizer()
+    text = "שָׁלוֹם עוֹלָם, צה“ל ו־ארה”ב מץ׳ ץר הולכ abc א'ב\n  ספר"
+    assert tokenizer.tokenize("ספר ץר מץ' הולכ abc א'ב 'א") == ["ספר", "מץ'", "הולכ", "א'ב"]
+    assert list(tokenizer.iter_tokens(text)) == tokenizer.tokenize(tokenizer.normalize(text))
+    assert list(tokenizer.iter_tokens(text)) == ["שלום", 'צה"ל', 'וארה"ב', "מץ'", "הולכ", "א'ב", "ספר"]
+
+
+def test_known_word_fast_path(tmp_path):
+    """Frequent known words skip candidate generation when only the correction is asked for; rare ones are still reranked"""
+    spellchecker = load_spellchecker(dictionary_path=write_dictionary(tmp_path), corpus_dir=str(tmp_path / "none"),
+                                     index_path=str(tmp_path / "symspell.idx"))
+    assert spellchecker.correct_word("ספר", 1) == ("ספר", [{"term": "ספר", "distance": 0, "count": 100}])
+    assert spellchecker.correct_words(["ספר", "שלום"]) == ["ספר", "שלום"]
+    assert spellchecker.cache_info()["misses"] == 0
+
+    # Asking for more suggestions reranks the word, with the exact match first
+    assert spellchecker.correct_word("ספר", 5)[1][0] == {"term": "ספר", "distance": 0, "count": 100}
+    assert spellchecker.cache_info()["misses"] == 1
+
+    spellchecker.known_min_count = 200
+    assert spellchecker.correct_word("ספר", 1)[0] == "ספר"
+    assert spellchecker.cache_info()["misses"] == 2
+
+
+def test_bloom_filter(tmp_path):
+    """The index Bloom filter has no false negatives and rejects most unknown words"""
+    builder = SymSpellBuilder(2, 7)
+    builder.build_symspell_from_counts(list(DICTIONARY.items()))
+    builder.save_index(str(tmp_path / "symspell.idx"))
+    mapped = MappedSymSpell(str(tmp_path / "symspell.idx"))
+
+    assert all(mapped.might_contain(word) for word in DICTIONARY)
+    unknown = [word + suffix for word in DICTIONARY for suffix in "אבגדהוזחטי"]
+    assert sum(map(mapped.might_contain, unknown)) < len(unknown) // 4
+    mapped.create_dictionary_entry("חדש", 5)
+    assert mapped.might_contain("חדש")
+
+
+def test_tiered_lookup(tmp_path):
+    """Distance-1 typos are settled in tier 1; others escalate, and short words stay at distance 1"""
+    spellchecker = load_spellchecker(dictionary_path=write_dictionary(tmp_path), corpus_dir=str(tmp_path / "none"),
+                                     index_path=str(tmp_path / "symspell.idx"))
+    stats = {}
+    assert spellchecker.correct_words(["שלומ", "עבדימ", "ספר", "שלומ"], stats=stats) == ["שלום", "עובדים", "ספר", "שלום"]
+    assert stats == {"known": 1, "confusion": 1, "tier1": 0, "tier2": 1, "unresolved": 0}
+
+    stats = {}
+    assert spellchecker.correct_word("סס", stats=stats) == ("סס", [])
+    assert stats == {"confusion": 0, "tier1": 0, "tier2": 1, "unresolved": 1}
+    assert spellchecker.tier_info()["tier2"] == 2
+
+
+def test_confusion_candidates(tmp_path):
+    """Confusion substitutions, doubled letters and final letters are found without a SymSpell search"""
+    assert "שלום" in confusion_variants("שלומם")
+    assert "עולם" in confusion_variants("עולמם")
+    assert "אני" in confusion_variants("אניי")
+    assert {"קתב", "כטב", "כתו", "חתב"} <= confusion_variants("כתב")
+
+    spellchecker = load_spellchecker(dictionary_path=write_dictionary(tmp_path), corpus_dir=str(tmp_path / "none"),
+                                     index_path=str(tmp_path / "symspell.idx"))
+    stats = {}
+    assert spellchecker.correct_words(["שלוםם", "עולמם", "עובדיםם", "הולכך", "אולם", "ספער"], stats=stats) == \
+        ["שלום", "עולם", "עובדים", "הולך", "עולם", "ספר"]
+    assert stats["confusion"] == 5
+
+
+def test_known_word_is_not_replaced_by_a_confusion_neighbour(tmp_path):
+    """A correctly spelled word outranks its rarer confusion neighbours, whatever top_k is"""
+    path = tmp_path / "neighbours.txt"
+    builder = SymSpellBuilder(2, 7)
+    builder.build_symspell_from_counts([("שלום", 100), ("כלב", 50), ("סלום", 5), ("קלב", 3)])
+    builder.save_dictionary(str(path))
+    assert [c.term for c in confusion_candidates("שלום", builder.sym_spell.words)] == ["שלום", "סלום"]
+
+    spellchecker = load_spellchecker(str(path), str(tmp_path / "none"), str(tmp_path / "symspell.idx"))
+    spellchecker.known_min_count = 1000  # every word goes through the tiers
+    stats = {}
+    corrected, suggestions = spellchecker.correct_word("שלום", 3, stats)
+    assert corrected == "שלום" and suggestions[0]["distance"] == 0
+    assert stats["confusion"] == 1
+    assert spellchecker.correct_words(["שלום", "כלב"], top_k=3) == ["שלום", "כלב"]
+
+    # Known words come first at distance 0, with their other suggestions after them
+    spellchecker.known_min_count = 1
+    corrected, suggestions = spellchecker.correct_word("שלום", 3)
+    assert corrected == "שלום"
+    assert [s["term"] for s in suggestions] == ["שלום", "סלום"] and suggestions[0]["distance"] == 0
+    assert spellchecker.lookup_words(["כלב"], 3)["כלב"][1][0] == {"term": "כלב", "distance": 0, "count": 50}
+
+
+def load_store_type(paths: tuple[str, str, str]) -> str:
+    return type(load_spellchecker(*paths).symspell).__name__
+
+
+def test_workers_share_mapped_index(tmp_path):
+    """Workers starting together build the index once and all serve from the mapped file"""
+    paths = (write_dictionary(tmp_path), str(tmp_path / "none"), str(tmp_path / "symspell.idx"))
+    with multiprocessing.Pool(3) as pool:
+        assert pool.map(load_store_type, [paths] * 3) == ["MappedSymSpell"] * 3
+
+
+def test_correct_batch_on_pool(tmp_path, monkeypatch):
+    """Unknown tokens are reranked on the batch pool and reassembled in order"""
+    from app.config import settings
+    from app.utils import spellcheck
+
+    dictionary_path = write_dictionary(tmp_path)
+    index_path = str(tmp_path / "symspell.idx")
+    # Workers map the files the server's spellchecker was loaded from
+    monkeypatch.setattr(settings, "spellchecker_batch_workers", 2)
+    monkeypatch.setattr(settings, "spellchecker_batch_chunk_size", 2)
+    monkeypatch.setattr(spellcheck, "_spellchecker",
+                        load_spellchecker(dictionary_path, str(tmp_path / "none"), index_path))
+    try:
+        texts = ["שלומ עולמם", "ספרר שלומ", "הולכ הביתהה ראיונ", "עובדימ"]
+        stats = {}
+        results = spellcheck.correct_batch(texts, top_k=1, stats=stats)
+        assert spellcheck._batch_pool is not None
+        assert [r["output"] for r in results] == ["שלום עולם", "ספר שלום", "הולך הביתה ראיון", "עובדים"]
+        assert results[1]["suggestions"]["ספרר"][0]["term"] == "ספר"
+        assert sum(stats.get(tier, 0) for tier in ("confusion", "tier1", "tier2")) == 7
+    finally:
+        spellcheck.close_batch_pool()
+
+
+def test_pool_ranking_does_not_hold_the_dictionary_lock(tmp_path):
+    """The dictionary can change while a batch is ranked on the pool; those results are then not cached"""
+    spellchecker = load_spellchecker(write_dictionary(tmp_path), str(tmp_path / "none"), str(tmp_path / "symspell.idx"))
+
+    class ChangingPool:
+        """Runs the chunks in process after another thread changed the dictionary."""
+
+        def imap(self, fn, chunks):
+            changer = threading.Thread(target=spellchecker.apply_delta, args=({"חדש": 5},))
+            changer.start()
+            changer.join(timeout=5)
+            assert not changer.is_alive()
+            return [(spellchecker._rank_missing(words, top_k, {}), {}) for words, top_k, _ in chunks]
+
+    results = spellchecker.lookup_words(["שלומ", "עבדימ", "ספרר"], 5, pool=ChangingPool(), chunk_size=1)
+    assert results["שלומ"][0] == "שלום" and results["עבדימ"][0] == "עובדים"
+    assert spellchecker.cache_info()["size"] == 0
+
+    results = spellchecker.lookup_words(["שלומ", "עבדימ"], 5)
+    assert spellchecker.cache_info()["size"] == 2
+
+
+def test_correct_batch_falls_back_when_workers_fail(tmp_path, monkeypatch):
+    """Workers that cannot load the dictionary fail fast and the batch is ranked in process"""
+    from app.config import settings
+    from app.utils import spellcheck
+
+    spellchecker = load_spellchecker(write_dictionary(tmp_path), str(tmp_path / "none"), str(tmp_path / "symspell.idx"))
+    spellchecker.dictionary_path = str(tmp_path / "missing.txt")
+    spellchecker.index_path = str(tmp_path / "missing.idx")
+    monkeypatch.setattr(settings, "spellchecker_batch_workers", 2)
+    monkeypatch.setattr(settings, "spellchecker_batch_chunk_size", 1)
+    monkeypatch.setattr(spellcheck, "_spellchecker", spellchecker)
+    monkeypatch.setattr(spellcheck, "_batch_pool_failed", False)
+    try:
+        results = spellcheck.correct_batch(["שלומ ספרר"])
+        assert results[0]["output"] == "שלום ספר"
+        assert spellcheck._batch_pool is None
+        assert spellcheck.get_batch_pool(spellchecker) is None
+    finally:
+        spellcheck.close_batch_pool()
+
+
+class FailingTokenizer(HebrewTokenizer):
+    """Tokenizer that crashes after `limit` texts, like a build killed halfway"""
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+        self.texts = 0
+
+    def iter_tokens(self, text):
+        self.texts += 1
+        if self.texts > self.limit:
+            raise RuntimeError("crash")
+        return super().iter_tokens(text)
+
+
+def test_builds_checkpoint_by_default():
+    """Checkpoints are on by default, every as many chunks in the settings as in the builder"""
+    import inspect
+    from app.config import Settings
+
+    default = Settings.model_fields["spellchecker_build_checkpoint_every"].default
+    assert default > 0
+    for method in (SymSpellBuilder.count_corpus, SymSpellBuilder.build_from_corpus, SymSpellBuilder.count_texts,
+                   SymSpellBuilder.build_counts_parallel):
+        assert inspect.signature(method).parameters["checkpoint_every"].default == default
+
+
+def test_checkpointed_build_resumes(tmp_path):
+    """A crashed build resumes from its checkpoint and writes the same dictionary"""
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    words = list(DICTIONARY)
+    (corpus / "a.txt").write_text("\n".join(" ".join(words[i % 7:]) for i in range(60)), encoding="utf-8")
+    (corpus / "b.txt").write_text("\n".join(words[i % 7] + " חדש" for i in range(40)), encoding="utf-8")
+    loader = CorpusLoader(str(corpus), progress=None)
+    expected = SymSpellBuilder(2, 7)
+    expected.build_from_corpus(loader, HebrewTokenizer(), min_freq=2)
+
+    for max_terms in (0, 4):
+        checkpoint = tmp_path / f"symspell-{max_terms}.txt.checkpoint"
+        options = dict(min_freq=2, max_terms=max_terms, checkpoint_dir=str(checkpoint), checkpoint_every=1,
+                       flush_every=20)
+        crashed = SymSpellBuilder(2, 7)
+        try:
+            crashed.build_from_corpus(loader, FailingTokenizer(75), **options)
+        except RuntimeError:
+            pass
+        assert (checkpoint / "state.json").is_file()
+        state = json.loads((checkpoint / "state.json").read_text(encoding="utf-8"))
+        # Runs are named relative to the checkpoint, so it can be resumed from another working directory
+        assert all(run.startswith("runs" + os.sep) for run in state["runs"]) and bool(state["runs"]) == bool(max_terms)
+
+        tokenizer = FailingTokenizer(10 ** 6)
+        builder = SymSpellBuilder(2, 7)
+        builder.build_from_corpus(loader, tokenizer, **options)
+        assert tokenizer.texts < 100 - 60  # the checkpointed texts were not tokenized again
+        assert list(builder.sym_spell.words.items()) == list(expected.sym_spell.words.items())
+        builder.save_dictionary(str(tmp_path / "symspell.txt"))
+        assert not checkpoint.exists()
+    assert not (tmp_path / "symspell.txt.tmp").exists()
+
+
+class FailingCounter(Counter):
+    """Counter that crashes on the merge of shard `limit`"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.merges = 0
+        super().__init__()
+
+    def update(self, *args, **kwargs):
+        self.merges += 1
+        if self.merges > self.limit:
+            raise RuntimeError("crash")
+        super().update(*args, **kwargs)
+
+
+def test_checkpointed_parallel_build_resumes(tmp_path):
+    """Parallel builds checkpoint the merged shards and skip them on restart"""
+    from app.utils.build_checkpoint import BuildCheckpoint, corpus_fingerprint
+
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_bytes("שלום עולם\nהולך הביתה\nשלום ספר\n".encode("utf-8") * 30)
+    loader = CorpusLoader(str(corpus), progress=None)
+    expected = SymSpellBuilder.build_counts_parallel(loader, workers=2, shard_bytes=100)
+
+    checkpoint_dir = str(tmp_path / "checkpoint")
+    fingerprint = corpus_fingerprint(loader, mode="parallel", shard_bytes=100, spilling=False)
+    try:
+        SymSpellBuilder.build_counts_parallel(loader, 2, 100, FailingCounter(5),
+                                              BuildCheckpoint(checkpoint_dir, fingerprint), checkpoint_every=2)
+    except RuntimeError:
+        pass
+
+    checkpoint = BuildCheckpoint(checkpoint_dir, fingerprint)
+    counts, position = checkpoint.resume()
+    assert position == {"shards": 4}
+    SymSpellBuilder.build_counts_parallel(loader, 2, 100, counts, checkpoint, start_shard=position["shards"])
+    assert list(counts.items()) == list(expected.items())
@@ -0,0 +1,48 @@
+import dataclasses
+import os
+import sys
+
+import pytest
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils import nikud
+from app.utils.normalizer import apply_full_ktiv_rules, compile_stage_plan, normalize
+
+
+def test_plans_are_compiled_once():
+    """Equal options return the same cached, immutable plan"""
+    plan = compile_stage_plan(False, False, {"full_ktiv": False, "final_letters": True})
+    assert compile_stage_plan(False, False, {"final_letters": True, "full_ktiv": False}) is plan
+    assert plan.stages == ("final_letters", "remove_nikud")
+    assert not plan.needs_model
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        plan.full_ktiv = True
+
+    assert compile_stage_plan(True, True).stages == ("final_letters", "full_ktiv", "spellcheck")
+    assert compile_stage_plan(False, True, {"spellcheck": False}).spellcheck is False
+
+
+def test_invalid_customization():
+    """Unknown keys, wrong types and unknown rules are rejected"""
+    for customization in ({"bogus": True}, {"full_ktiv": "no"}, {"full_ktiv_rules": ["bogus"]},
+                          {"full_ktiv_rules": [{"kubutz": True}]}, {"full_ktiv_rules": [["holam"]]}):
+        with pytest.raises(ValueError):
+            compile_stage_plan(False, False, customization)
+
+
+def test_final_letters_only_never_touches_model(monkeypatch):
+    """A plan without full ktiv does not load the model"""
+    def fail():
+        raise AssertionError("model should not be loaded")
+
+    monkeypatch.setattr(nikud, "get_model", fail)
+    assert normalize("הולכ הביתה. ספרימ", customization={"full_ktiv": False}) == "הולך הביתה ספרים"
+
+
+def test_full_ktiv_rules_selection():
+    """Only the selected full ktiv rules are applied"""
+    text = "שָׁלֹם"  # holam on lamed
+    assert apply_full_ktiv_rules(text) == "שלום"
+    assert apply_full_ktiv_rules(text, frozenset({"kubutz", "hirik"})) == "שלם"
@@ -0,0 +1,81 @@
+import os
+import random
+import sys
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from symspellpy import Verbosity
+
+from app.utils.spellcheck import HebrewTokenizer, SpellChecker, SymSpellBuilder
+from app.utils.term_trie import TermTrie, TrieSymSpell, write_term_trie
+
+LETTERS = "אבגדהוזחטיכלמנסעפצקרשתםןךףץ"
+
+
+def build(tmp_path, count: int = 2000, seed: int = 5):
+    rng = random.Random(seed)
+    words = {"".join(rng.choice(LETTERS) for _ in range(rng.randint(1, 7))): rng.randint(1, 500) for _ in range(count)}
+    builder = SymSpellBuilder(2, 7)
+    builder.build_symspell_from_counts(list(words.items()))
+    path = str(tmp_path / "symspell.trie")
+    builder.save_trie(path)
+    return rng, words, builder.sym_spell, path
+
+
+def test_trie_exact_and_prefix_lookup(tmp_path):
+    _, words, _, path = build(tmp_path)
+    trie = TermTrie(path)
+    assert trie.term_count == len(words)
+    assert all(trie.count(word) == count for word, count in words.items())
+    assert trie.count("אבגדהוזח") == 0
+    assert list(trie.items()) == sorted(words.items())
+    assert list(trie.items("א")) == sorted((w, c) for w, c in words.items() if w.startswith("א"))
+    assert list(trie.items("ץץץץץץץץ")) == []
+
+
+def test_trie_lookup_matches_symspell(tmp_path):
+    """Every suggestion SymSpell finds is found by the trie walk, at the same distance"""
+    rng, words, symspell, path = build(tmp_path)
+    trie = TrieSymSpell(path, 2)
+    queries = ["".join(rng.choice(LETTERS) for _ in range(rng.randint(1, 8))) for _ in range(50)]
+    for query in queries:
+        for verbosity in (Verbosity.ALL, Verbosity.CLOSEST):
+            expected = {}
+            for item in symspell.lookup(query, verbosity, 2):
+                expected[item.term] = min(expected.get(item.term, 9), item.distance)
+            assert {item.term: item.distance for item in trie.lookup(query, verbosity, 2)} == expected
+
+
+def test_spellchecker_on_trie(tmp_path):
+    write_term_trie({"שלום": 500, "עולם": 300, "ספר": 100}, str(tmp_path / "small.trie"))
+    spellchecker = SpellChecker(TrieSymSpell(str(tmp_path / "small.trie")), HebrewTokenizer())
+    assert spellchecker.correct_text("שלומ עולמם ספרר") == "שלום עולם ספר"
+
+    spellchecker.apply_delta({"ספרים": 50})
+    assert spellchecker.correct_word("ספרימ")[0] == "ספרים"
+    assert [item.term for item in spellchecker.symspell.lookup("ספרם", Verbosity.CLOSEST, 1)] == ["ספר", "ספרים"]
+
+
+def test_build_dictionary_writes_trie_without_symspell(tmp_path, monkeypatch):
+    """In trie mode build-dictionary writes the trie from the pruned counts and never fills SymSpell"""
+    from app.cli import main
+    from app.config import settings
+    from app.utils.spellcheck import SymSpellBuilder, index_is_current
+
+    corpus = tmp_path / "corpus"
+    corpus.mkdir()
+    (corpus / "a.txt").write_text("שלום שלום עולם ספר ספר\n", encoding="utf-8")
+    monkeypatch.setattr(settings, "spellchecker_term_store", "trie")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("SymSpell should not be built")
+
+    monkeypatch.setattr(SymSpellBuilder, "build_symspell_from_counts", fail)
+    dictionary_path, trie_path = str(tmp_path / "symspell.txt"), str(tmp_path / "symspell.trie")
+    main(["build-dictionary", "--corpus-dir", str(corpus), "-o", dictionary_path, "--index", trie_path,
+          "--min-freq", "2", "--checkpoint-every", "0"])
+
+    assert (tmp_path / "symspell.txt").read_text(encoding="utf-8").splitlines() == ["שלום 2", "ספר 2"]
+    assert index_is_current(trie_path, dictionary_path)
+    assert dict(TermTrie(trie_path).items()) == {"שלום": 2, "ספר": 2}
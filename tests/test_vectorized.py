@@ -0,0 +1,60 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Add the project root to the Python path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+np = pytest.importorskip("numpy")
+
+from app.utils import vectorized
+from app.utils.normalizer import normalize_final_letters
+from app.utils.spellcheck import weighted_levenshtein
+
+SAMPLES = [
+    "",
+    "   ",
+    "שלום עולמ",
+    "הולכ, הביתה. ספרימ!",
+    "שָׁלוֹם עוֹלָם",
+    "ךלך מלכּ",          # final form mid-word, dagesh on final kaf
+    "שלום world 123 ץר ץ' ץ",
+    "בית-ספר\tחדש\nשורה",
+    "ְשלום",        # nikud at word start is kept as a letter
+]
+
+
+def random_texts(seed: int, count: int) -> list[str]:
+    alphabet = [chr(c) for c in range(0x05D0, 0x05EB)] + [chr(c) for c in range(0x0591, 0x05C8)]
+    alphabet += list(" \t\n-,.?!'\"a1־") + ["ּ", "ו", "ץ", "ם"]
+    rng = random.Random(seed)
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+def test_pack_unpack_roundtrip():
+    codepoints, offsets = vectorized.pack(SAMPLES)
+    assert vectorized.unpack(codepoints, offsets) == SAMPLES
+
+
+def test_final_letters_matches_python():
+    """The vectorized kernel returns exactly what normalize_final_letters returns"""
+    for texts in (SAMPLES, random_texts(1, 500)):
+        assert vectorized.normalize_final_letters_batch(texts) == [normalize_final_letters(t) for t in texts]
+
+
+def test_weighted_levenshtein_batch_matches_python():
+    """Batch distances are bit-identical to weighted_levenshtein"""
+    words = ["שלומ", "כתב", "", "ספר", "abc", "עולם"]
+    terms = ["שלום", "קתב", "אב", "ספרים", "אבג", ""]
+    distances = vectorized.weighted_levenshtein_batch(words, terms)
+    assert distances.tolist() == [weighted_levenshtein(w, t) for w, t in zip(words, terms)]
+
+
+def test_top_k_order_ties():
+    """Ties on distance go to the more frequent candidate, then to the earlier one"""
+    distances = np.array([1.0, 0.3, 1.0, 0.3, 2.0])
+    counts = np.array([5, 1, 9, 1, 100])
+    assert vectorized.top_k_order(distances, counts, 3).tolist() == [1, 3, 2]
+    assert vectorized.top_k_order(distances, counts, 10).tolist() == [1, 3, 2, 0, 4]